@@ -1,7 +1,8 @@
+from cloud import aws
 from cloud import azure
 from cloud import iac
 from cloud import policy
 from cloud import validation
 from cloud import workflows
 
-__all__ = ["azure", "iac", "policy", "validation", "workflows"]
+__all__ = ["aws", "azure", "iac", "policy", "validation", "workflows"]
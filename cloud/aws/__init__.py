@@ -0,0 +1,6 @@
+from cloud.aws.cloudfront import CloudFrontClient
+from cloud.aws.s3 import S3Client
+from cloud.aws.sigv4 import AwsCredentials, load_credentials
+from cloud.aws.website import AwsWebsiteProvider
+
+__all__ = ["AwsCredentials", "AwsWebsiteProvider", "CloudFrontClient", "S3Client", "load_credentials"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+import xml.etree.ElementTree as ET
+from typing import Optional
+from urllib.parse import urlsplit
+
+from cloud.aws.sigv4 import EMPTY_SHA256, AwsCredentials, sign_request
+from cloud.core.http import HttpSession
+
+API_VERSION = "2020-05-31"
+DEFAULT_ENDPOINT = "https://cloudfront.amazonaws.com"
+PATHS_PER_INVALIDATION = 1000
+
+
+class CloudFrontClient:
+    def __init__(self, credentials: AwsCredentials, *, endpoint: Optional[str] = None, timeout: float = 30) -> None:
+        self.credentials = credentials
+        self.base_url = (endpoint or DEFAULT_ENDPOINT).rstrip("/")
+        self.host = urlsplit(self.base_url).netloc
+        self.session = HttpSession(self.base_url, timeout=timeout)
+
+    def distribution_domain(self, distribution_id: str) -> str:
+        """The distribution's *.cloudfront.net host name."""
+        path = f"/{API_VERSION}/distribution/{distribution_id}"
+        headers = sign_request(
+            "GET", self.host, path, {}, EMPTY_SHA256, region="us-east-1", service="cloudfront", credentials=self.credentials
+        )
+        status, _, response = self.session.request("GET", path, headers=headers)
+        if status >= 300:
+            raise RuntimeError(f"CloudFront GetDistribution returned {status}: {response[:300]!r}")
+        root = ET.fromstring(response)
+        domain = next((node.text for node in root.iter() if node.tag.rsplit("}", 1)[-1] == "DomainName"), None)
+        if not domain:
+            raise RuntimeError(f"CloudFront distribution {distribution_id} has no DomainName")
+        return domain
+
+    def create_invalidation(self, distribution_id: str, paths: list[str]) -> list[str]:
+        """Invalidate paths in batches; returns the invalidation ids."""
+        ids = []
+        for start in range(0, len(paths), PATHS_PER_INVALIDATION):
+            batch = paths[start:start + PATHS_PER_INVALIDATION]
+            items = "".join(f"<Path>{p}</Path>" for p in batch)
+            body = (
+                f'<?xml version="1.0" encoding="UTF-8"?>'
+                f'<InvalidationBatch xmlns="http://cloudfront.amazonaws.com/doc/{API_VERSION}/">'
+                f"<Paths><Quantity>{len(batch)}</Quantity><Items>{items}</Items></Paths>"
+                f"<CallerReference>{uuid.uuid4().hex}</CallerReference></InvalidationBatch>"
+            ).encode("utf-8")
+            path = f"/{API_VERSION}/distribution/{distribution_id}/invalidation"
+            headers = sign_request(
+                "POST",
+                self.host,
+                path,
+                {"Content-Type": "text/xml"},
+                hashlib.sha256(body).hexdigest(),
+                region="us-east-1",
+                service="cloudfront",
+                credentials=self.credentials,
+            )
+            status, response_headers, response = self.session.request("POST", path, data=body, headers=headers)
+            if status >= 300:
+                raise RuntimeError(f"CloudFront invalidation returned {status}: {response[:300]!r}")
+            ids.append(response_headers.get("location", "").rsplit("/", 1)[-1])
+        return ids
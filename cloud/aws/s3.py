@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import http.client
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import quote, urlsplit
+
+from cloud.aws.sigv4 import EMPTY_SHA256, AwsCredentials, sign_request
+from cloud.core.console import warn
+from cloud.core.content import cache_control, content_type
+from cloud.core.http import HttpSession
+
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+DELETE_BATCH = 1000
+S3_NS = "{http://s3.amazonaws.com/doc/2006-03-01/}"
+
+
+@dataclass(frozen=True)
+class RemoteObject:
+    key: str
+    size: int
+    etag: str
+
+
+class S3Error(RuntimeError):
+    pass
+
+
+def local_etag(path: str) -> str:
+    """ETag S3 reports for this file when uploaded by S3Client (plain MD5, or MD5-of-part-MD5s for multipart)."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as handle:
+        if size <= MULTIPART_THRESHOLD:
+            digest = hashlib.md5()
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+            return digest.hexdigest()
+        digests = []
+        while chunk := handle.read(PART_SIZE):
+            digests.append(hashlib.md5(chunk).digest())
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
+
+
+def _findall(node: ET.Element, name: str) -> list[ET.Element]:
+    # Real S3 namespaces its XML; some S3-compatible stand-ins do not.
+    return node.findall(f"{S3_NS}{name}") or node.findall(name)
+
+
+def _findtext(node: ET.Element, name: str) -> Optional[str]:
+    value = node.findtext(f"{S3_NS}{name}")
+    return value if value is not None else node.findtext(name)
+
+
+class S3Client:
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        credentials: AwsCredentials,
+        *,
+        endpoint: Optional[str] = None,
+        timeout: float = 60,
+        part_workers: int = 4,
+    ) -> None:
+        self.bucket = bucket
+        self.region = region
+        self.credentials = credentials
+        if endpoint:
+            # Custom endpoints (S3-compatible stand-ins) use path-style addressing.
+            self.base_url = endpoint.rstrip("/")
+            self._prefix = f"/{bucket}"
+        else:
+            self.base_url = f"https://{bucket}.s3.{region}.amazonaws.com"
+            self._prefix = ""
+        parsed = urlsplit(self.base_url)
+        self.host = parsed.netloc
+        self._base_path = parsed.path.rstrip("/")
+        self.session = HttpSession(self.base_url, timeout=timeout)
+        self.part_workers = part_workers
+
+    def request(self, method: str, path: str, data: bytes = b"", headers: Optional[dict] = None) -> tuple[int, dict, bytes]:
+        full_path = f"{self._prefix}{path}"
+        if not full_path.startswith("/"):
+            full_path = "/" + full_path
+        payload_hash = hashlib.sha256(data).hexdigest() if data else EMPTY_SHA256
+        signed = sign_request(
+            method,
+            self.host,
+            self._base_path + full_path,
+            headers or {},
+            payload_hash,
+            region=self.region,
+            service="s3",
+            credentials=self.credentials,
+        )
+        status, response_headers, body = self.session.request(method, full_path, data=data or None, headers=signed)
+        if status >= 300 and not (method == "HEAD" and status == 404):
+            raise S3Error(f"S3 {method} {full_path.split('?')[0]} returned {status}: {body[:300]!r}")
+        return status, response_headers, body
+
+    @staticmethod
+    def _key_path(key: str) -> str:
+        return "/" + quote(key, safe="/-_.~")
+
+    def bucket_exists(self) -> bool:
+        status, _, _ = self.request("HEAD", "")
+        return status == 200
+
+    def create_bucket(self) -> None:
+        body = b""
+        if self.region != "us-east-1":
+            body = (
+                '<CreateBucketConfiguration xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+                f"<LocationConstraint>{self.region}</LocationConstraint></CreateBucketConfiguration>"
+            ).encode("utf-8")
+        self.request("PUT", "", body)
+
+    def put_website(self, index_document: str = "index.html", error_document: str = "index.html") -> None:
+        """Enable website hosting; error_document doubles as the SPA fallback for unknown paths."""
+        body = (
+            '<WebsiteConfiguration xmlns="http://s3.amazonaws.com/doc/2006-03-01/">'
+            f"<IndexDocument><Suffix>{_xml_escape(index_document)}</Suffix></IndexDocument>"
+            f"<ErrorDocument><Key>{_xml_escape(error_document)}</Key></ErrorDocument>"
+            "</WebsiteConfiguration>"
+        ).encode("utf-8")
+        md5 = base64.b64encode(hashlib.md5(body).digest()).decode("ascii")
+        self.request("PUT", "?website=", body, {"Content-MD5": md5, "Content-Type": "application/xml"})
+
+    def list_objects(self) -> dict[str, RemoteObject]:
+        objects: dict[str, RemoteObject] = {}
+        token = ""
+        while True:
+            query = "list-type=2&max-keys=1000"
+            if token:
+                query += f"&continuation-token={quote(token, safe='')}"
+            _, _, body = self.request("GET", f"?{query}")
+            root = ET.fromstring(body)
+            for item in _findall(root, "Contents"):
+                key = _findtext(item, "Key") or ""
+                objects[key] = RemoteObject(key, int(_findtext(item, "Size") or 0), (_findtext(item, "ETag") or "").strip('"'))
+            token = _findtext(root, "NextContinuationToken") or ""
+            if (_findtext(root, "IsTruncated") or "false").lower() != "true" or not token:
+                return objects
+
+    def upload_file(self, key: str, path: str) -> None:
+        headers = {"Content-Type": content_type(key), "Cache-Control": cache_control(key)}
+        size = os.path.getsize(path)
+        if size <= MULTIPART_THRESHOLD:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            headers["Content-MD5"] = base64.b64encode(hashlib.md5(data).digest()).decode("ascii")
+            self.request("PUT", self._key_path(key), data, headers)
+            return
+
+        key_path = self._key_path(key)
+        _, _, body = self.request("POST", f"{key_path}?uploads=", b"", headers)
+        upload_id = _findtext(ET.fromstring(body), "UploadId") or ""
+        count = (size + PART_SIZE - 1) // PART_SIZE
+
+        def upload_part(number: int) -> str:
+            with open(path, "rb") as handle:
+                handle.seek((number - 1) * PART_SIZE)
+                chunk = handle.read(PART_SIZE)
+            _, part_headers, _ = self.request(
+                "PUT", f"{key_path}?partNumber={number}&uploadId={quote(upload_id, safe='')}", chunk
+            )
+            return part_headers.get("etag", "")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.part_workers) as pool:
+                etags = list(pool.map(upload_part, range(1, count + 1)))
+        except Exception:
+            try:
+                self.request("DELETE", f"{key_path}?uploadId={quote(upload_id, safe='')}")
+            except (S3Error, http.client.HTTPException, OSError) as exc:
+                # The part failure is the error worth reporting; a lifecycle rule can reap the orphaned upload.
+                warn(f"Could not abort multipart upload of {key}: {exc}")
+            raise
+        parts = "".join(f"<Part><PartNumber>{i}</PartNumber><ETag>{e}</ETag></Part>" for i, e in enumerate(etags, 1))
+        complete = f"<CompleteMultipartUpload>{parts}</CompleteMultipartUpload>".encode("utf-8")
+        self.request("POST", f"{key_path}?uploadId={quote(upload_id, safe='')}", complete)
+
+    def delete_objects(self, keys: list[str]) -> None:
+        for start in range(0, len(keys), DELETE_BATCH):
+            batch = keys[start:start + DELETE_BATCH]
+            items = "".join(f"<Object><Key>{_xml_escape(k)}</Key></Object>" for k in batch)
+            body = f"<Delete><Quiet>true</Quiet>{items}</Delete>".encode("utf-8")
+            md5 = base64.b64encode(hashlib.md5(body).digest()).decode("ascii")
+            self.request("POST", "?delete=", body, {"Content-MD5": md5, "Content-Type": "application/xml"})
+
+
+def _xml_escape(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import configparser
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, quote
+
+EMPTY_SHA256 = hashlib.sha256(b"").hexdigest()
+
+
+@dataclass(frozen=True)
+class AwsCredentials:
+    access_key: str
+    secret_key: str
+    session_token: Optional[str] = None
+
+
+def load_credentials() -> Optional[AwsCredentials]:
+    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+    secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
+    if access_key and secret_key:
+        return AwsCredentials(access_key, secret_key, os.environ.get("AWS_SESSION_TOKEN"))
+    path = Path(os.environ.get("AWS_SHARED_CREDENTIALS_FILE", Path.home() / ".aws" / "credentials"))
+    if not path.exists():
+        return None
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    profile = os.environ.get("AWS_PROFILE", "default")
+    if not parser.has_section(profile):
+        return None
+    section = parser[profile]
+    if not section.get("aws_access_key_id") or not section.get("aws_secret_access_key"):
+        return None
+    return AwsCredentials(section["aws_access_key_id"], section["aws_secret_access_key"], section.get("aws_session_token"))
+
+
+def _hmac(key: bytes, msg: str) -> bytes:
+    return hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+
+
+def sign_request(
+    method: str,
+    host: str,
+    path: str,
+    headers: dict[str, str],
+    payload_sha256: str,
+    *,
+    region: str,
+    service: str,
+    credentials: AwsCredentials,
+    now: Optional[datetime] = None,
+) -> dict[str, str]:
+    """Return headers with an AWS Signature Version 4 Authorization added. `path` is already URI-encoded."""
+    moment = now or datetime.now(timezone.utc)
+    amz_date = moment.strftime("%Y%m%dT%H%M%SZ")
+    date = moment.strftime("%Y%m%d")
+    signed = {k.lower(): str(v).strip() for k, v in headers.items()}
+    signed["host"] = host
+    signed["x-amz-date"] = amz_date
+    signed["x-amz-content-sha256"] = payload_sha256
+    if credentials.session_token:
+        signed["x-amz-security-token"] = credentials.session_token
+
+    url_path, _, query = path.partition("?")
+    canonical_query = "&".join(
+        f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}"
+        for k, v in sorted(parse_qsl(query, keep_blank_values=True))
+    )
+    header_names = sorted(signed)
+    canonical_headers = "".join(f"{name}:{signed[name]}\n" for name in header_names)
+    signed_headers = ";".join(header_names)
+    canonical_request = "\n".join(
+        [method, url_path or "/", canonical_query, canonical_headers, signed_headers, payload_sha256]
+    )
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join(
+        ["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()]
+    )
+    key = _hmac(("AWS4" + credentials.secret_key).encode("utf-8"), date)
+    for part in (region, service, "aws4_request"):
+        key = _hmac(key, part)
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    signed["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={credentials.access_key}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    del signed["host"]
+    return signed
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from cloud.aws.cloudfront import CloudFrontClient
+from cloud.aws.s3 import S3Client, local_etag
+from cloud.aws.sigv4 import AwsCredentials, load_credentials
+from cloud.core.base import CloudProvider
+from cloud.core.console import error, info, success, warn
+from cloud.core.content import edge_paths, publish_order
+from cloud.core.manifest import build_manifest
+from cloud.core.metrics import RunMetrics
+from cloud.core.models import DeploymentConfig
+from cloud.core.workspaces import run_workspace_build
+
+UPLOAD_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class S3SyncResult:
+    uploaded: list[str]
+    skipped: int
+    deleted: list[str]
+
+
+@dataclass
+class AwsWebsiteProvider(CloudProvider):
+    config: DeploymentConfig
+    workspace_root: str
+    credentials: Optional[AwsCredentials] = None
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    _s3: Optional[S3Client] = field(default=None, init=False, repr=False)
+
+    @property
+    def bucket(self) -> str:
+        return self.config.s3_bucket or self.config.web_app_name
+
+    def _credentials(self) -> AwsCredentials:
+        if self.credentials is None:
+            self.credentials = load_credentials()
+        if self.credentials is None:
+            raise RuntimeError("AWS credentials not found (environment or shared credentials file)")
+        return self.credentials
+
+    def s3(self) -> S3Client:
+        if self._s3 is None:
+            self._s3 = S3Client(self.bucket, self.config.aws_region, self._credentials(), endpoint=self.config.s3_endpoint)
+        return self._s3
+
+    def build_app(self) -> None:
+        run_workspace_build(self.workspace_root, self.config, self.metrics)
+
+    def ensure_resources(self) -> None:
+        info("Checking if S3 bucket exists...")
+        client = self.s3()
+        if client.bucket_exists():
+            success("S3 bucket already exists")
+            return
+        info(f"Creating S3 bucket: {self.bucket}")
+        client.create_bucket()
+        success("S3 bucket created")
+
+    def deploy_app(self) -> None:
+        dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
+        if not os.path.isdir(dist_path):
+            error(f"Build output folder '{self.config.dist_dir}' not found.")
+            raise RuntimeError("Missing build output")
+        with self.metrics.step("configure"):
+            info("Enabling S3 website hosting (index.html, SPA fallback)...")
+            self.s3().put_website("index.html", "index.html")
+        with self.metrics.step("upload"):
+            result = self.sync(dist_path)
+        success(
+            f"Synced s3://{self.bucket}: {len(result.uploaded)} uploaded, {result.skipped} unchanged, "
+            f"{len(result.deleted)} deleted"
+        )
+        if self.config.cloudfront_distribution_id:
+            with self.metrics.step("invalidate"):
+                self.invalidate(result.uploaded + result.deleted)
+
+    def sync(self, dist_path: str) -> S3SyncResult:
+        client = self.s3()
+        info("Listing existing objects...")
+        remote = client.list_objects()
+        local = build_manifest(dist_path)
+        self.metrics.set_value("artifact.files", len(local))
+
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            etags = dict(zip(local, pool.map(lambda p: local_etag(os.path.join(dist_path, p)), local)))
+            to_upload = [p for p in local if p not in remote or remote[p].etag != etags[p]]
+            info(f"Uploading {len(to_upload)} of {len(local)} file(s)...")
+            # Hashed assets land before the entry points that reference them, so no page points at a missing key.
+            for wave in publish_order(to_upload):
+                list(pool.map(lambda p: client.upload_file(p, os.path.join(dist_path, p)), wave))
+        stale = sorted(set(remote) - set(local))
+        if stale:
+            # Deleted after uploads so the live index.html never references a missing object.
+            info(f"Deleting {len(stale)} stale object(s)...")
+            client.delete_objects(stale)
+        return S3SyncResult(to_upload, len(local) - len(to_upload), stale)
+
+    def invalidate(self, keys: list[str]) -> None:
+        # New keys count too: the SPA fallback may have cached index.html under their paths.
+        paths = edge_paths(keys)
+        if not paths:
+            info("No cached paths changed; skipping CloudFront invalidation.")
+            return
+        info(f"Invalidating {len(paths)} CloudFront path(s)...")
+        ids = CloudFrontClient(self._credentials(), endpoint=self.config.cloudfront_endpoint).create_invalidation(
+            self.config.cloudfront_distribution_id, paths
+        )
+        success(f"CloudFront invalidation(s) created: {', '.join(i for i in ids if i)}")
+
+    def website_url(self) -> str:
+        """CloudFront URL when a distribution fronts the bucket, else the website endpoint deploy_app configured.
+
+        The website endpoint only serves anonymous reads, so without CloudFront the bucket policy must allow them.
+        """
+        if self.config.cloudfront_distribution_id:
+            client = CloudFrontClient(self._credentials(), endpoint=self.config.cloudfront_endpoint)
+            try:
+                return f"https://{client.distribution_domain(self.config.cloudfront_distribution_id)}"
+            except (RuntimeError, OSError, ET.ParseError) as exc:
+                warn(f"Could not look up the CloudFront domain ({exc}); showing the S3 website endpoint.")
+        if self.config.s3_endpoint:
+            return f"{self.config.s3_endpoint.rstrip('/')}/{self.bucket}/index.html"
+        return f"http://{self.bucket}.s3-website-{self.config.aws_region}.amazonaws.com"
@@ -1,4 +1,7 @@
 from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.azure.blob import BlobClient
 from cloud.azure.cli import AzureCli
+from cloud.azure.ratelimit import ArmRateLimiter
+from cloud.azure.static_website import AzureStaticWebsiteProvider
 
-__all__ = ["AzureAppServiceProvider", "AzureCli"]
+__all__ = ["ArmRateLimiter", "AzureAppServiceProvider", "AzureCli", "AzureStaticWebsiteProvider", "BlobClient"]
@@ -1,23 +1,61 @@
 from __future__ import annotations
 
-import base64
 import json
 import os
 import re
 import shutil
 import subprocess
-import urllib.error
+import time
 import urllib.request
 import zipfile
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from cloud.azure.cdn import CdnPurger, purge_paths
 from cloud.azure.cli import AzureCli
+from cloud.azure.graph import (
+    GraphQuery,
+    ResourceSnapshot,
+    ResourceState,
+    cli_graph_query,
+    group_action,
+    linux_fx_version,
+    plan_action,
+    plan_name_for,
+    site_action,
+)
+from cloud.azure.integrity import IntegrityReport, verify_wwwroot
+from cloud.azure.kudu import KuduClient, KuduDeploymentTail
+from cloud.core.artifacts import ArtifactRecord, ArtifactStore
 from cloud.core.base import CloudProvider
 from cloud.core.console import error, info, success, warn
+from cloud.core.exec import NO_RETRY, run_command
+from cloud.core.fingerprint import FINGERPRINT_FILE, build_fingerprint, fingerprint_bytes, inputs_digest
+from cloud.core.http import http_status
+from cloud.core.manifest import build_manifest, manifest_digest
+from cloud.core.metrics import RunMetrics
 from cloud.core.models import DeploymentConfig
+from cloud.core.warmup import WarmupReport, discover_routes, warm_up
+from cloud.core.workspaces import run_workspace_build
+
+DEPLOY_TIMEOUT_SEC = 1800
+DEPLOY_MODE_ZIP = "zip"
+DEPLOY_MODE_PACKAGE = "run_from_package"
+DEPLOY_MODES = (DEPLOY_MODE_ZIP, DEPLOY_MODE_PACKAGE)
+RUN_FROM_PACKAGE_SETTING = "WEBSITE_RUN_FROM_PACKAGE"
+SITE_PACKAGES_DIR = "/api/vfs/data/SitePackages/"
+# Earliest time a zip entry can hold (1980-01-01 UTC).
+ZIP_EPOCH = 315532800
+
+
+def zip_entry(rel_path: str, mtime: float, size: int) -> zipfile.ZipInfo:
+    """Entry stamped with mtime in UTC, the time zone App Service hosts extract packages in."""
+    entry = zipfile.ZipInfo(rel_path, time.gmtime(max(mtime, ZIP_EPOCH))[:6])
+    entry.compress_type = zipfile.ZIP_DEFLATED
+    entry.file_size = size
+    return entry
 
 
 @dataclass
@@ -25,27 +63,154 @@ class AzureAppServiceProvider(CloudProvider):
     config: DeploymentConfig
     cli: AzureCli
     workspace_root: str
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    dist_manifest: Optional[dict] = field(default=None, init=False, repr=False)
+    previous_manifest: Optional[dict] = field(default=None, init=False, repr=False)
+    fingerprint: Optional[dict] = field(default=None, init=False, repr=False)
+    snapshot: Optional[ResourceSnapshot] = field(default=None, init=False, repr=False)
+    package_path: Optional[str] = field(default=None, init=False, repr=False)
+    # perf_counter() when deploy_package started; the start of time-to-ready.
+    deploy_started: Optional[float] = field(default=None, init=False, repr=False)
+    # Whether WEBSITE_RUN_FROM_PACKAGE=1 was already set before this deploy (see apply_deploy_mode).
+    package_mounted: bool = field(default=False, init=False, repr=False)
+    _kudu: Optional[KuduClient] = field(default=None, init=False, repr=False)
 
     def ensure_resources(self) -> None:
+        if self.snapshot is None:
+            self.load_snapshot()
         self.ensure_resource_group(self.config.resource_group, self.config.location)
-        plan_name = f"{self.config.web_app_name}-plan"
+        plan_name = plan_name_for(self.config)
         self.ensure_app_service_plan(plan_name, self.config.resource_group, self.config.location, self.config.sku)
         self.ensure_web_app(self.config.web_app_name, self.config.resource_group, plan_name)
 
+    def load_snapshot(self, query: Optional[GraphQuery] = None) -> ResourceSnapshot:
+        """Current state of this target's resource group, plan and web app.
+
+        One Resource Graph query when resource_graph is on; if that is off or fails (e.g. the
+        resource-graph extension is missing), one show/exists probe per resource instead.
+        """
+        if self.config.resource_graph or query:
+            info("Fetching resource state from Azure Resource Graph...")
+            try:
+                self.snapshot = ResourceSnapshot.fetch(query or cli_graph_query(self.cli), [self.config.resource_group])
+                return self.snapshot
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired, ValueError) as exc:
+                detail = (getattr(exc, "stderr", None) or "").strip().splitlines()
+                warn(f"Resource Graph query failed ({detail[-1] if detail else exc}); probing each resource instead.")
+        self.snapshot = self.probe_snapshot()
+        return self.snapshot
+
+    def probe_snapshot(self) -> ResourceSnapshot:
+        rg = self.config.resource_group
+        snapshot = ResourceSnapshot()
+        info("Checking if resource group exists...")
+        if self.cli.cmd(["group", "exists", "--name", rg]).stdout.strip().lower() == "true":
+            snapshot.groups[rg.lower()] = ResourceState(rg, rg, self.config.location)
+        info("Checking if app service plan exists...")
+        plan_name = plan_name_for(self.config)
+        plan = self._show(["appservice", "plan", "show", "--name", plan_name, "--resource-group", rg])
+        if plan is not None:
+            snapshot.plans[(rg.lower(), plan_name.lower())] = ResourceState.from_show(plan)
+        info("Checking if web app exists...")
+        site = self._show(["webapp", "show", "--name", self.config.web_app_name, "--resource-group", rg])
+        if site is not None:
+            snapshot.sites[(rg.lower(), self.config.web_app_name.lower())] = ResourceState.from_show(site)
+        return snapshot
+
+    def _show(self, args: list[str]) -> Optional[dict]:
+        result = self.cli.cmd([*args, "-o", "json"], check=False)
+        if result.returncode != 0:
+            return None
+        try:
+            data = json.loads(result.stdout or "{}")
+        except ValueError:
+            data = {}
+        return data if isinstance(data, dict) else {}
+
     def deploy_app(self) -> None:
-        self.configure_web_app(self.config.resource_group, self.config.web_app_name)
+        with self.metrics.step("configure"):
+            self.configure_web_app(self.config.resource_group, self.config.web_app_name)
         dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
-        zip_path = self.create_zip(dist_path)
+        zip_path = self.package_path or self.prepare_package()
+        self.previous_manifest = self.live_manifest()
         try:
             self.deploy_package(self.config.resource_group, self.config.web_app_name, zip_path)
+            try:
+                with self.metrics.step("history"):
+                    self.record_artifact(zip_path, dist_path)
+            except (OSError, ValueError, RuntimeError) as exc:
+                # The new build is already live; losing its history entry only affects later rollbacks and purges.
+                warn(f"Deploy succeeded but recording it in deploy history failed: {exc}")
         finally:
-            if os.path.exists(zip_path):
-                os.remove(zip_path)
+            self.discard_package()
+
+    def prepare_package(self) -> str:
+        """Zip dist_dir now, so later steps no longer read a folder other jobs in this workspace may rebuild."""
+        with self.metrics.step("package"):
+            self.package_path = self.create_zip(os.path.join(self.workspace_root, self.config.dist_dir))
+        return self.package_path
+
+    def discard_package(self) -> None:
+        if self.package_path and os.path.exists(self.package_path):
+            os.remove(self.package_path)
+        self.package_path = None
+
+    def history_store(self) -> ArtifactStore:
+        root = Path(self.workspace_root) / self.config.history_dir
+        return ArtifactStore(root, self.config.history_max_count, self.config.history_max_mb * 1024 * 1024)
+
+    def history_key(self) -> str:
+        return ArtifactStore.app_key(self.config.resource_group, self.config.web_app_name)
+
+    def record_artifact(self, zip_path: str, dist_path: str) -> Optional[ArtifactRecord]:
+        if self.config.history_max_count <= 0:
+            return None
+        meta = {
+            "resource_group": self.config.resource_group,
+            "web_app_name": self.config.web_app_name,
+            "runtime": self.config.runtime,
+        }
+        try:
+            head = run_command(["git", "rev-parse", "HEAD"], check=False, cwd=self.workspace_root)
+            if head.returncode == 0:
+                meta["git_commit"] = head.stdout.strip()
+        except OSError:
+            pass
+        store = self.history_store()
+        manifest = self.dist_manifest or build_manifest(dist_path, exclude=[FINGERPRINT_FILE])
+        record = store.add(self.history_key(), zip_path, manifest, meta)
+        store.set_current(self.history_key(), record.artifact_id)
+        info(f"Recorded deploy artifact {record.artifact_id} in history")
+        return record
+
+    def live_manifest(self) -> Optional[dict[str, dict]]:
+        store = self.history_store()
+        current = store.current(self.history_key())
+        record = store.get(self.history_key(), current) if current else None
+        return record.manifest() if record else None
+
+    def purge_cdn(self) -> None:
+        purger = CdnPurger(self.cli, self.config)
+        if not purger.enabled or self.dist_manifest is None:
+            return
+        if self.previous_manifest is None:
+            info("No previous manifest in deploy history; purging every non-hashed path.")
+        with self.metrics.step("purge"):
+            purger.purge(purge_paths(self.previous_manifest, self.dist_manifest))
+
+    def rollback_to(self, record: ArtifactRecord) -> None:
+        info(f"Rolling back to artifact {record.artifact_id} (no rebuild)...")
+        self.previous_manifest = self.live_manifest()
+        self.dist_manifest = record.manifest()
+        # Rollbacks skip configure_web_app, so bring the deploy-mode setting in line before deploying.
+        self.apply_deploy_mode(self.config.resource_group, self.config.web_app_name)
+        self.deploy_package(self.config.resource_group, self.config.web_app_name, str(record.package_path))
+        self.history_store().set_current(self.history_key(), record.artifact_id)
 
     def ensure_resource_group(self, resource_group: str, location: str) -> None:
-        info("Checking if resource group exists...")
-        exists = self.cli.cmd(["group", "exists", "--name", resource_group]).stdout.strip().lower() == "true"
-        if not exists:
+        snapshot = self.snapshot or self.load_snapshot()
+        action = group_action(snapshot.group(resource_group), resource_group, location)
+        if action.action == "create":
             info(f"Creating resource group: {resource_group}")
             self.cli.cmd(["group", "create", "--name", resource_group, "--location", location], capture_output=False)
             success("Resource group created")
@@ -53,18 +218,12 @@ class AzureAppServiceProvider(CloudProvider):
             success("Resource group already exists")
 
     def ensure_app_service_plan(self, plan_name: str, resource_group: str, location: str, sku: str) -> None:
-        info("Checking if app service plan exists...")
-        az_path = self.cli.require_path()
-        plan_check = subprocess.run(
-            [az_path, "appservice", "plan", "show", "--name", plan_name, "--resource-group", resource_group],
-            capture_output=True,
-            text=True,
-        )
-        if plan_check.returncode != 0:
+        snapshot = self.snapshot or self.load_snapshot()
+        action = plan_action(snapshot.plan(resource_group, plan_name), plan_name, sku, location)
+        if action.action == "create":
             info(f"Creating app service plan: {plan_name}")
-            created = subprocess.run(
+            created = self.cli.cmd(
                 [
-                    az_path,
                     "appservice",
                     "plan",
                     "create",
@@ -77,28 +236,33 @@ class AzureAppServiceProvider(CloudProvider):
                     "--sku",
                     sku,
                     "--is-linux",
-                ]
+                ],
+                capture_output=False,
+                check=False,
             )
             if created.returncode != 0:
                 error("Failed to create app service plan")
                 raise RuntimeError("App service plan creation failed")
             success("App service plan created")
+        elif action.action == "update" and not self.config.apply_updates:
+            warn(f"App service plan {plan_name} differs ({action.detail}); leaving it (set apply_updates to change it).")
+        elif action.action == "update":
+            info(f"Updating app service plan {plan_name}: {action.detail}")
+            self.cli.cmd(
+                ["appservice", "plan", "update", "--name", plan_name, "--resource-group", resource_group, "--sku", sku],
+                capture_output=False,
+            )
+            success("App service plan updated")
         else:
             success("App service plan already exists")
 
     def ensure_web_app(self, webapp_name: str, resource_group: str, plan_name: str) -> None:
-        info("Checking if web app exists...")
-        az_path = self.cli.require_path()
-        webapp_check = subprocess.run(
-            [az_path, "webapp", "show", "--name", webapp_name, "--resource-group", resource_group],
-            capture_output=True,
-            text=True,
-        )
-        if webapp_check.returncode != 0:
+        snapshot = self.snapshot or self.load_snapshot()
+        action = site_action(snapshot.site(resource_group, webapp_name), webapp_name, self.config.runtime)
+        if action.action == "create":
             info(f"Creating web app: {webapp_name}")
-            created = subprocess.run(
+            created = self.cli.cmd(
                 [
-                    az_path,
                     "webapp",
                     "create",
                     "--name",
@@ -109,18 +273,44 @@ class AzureAppServiceProvider(CloudProvider):
                     plan_name,
                     "--runtime",
                     self.config.runtime,
-                ]
+                ],
+                capture_output=False,
+                check=False,
             )
             if created.returncode != 0:
                 error("Failed to create web app")
                 raise RuntimeError("Web app creation failed")
             success("Web app created")
+        elif action.action == "update" and not self.config.apply_updates:
+            warn(f"Web app {webapp_name} differs ({action.detail}); leaving it (set apply_updates to change it).")
+        elif action.action == "update":
+            info(f"Updating web app {webapp_name}: {action.detail}")
+            self.cli.cmd(
+                [
+                    "webapp",
+                    "config",
+                    "set",
+                    "--resource-group",
+                    resource_group,
+                    "--name",
+                    webapp_name,
+                    "--linux-fx-version",
+                    linux_fx_version(self.config.runtime) or "",
+                ],
+                capture_output=False,
+            )
+            success("Web app runtime updated")
         else:
             success("Web app already exists")
 
+    @property
+    def runs_from_package(self) -> bool:
+        return self.config.deploy_mode == DEPLOY_MODE_PACKAGE
+
     def configure_web_app(self, resource_group: str, webapp_name: str) -> None:
         info("Configuring app settings for static site...")
-        self.cli.cmd(
+        settings = ["SCM_DO_BUILD_DURING_DEPLOYMENT=false", "ENABLE_ORYX_BUILD=false", "PORT=8080", "WEBSITES_PORT=8080"]
+        result = self.cli.cmd(
             [
                 "webapp",
                 "config",
@@ -131,13 +321,12 @@ class AzureAppServiceProvider(CloudProvider):
                 "--name",
                 webapp_name,
                 "--settings",
-                "SCM_DO_BUILD_DURING_DEPLOYMENT=false",
-                "ENABLE_ORYX_BUILD=false",
-                "PORT=8080",
-                "WEBSITES_PORT=8080",
-            ],
-            capture_output=False,
+                *settings,
+                "-o",
+                "json",
+            ]
         )
+        self.apply_deploy_mode(resource_group, webapp_name, result.stdout)
         info("Setting startup command to serve /home/site/wwwroot with pm2 on port 8080...")
         self.cli.cmd(
             [
@@ -168,28 +357,45 @@ class AzureAppServiceProvider(CloudProvider):
             capture_output=False,
         )
 
-    def build_app(self) -> None:
-        info("Building React application...")
-        yarn_cmd = shutil.which("yarn.cmd") or shutil.which("yarn")
-        yarn_ps1 = Path(os.environ.get("USERPROFILE", "")) / "AppData/Roaming/npm/yarn.ps1"
-        npm_cmd = shutil.which("npm")
-
-        if yarn_cmd:
-            cmd = [yarn_cmd, "build"]
-        elif yarn_ps1.exists():
-            cmd = ["powershell", "-ExecutionPolicy", "Bypass", "-File", str(yarn_ps1), "build"]
-        elif npm_cmd:
-            warn("yarn not found; falling back to npm run build")
-            cmd = [npm_cmd, "run", "build"]
-        else:
-            error("Neither yarn nor npm found on PATH. Please install Node.js tooling.")
-            raise RuntimeError("Node tooling not found")
+    def apply_deploy_mode(self, resource_group: str, webapp_name: str, settings_json: Optional[str] = None) -> None:
+        """Line WEBSITE_RUN_FROM_PACKAGE up with deploy_mode, from `appsettings set|list` output (listed when not given).
 
-        result = subprocess.run(cmd, cwd=self.workspace_root)
-        if result.returncode != 0:
-            error("Build failed")
-            raise RuntimeError("Build failed")
-        success("Build completed successfully")
+        Zip mode removes a leftover setting. Run-from-package mode only notes whether the setting is already on:
+        turning it on before the package is uploaded would remount wwwroot with no package, so deploy_package
+        turns it on after the upload instead.
+        """
+        if settings_json is None:
+            settings_json = self.cli.cmd(
+                ["webapp", "config", "appsettings", "list", "--resource-group", resource_group, "--name", webapp_name, "-o", "json"]
+            ).stdout
+        try:
+            current = {entry.get("name"): entry.get("value") for entry in json.loads(settings_json or "[]")}
+        except (ValueError, AttributeError):
+            current = {}
+        if self.runs_from_package:
+            # Newer az versions mask values in `set` output; a present setting is taken as on.
+            self.package_mounted = current.get(RUN_FROM_PACKAGE_SETTING, "0") in ("1", None)
+            return
+        if RUN_FROM_PACKAGE_SETTING in current:
+            # Left over from a run-from-package deploy, it would keep wwwroot mounted read-only from the old zip.
+            info(f"Removing {RUN_FROM_PACKAGE_SETTING} so zip deploys extract into wwwroot...")
+            self.cli.cmd(
+                [
+                    "webapp",
+                    "config",
+                    "appsettings",
+                    "delete",
+                    "--resource-group",
+                    resource_group,
+                    "--name",
+                    webapp_name,
+                    "--setting-names",
+                    RUN_FROM_PACKAGE_SETTING,
+                ]
+            )
+
+    def build_app(self) -> None:
+        run_workspace_build(self.workspace_root, self.config, self.metrics)
 
     def copy_web_config(self) -> None:
         info("Copying web.config to dist folder...")
@@ -207,9 +413,25 @@ class AzureAppServiceProvider(CloudProvider):
             os.makedirs(dest_dir, exist_ok=True)
         shutil.copy2(source, dest)
 
+    def local_inputs_digest(self) -> str:
+        return inputs_digest(
+            self.workspace_root, exclude=[self.config.dist_dir, self.config.history_dir, self.config.stats_db]
+        )
+
+    def fetch_fingerprint(self, base_url: str, timeout: int) -> Optional[dict]:
+        url = f"{base_url.rstrip('/')}/{FINGERPRINT_FILE}?t={int(time.time())}"
+        req = urllib.request.Request(url, headers={"Cache-Control": "no-cache"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                data = json.loads(resp.read().decode("utf-8"))
+        except Exception:
+            # Missing file, SPA fallback HTML, or network error all mean "unknown".
+            return None
+        return data if isinstance(data, dict) else None
+
     def quick_check(self, timeout: int, early: bool = False) -> tuple[bool, Optional[str]]:
         label = "QuickCheck (early)" if early else "QuickCheck"
-        info(f"{label}: verifying app status and HTTP reachability...")
+        info(f"{label}: comparing the deployed build fingerprint with the local build...")
         try:
             site_info = self.cli.json(
                 ["webapp", "show", "--name", self.config.web_app_name, "--resource-group", self.config.resource_group]
@@ -222,11 +444,23 @@ class AzureAppServiceProvider(CloudProvider):
         if not hostname:
             warn("QuickCheck missing hostname; continuing.")
             return False, None
-        base_url = f"https://{hostname}"
-        status = self.http_status(base_url, timeout)
-        info(f"   State: {state}, HTTP: {status}")
-        if state == "Running" and status == "200":
-            success("QuickCheck passed - site is up.")
+        base_url = self.site_url(hostname)
+        remote = self.fetch_fingerprint(base_url, timeout)
+        if early:
+            # Before building only the inputs can be compared; the dist folder may be stale.
+            key, local = "inputs", self.local_inputs_digest()
+        elif self.dist_manifest is not None:
+            # Taken when the package was built; dist_dir itself may already hold another job's build.
+            key, local = "manifest", manifest_digest(self.dist_manifest)
+        else:
+            dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
+            if not os.path.isdir(dist_path):
+                return False, base_url
+            key, local = "manifest", manifest_digest(build_manifest(dist_path, exclude=[FINGERPRINT_FILE]))
+        deployed = (remote or {}).get(key)
+        info(f"   State: {state}, deployed {key}: {(deployed or 'none')[:12]}, local: {local[:12]}")
+        if state == "Running" and deployed == local:
+            success("QuickCheck passed - deployed build matches local build.")
             info(f"Your app is available at: {base_url}")
             return True, base_url
         return False, base_url
@@ -235,44 +469,121 @@ class AzureAppServiceProvider(CloudProvider):
         if not os.path.isdir(dist_path):
             error(f"Build output folder '{self.config.dist_dir}' not found.")
             raise RuntimeError("Missing build output")
-        zip_name = f"deploy_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+        # Unique per app and run: service mode and fleet runs package several targets in one workspace at once.
+        zip_name = f"deploy_{self.config.web_app_name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}.zip"
         zip_path = os.path.join(self.workspace_root, zip_name)
         if os.path.exists(zip_path):
             os.remove(zip_path)
         info("Creating deployment package...")
+        self.dist_manifest = build_manifest(dist_path, exclude=[FINGERPRINT_FILE])
+        self.metrics.set_value("artifact.files", len(self.dist_manifest))
+        fingerprint = build_fingerprint(self.dist_manifest, self.local_inputs_digest())
         with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for root, _, files in os.walk(dist_path):
-                for f in files:
-                    full_path = os.path.join(root, f)
-                    rel_path = os.path.relpath(full_path, dist_path).replace("\\", "/")
-                    if rel_path.strip():
-                        zf.write(full_path, arcname=rel_path)
+            for rel_path, entry in self.dist_manifest.items():
+                with open(os.path.join(dist_path, rel_path), "rb") as src, zf.open(zip_entry(rel_path, entry["mtime"], entry["size"]), "w") as dest:
+                    shutil.copyfileobj(src, dest)
+            zf.writestr(FINGERPRINT_FILE, fingerprint_bytes(fingerprint))
+        self.fingerprint = fingerprint
         return zip_path
 
+    def kudu(self) -> Optional[KuduClient]:
+        if self._kudu is None:
+            self._kudu = KuduClient.from_cli(
+                self.cli, self.config.resource_group, self.config.web_app_name, scheme=self.config.url_scheme
+            )
+        return self._kudu
+
     def deploy_package(self, resource_group: str, webapp_name: str, zip_path: str) -> None:
-        info("Deploying package via Azure CLI (zip deploy)...")
-        az_path = self.cli.require_path()
-        result = subprocess.run(
-            [
-                az_path,
-                "webapp",
-                "deploy",
-                "--resource-group",
-                resource_group,
-                "--name",
-                webapp_name,
-                "--src-path",
-                zip_path,
-                "--type",
-                "zip",
-                "--clean",
-                "true",
-            ]
-        )
+        self.deploy_started = time.perf_counter()
+        if self.runs_from_package and not self.package_mounted:
+            self.switch_to_package(resource_group, webapp_name, zip_path)
+            return
+        if self.runs_from_package:
+            info("Deploying package via Azure CLI (run from package)...")
+            # The zip is stored as-is and swapped in as a whole, so there is nothing to clean.
+            mode_args = ["--type", "zip"]
+        else:
+            info("Deploying package via Azure CLI (zip deploy)...")
+            mode_args = ["--type", "zip", "--clean", "true"]
+        self.metrics.set_value("artifact.bytes", os.path.getsize(zip_path))
+        tail = None
+        try:
+            client = self.kudu()
+            if client:
+                tail = KuduDeploymentTail(client, self.metrics)
+                tail.start()
+        except Exception:
+            warn("   Kudu log streaming unavailable; continuing without it.")
+            tail = None
+        try:
+            with self.metrics.step("deploy.total"):
+                result = self.cli.cmd(
+                    [
+                        "webapp",
+                        "deploy",
+                        "--resource-group",
+                        resource_group,
+                        "--name",
+                        webapp_name,
+                        "--src-path",
+                        zip_path,
+                        *mode_args,
+                    ],
+                    capture_output=False,
+                    check=False,
+                    timeout=DEPLOY_TIMEOUT_SEC,
+                    # Not replayed: a timed-out deploy may still complete server-side, and each retry
+                    # re-uploads the whole package for up to DEPLOY_TIMEOUT_SEC.
+                    retry=NO_RETRY,
+                )
+        finally:
+            if tail:
+                tail.stop()
+        server_total = self.metrics.values.get("server.total_sec")
+        if server_total is not None:
+            upload = self.metrics.durations["deploy.total"] - server_total
+            self.metrics.record("upload", max(0.0, upload))
         if result.returncode != 0:
             error("Deployment failed")
             raise RuntimeError("Deployment failed")
 
+    def switch_to_package(self, resource_group: str, webapp_name: str, zip_path: str) -> None:
+        """First run-from-package deploy: upload the zip to SitePackages, then turn the setting on.
+
+        Changing the app setting restarts the app, which mounts the package named in packagename.txt, so the
+        site goes straight from the old wwwroot to the new build.
+        """
+        info(f"Switching to run from package: uploading the package before setting {RUN_FROM_PACKAGE_SETTING}=1...")
+        self.metrics.set_value("artifact.bytes", os.path.getsize(zip_path))
+        name = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S%f')}.zip"
+        try:
+            client = self.kudu()
+            if client is None:
+                raise RuntimeError("SCM host not found")
+            with self.metrics.step("deploy.total"):
+                client.put_package(name, Path(zip_path).read_bytes())
+                self.cli.cmd(
+                    [
+                        "webapp",
+                        "config",
+                        "appsettings",
+                        "set",
+                        "--resource-group",
+                        resource_group,
+                        "--name",
+                        webapp_name,
+                        "--settings",
+                        f"{RUN_FROM_PACKAGE_SETTING}=1",
+                        "-o",
+                        "json",
+                    ]
+                )
+        except (OSError, RuntimeError, subprocess.CalledProcessError) as exc:
+            error(f"Deployment failed: {exc}")
+            raise RuntimeError("Deployment failed") from exc
+        self.package_mounted = True
+        info(f"   Mounted {name}")
+
     def get_hostname(self) -> str:
         result = self.cli.cmd(
             [
@@ -290,7 +601,13 @@ class AzureAppServiceProvider(CloudProvider):
         )
         return (result.stdout or "").strip()
 
+    def site_url(self, hostname: Optional[str] = None) -> str:
+        return f"{self.config.url_scheme}://{hostname or self.get_hostname()}"
+
     def restart(self) -> None:
+        if self.runs_from_package:
+            info("Skipping restart: mounting the new package already restarted the app.")
+            return
         info("Restarting web app...")
         self.cli.cmd(
             ["webapp", "restart", "--resource-group", self.config.resource_group, "--name", self.config.web_app_name],
@@ -324,82 +641,95 @@ class AzureAppServiceProvider(CloudProvider):
         else:
             warn(f"[VALIDATION] Warning: checks failed (homepage={homepage_status}, asset={asset_status}).")
 
+    def warm_up(self, base_url: str) -> Optional[WarmupReport]:
+        if not self.config.warmup:
+            return None
+        dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
+        routes = discover_routes(dist_path, self.config.warmup_routes)
+        info(f"Warming up {len(routes)} route(s) at up to {self.config.warmup_rps:g} req/s...")
+        with self.metrics.step("warmup"):
+            report = warm_up(
+                base_url,
+                routes,
+                rps=self.config.warmup_rps,
+                max_rounds=self.config.warmup_max_rounds,
+                timeout=self.config.check_timeout_sec,
+            )
+        report.print()
+        return report
+
     def kudu_vfs_check(self) -> None:
-        info("Checking index.html via Kudu VFS...")
+        info("Verifying wwwroot via Kudu VFS...")
         try:
-            hostnames = self.cli.json(
-                [
-                    "webapp",
-                    "show",
-                    "--resource-group",
-                    self.config.resource_group,
-                    "--name",
-                    self.config.web_app_name,
-                    "--query",
-                    "enabledHostNames",
-                ]
-            )
-            scm_host = None
-            for host in hostnames or []:
-                if host and ".scm." in host:
-                    scm_host = host
-                    break
-            if not scm_host:
+            client = self.kudu()
+            if not client:
                 warn("   SCM host not found; skipping VFS check.")
                 return
-            creds = self.cli.json(
-                [
-                    "webapp",
-                    "deployment",
-                    "list-publishing-credentials",
-                    "--resource-group",
-                    self.config.resource_group,
-                    "--name",
-                    self.config.web_app_name,
-                ]
-            )
-            user = creds.get("publishingUserName", "")
-            pwd = creds.get("publishingPassword", "")
-            token = base64.b64encode(f"{user}:{pwd}".encode("ascii")).decode("ascii")
-            headers = {"Authorization": f"Basic {token}"}
-            idx_url = f"https://{scm_host}/api/vfs/site/wwwroot/index.html"
-            req = urllib.request.Request(idx_url, method="HEAD", headers=headers)
-            try:
-                with urllib.request.urlopen(req, timeout=20) as resp:
-                    info(f"   index.html status: {resp.getcode()} (exists)")
-                    return
-            except urllib.error.HTTPError:
-                warn("   index.html not found via VFS (or inaccessible). Listing top-level entries...")
-            dir_url = f"https://{scm_host}/api/vfs/site/wwwroot/"
-            dir_req = urllib.request.Request(dir_url, headers=headers)
+            if self.runs_from_package:
+                self.verify_site_package(client)
+                return
+            dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
+            local = self.dist_manifest
+            if local is None and os.path.isdir(dist_path):
+                local = build_manifest(dist_path, exclude=[FINGERPRINT_FILE])
+            if local:
+                self.verify_integrity(client, local)
+                return
+            status = client.head("/api/vfs/site/wwwroot/index.html")
+            if status == 200:
+                info(f"   index.html status: {status} (exists)")
+                return
+            warn("   index.html not found via VFS (or inaccessible). Listing top-level entries...")
             try:
-                with urllib.request.urlopen(dir_req, timeout=20) as resp:
-                    content = resp.read().decode("utf-8", errors="ignore")
-                    entries = json.loads(content)
-                    for entry in entries[:5]:
-                        info(f"   - {entry.get('name')}")
+                entries = client.get_json("/api/vfs/site/wwwroot/")
+                for entry in entries[:5]:
+                    info(f"   - {entry.get('name')}")
             except Exception:
                 warn("   Could not list wwwroot contents from VFS.")
         except Exception:
             warn("   VFS check encountered an issue; continuing.")
 
+    def verify_site_package(self, client: KuduClient) -> bool:
+        """Run-from-package mounts the zip inside the app container, so check the active package instead of wwwroot."""
+        status, body = client.request("GET", SITE_PACKAGES_DIR + "packagename.txt")
+        if status != 200:
+            warn(f"   packagename.txt not readable via VFS (HTTP {status}); is {RUN_FROM_PACKAGE_SETTING}=1 set?")
+            return False
+        active = body.decode("utf-8", errors="ignore").strip()
+        entries = {entry.get("name"): entry for entry in client.get_json(SITE_PACKAGES_DIR) or []}
+        expected = self.metrics.values.get("artifact.bytes")
+        size = (entries.get(active) or {}).get("size")
+        info(f"   Active package: {active or '(none)'} ({size if size is not None else '?'} bytes)")
+        if active not in entries:
+            warn("[VALIDATION] The active site package is missing from SitePackages.")
+            return False
+        if expected is not None and size != expected:
+            warn(f"[VALIDATION] The active site package is {size} bytes; the uploaded package was {expected} bytes.")
+            return False
+        success("[VALIDATION] The active site package matches the uploaded package.")
+        return True
+
+    def verify_integrity(self, client: KuduClient, local: dict[str, dict]) -> IntegrityReport:
+        # Kudu keeps zip entry times, and create_zip stamps entries with the manifest mtimes.
+        report = verify_wwwroot(client, local, check_mtime=True)
+        info(
+            f"   Checked {report.checked}/{len(local)} files in {report.listings} listings ({report.elapsed:.1f}s): "
+            f"{len(report.missing)} missing, {len(report.mismatched)} mismatched, {len(report.extra)} extra, "
+            f"{report.hashed} hashed"
+        )
+        for label, paths in (("missing", report.missing), ("mismatched", report.mismatched), ("extra", report.extra)):
+            for rel_path in paths[:10]:
+                info(f"   {label}: {rel_path}")
+            if len(paths) > 10:
+                info(f"   ... {len(paths) - 10} more {label}")
+        if report.unverified:
+            warn(f"   {len(report.unverified)} file(s) with unexpected mtimes were not hashed (limit reached).")
+        if report.ok:
+            success("[VALIDATION] wwwroot matches the local build.")
+        else:
+            warn("[VALIDATION] wwwroot differs from the local build.")
+        return report
+
     @staticmethod
     def http_status(url: str, timeout: int) -> str:
-        curl = shutil.which("curl")
-        if curl:
-            try:
-                result = subprocess.run(
-                    [curl, "-sS", "-o", os.devnull, "-w", "%{http_code}", url],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                )
-                return (result.stdout or "000").strip()
-            except Exception:
-                return "000"
-        try:
-            req = urllib.request.Request(url, method="HEAD")
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                return str(resp.getcode())
-        except Exception:
-            return "000"
+        return http_status(url, timeout)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Optional
+from urllib.parse import parse_qsl, quote, urlsplit
+
+from cloud.core.content import cache_control, content_type
+from cloud.core.http import HttpSession
+
+API_VERSION = "2021-08-06"
+BLOCK_SIZE = 4 * 1024 * 1024
+# Azurite's published development account; only used when pointing at a local emulator.
+EMULATOR_ACCOUNT = "devstoreaccount1"
+EMULATOR_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+
+
+def file_md5_b64(path: str) -> str:
+    digest = hashlib.md5()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return base64.b64encode(digest.digest()).decode("ascii")
+
+
+@dataclass(frozen=True)
+class RemoteBlob:
+    name: str
+    size: int
+    content_md5: Optional[str]
+    content_type: Optional[str] = None
+    cache_control: Optional[str] = None
+
+
+class BlobError(RuntimeError):
+    pass
+
+
+class BlobClient:
+    """Minimal Blob REST client (Shared Key auth) for syncing a static site to a container."""
+
+    def __init__(
+        self,
+        account: str,
+        key: str,
+        *,
+        endpoint: Optional[str] = None,
+        timeout: float = 60,
+        block_workers: int = 4,
+    ) -> None:
+        self.account = account
+        self._key = base64.b64decode(key)
+        self.endpoint = (endpoint or f"https://{account}.blob.core.windows.net").rstrip("/")
+        self.session = HttpSession(self.endpoint, timeout=timeout)
+        self._path_prefix = urlsplit(self.endpoint).path.rstrip("/")
+        self.block_workers = block_workers
+
+    def _sign(self, method: str, path: str, headers: dict[str, str], length: int) -> str:
+        url_path, _, query = path.partition("?")
+        canonical_headers = "".join(
+            f"{k}:{v.strip()}\n" for k, v in sorted((k.lower(), v) for k, v in headers.items() if k.lower().startswith("x-ms-"))
+        )
+        resource = f"/{self.account}{self._path_prefix}{url_path}"
+        params: dict[str, list[str]] = {}
+        for k, v in parse_qsl(query, keep_blank_values=True):
+            params.setdefault(k.lower(), []).append(v)
+        for k in sorted(params):
+            resource += f"\n{k}:{','.join(sorted(params[k]))}"
+        lookup = {k.lower(): v for k, v in headers.items()}
+        string_to_sign = "\n".join(
+            [
+                method,
+                lookup.get("content-encoding", ""),
+                lookup.get("content-language", ""),
+                str(length) if length else "",
+                lookup.get("content-md5", ""),
+                lookup.get("content-type", ""),
+                "",
+                lookup.get("if-modified-since", ""),
+                lookup.get("if-match", ""),
+                lookup.get("if-none-match", ""),
+                lookup.get("if-unmodified-since", ""),
+                lookup.get("range", ""),
+            ]
+        ) + "\n" + canonical_headers + resource
+        signature = base64.b64encode(hmac.new(self._key, string_to_sign.encode("utf-8"), hashlib.sha256).digest())
+        return f"SharedKey {self.account}:{signature.decode('ascii')}"
+
+    def request(self, method: str, path: str, data: bytes = b"", headers: Optional[dict] = None) -> tuple[int, dict, bytes]:
+        all_headers = {
+            "x-ms-date": formatdate(usegmt=True),
+            "x-ms-version": API_VERSION,
+            **(headers or {}),
+        }
+        if method in ("PUT", "POST"):
+            all_headers["Content-Length"] = str(len(data))
+        all_headers["Authorization"] = self._sign(method, path, all_headers, len(data))
+        status, response_headers, body = self.session.request(method, path, data=data or None, headers=all_headers)
+        if status >= 400 and not (method == "DELETE" and status == 404):
+            raise BlobError(f"Blob {method} {path.split('?')[0]} returned {status}: {body[:300]!r}")
+        return status, response_headers, body
+
+    @staticmethod
+    def _blob_path(container: str, name: str) -> str:
+        return f"/{container}/{quote(name)}"
+
+    def ensure_container(self, container: str) -> None:
+        try:
+            self.request("PUT", f"/{container}?restype=container")
+        except BlobError as exc:
+            if "409" not in str(exc):
+                raise
+
+    def enable_static_website(self, index_document: str = "index.html", error_document: str = "index.html") -> None:
+        # Omitted service properties are left unchanged by the service.
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?><StorageServiceProperties><StaticWebsite>'
+            f"<Enabled>true</Enabled><IndexDocument>{index_document}</IndexDocument>"
+            f"<ErrorDocument404Path>{error_document}</ErrorDocument404Path>"
+            "</StaticWebsite></StorageServiceProperties>"
+        ).encode("utf-8")
+        self.request("PUT", "/?restype=service&comp=properties", body, {"Content-Type": "application/xml"})
+
+    def list_blobs(self, container: str) -> dict[str, RemoteBlob]:
+        blobs: dict[str, RemoteBlob] = {}
+        marker = ""
+        while True:
+            query = "restype=container&comp=list&maxresults=5000"
+            if marker:
+                query += f"&marker={quote(marker)}"
+            _, _, body = self.request("GET", f"/{container}?{query}")
+            root = ET.fromstring(body)
+            for blob in root.iter("Blob"):
+                name = blob.findtext("Name") or ""
+                props = blob.find("Properties")
+                size = int(props.findtext("Content-Length") or 0) if props is not None else 0
+                if props is None:
+                    blobs[name] = RemoteBlob(name, size, None)
+                    continue
+                blobs[name] = RemoteBlob(
+                    name,
+                    size,
+                    props.findtext("Content-MD5") or None,
+                    props.findtext("Content-Type") or None,
+                    props.findtext("Cache-Control") or None,
+                )
+            marker = root.findtext("NextMarker") or ""
+            if not marker:
+                return blobs
+
+    @staticmethod
+    def _blob_headers(name: str, md5_b64: str) -> dict[str, str]:
+        return {
+            "x-ms-blob-content-type": content_type(name),
+            "x-ms-blob-cache-control": cache_control(name),
+            "x-ms-blob-content-md5": md5_b64,
+        }
+
+    def upload_file(self, container: str, name: str, path: str, md5_b64: str) -> None:
+        size = os.path.getsize(path)
+        blob_headers = self._blob_headers(name, md5_b64)
+        blob_path = self._blob_path(container, name)
+        if size <= BLOCK_SIZE:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            self.request("PUT", blob_path, data, {"x-ms-blob-type": "BlockBlob", **blob_headers})
+            return
+
+        count = (size + BLOCK_SIZE - 1) // BLOCK_SIZE
+        block_ids = [base64.b64encode(f"block-{i:06d}".encode("ascii")).decode("ascii") for i in range(count)]
+
+        def put_block(index: int) -> None:
+            with open(path, "rb") as handle:
+                handle.seek(index * BLOCK_SIZE)
+                chunk = handle.read(BLOCK_SIZE)
+            self.request("PUT", f"{blob_path}?comp=block&blockid={quote(block_ids[index])}", chunk)
+
+        with ThreadPoolExecutor(max_workers=self.block_workers) as pool:
+            list(pool.map(put_block, range(count)))
+        block_list = "".join(f"<Latest>{b}</Latest>" for b in block_ids)
+        body = f'<?xml version="1.0" encoding="utf-8"?><BlockList>{block_list}</BlockList>'.encode("utf-8")
+        self.request("PUT", f"{blob_path}?comp=blocklist", body, {"Content-Type": "application/xml", **blob_headers})
+
+    def set_properties(self, container: str, name: str, md5_b64: str) -> None:
+        # Set Blob Properties replaces every content header, so send the MD5 along with the ones being fixed.
+        self.request("PUT", f"{self._blob_path(container, name)}?comp=properties", b"", self._blob_headers(name, md5_b64))
+
+    def delete_blob(self, container: str, name: str) -> None:
+        self.request("DELETE", self._blob_path(container, name))
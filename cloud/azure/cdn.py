@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from cloud.azure.cli import AzureCli
+from cloud.core.console import info, success, warn
+from cloud.core.content import edge_paths
+from cloud.core.manifest import diff_manifests
+from cloud.core.models import DeploymentConfig
+
+PURGE_BATCH = 50
+PURGE_WORKERS = 4
+
+
+def purge_paths(old: Optional[dict[str, dict]], new: dict[str, dict]) -> list[str]:
+    """Edge paths that may serve stale content after moving from `old` to `new`.
+
+    Content-hashed assets get new names on every change, so they never need purging. Added paths are
+    included because an SPA fallback may have cached index.html under them.
+    """
+    if old is None:
+        return edge_paths(list(new))
+    added, changed, removed = diff_manifests(old, new)
+    return edge_paths(added + changed + removed)
+
+
+class CdnPurger:
+    def __init__(self, cli: AzureCli, config: DeploymentConfig) -> None:
+        self.cli = cli
+        self.config = config
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.cdn_profile and self.config.cdn_endpoint)
+
+    def _purge_batch(self, paths: list[str]) -> list[str]:
+        """Purges one batch; returns the paths left unpurged when the call fails."""
+        resource_group = self.config.cdn_resource_group or self.config.resource_group
+        if (self.config.cdn_kind or "afd").lower() == "afd":
+            group = ["afd", "endpoint", "purge", "--endpoint-name", self.config.cdn_endpoint]
+        else:
+            group = ["cdn", "endpoint", "purge", "--name", self.config.cdn_endpoint]
+        try:
+            self.cli.cmd(
+                [*group, "--resource-group", resource_group, "--profile-name", self.config.cdn_profile, "--content-paths", *paths]
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
+            detail = (getattr(exc, "stderr", None) or "").strip().splitlines()
+            warn(f"CDN purge of {len(paths)} path(s) failed: {detail[-1] if detail else exc}")
+            return paths
+        return []
+
+    def purge(self, paths: list[str]) -> list[str]:
+        """Purges `paths` in batches. A failed purge only leaves stale edge copies behind, so it warns
+        and returns the unpurged paths rather than failing a deploy that has already gone live."""
+        if not paths:
+            info("No cacheable paths changed; skipping CDN purge.")
+            return []
+        batches = [paths[i:i + PURGE_BATCH] for i in range(0, len(paths), PURGE_BATCH)]
+        info(f"Purging {len(paths)} CDN path(s) in {len(batches)} batch(es)...")
+        for path in paths[:10]:
+            info(f"   - {path}")
+        with ThreadPoolExecutor(max_workers=PURGE_WORKERS) as pool:
+            unpurged = [path for failed in pool.map(self._purge_batch, batches) for path in failed]
+        if not unpurged:
+            success("CDN purge completed")
+            return []
+        warn(f"{len(unpurged)} of {len(paths)} CDN path(s) were not purged and may serve stale content until they expire:")
+        for path in unpurged:
+            warn(f"   - {path}")
+        return unpurged
@@ -3,14 +3,88 @@ from __future__ import annotations
 import json
 import shutil
 import subprocess
+from pathlib import Path
+from typing import Optional
 
+from cloud.azure.ratelimit import ArmRateLimiter
 from cloud.core.console import error, info, warn
-from cloud.core.exec import run_command
+from cloud.core.exec import RetryPolicy, is_transient, run_command
+from cloud.core.models import DeploymentConfig
 
+DEFAULT_TIMEOUT_SEC = 300
+DEFAULT_RETRY = RetryPolicy(attempts=4, base_delay=2.0, max_delay=60.0)
+
+# Command groups that never reach the ARM management plane.
+LOCAL_GROUPS = {"account", "login", "logout", "version", "extension", "config", "bicep", "cache"}
+READ_VERBS = {"show", "list", "exists", "query", "get", "check-name"}
+# Commands whose responses carry secrets; --debug would log the response body to stderr.
+SECRET_WORDS = {
+    "list-publishing-credentials",
+    "list-publishing-profiles",
+    "keys",
+    "appsettings",
+    "connection-string",
+    "show-connection-string",
+    "generate-sas",
+    "get-access-token",
+}
+# az --debug log records; a record's continuation lines (multi-line bodies, tracebacks) carry no prefix.
+DEBUG_PREFIXES = ("DEBUG:", "INFO:", "urllib3", "cli.", "msal")
+LEVEL_PREFIXES = ("ERROR:", "WARNING:", "CRITICAL:")
+
+
+def arm_kind(args: list[str]) -> Optional[str]:
+    if not args or args[0] in LOCAL_GROUPS:
+        return None
+    verbs = [a for a in args if not a.startswith("-")]
+    return "read" if any(v in READ_VERBS for v in verbs[:4]) else "write"
+
+
+def returns_secrets(args: list[str]) -> bool:
+    return any(a in SECRET_WORDS for a in args if not a.startswith("-"))
+
+
+class DebugFilter:
+    """Tells az --debug log lines apart from real output, one stream at a time."""
 
-class AzureCli:
     def __init__(self) -> None:
-        self.az_path: str | None = shutil.which("az") or shutil.which("az.cmd")
+        self.in_record = False
+
+    def is_debug(self, line: str) -> bool:
+        if line.startswith(DEBUG_PREFIXES):
+            self.in_record = True
+        elif line.startswith(LEVEL_PREFIXES):
+            self.in_record = False
+        return self.in_record
+
+
+def strip_debug(text: str) -> str:
+    lines = (text or "").splitlines(keepends=True)
+    keep = DebugFilter()
+    return "".join(line for line in lines if not keep.is_debug(line))
+
+
+class AzureCli:
+    def __init__(
+        self,
+        *,
+        timeout: Optional[float] = DEFAULT_TIMEOUT_SEC,
+        retry: RetryPolicy = DEFAULT_RETRY,
+        rate_limiter: Optional[ArmRateLimiter] = None,
+        observe_ratelimit_headers: bool = True,
+        az_path: Optional[str] = None,
+    ) -> None:
+        self.az_path: str | None = az_path or shutil.which("az") or shutil.which("az.cmd")
+        self.timeout = timeout
+        self.retry = retry
+        self.rate_limiter = rate_limiter or ArmRateLimiter()
+        self.observe_ratelimit_headers = observe_ratelimit_headers
+        self.subscription_id: Optional[str] = None
+
+    @classmethod
+    def from_config(cls, config: DeploymentConfig) -> "AzureCli":
+        limiter = ArmRateLimiter(state_dir=Path(config.ratelimit_dir).expanduser()) if config.ratelimit_dir else None
+        return cls(timeout=config.az_timeout_sec, az_path=config.az_path, rate_limiter=limiter)
 
     def require_path(self) -> str:
         if not self.az_path:
@@ -22,23 +96,90 @@ class AzureCli:
             error("Azure CLI is not installed. Install from https://aka.ms/installazurecliwindows")
             raise RuntimeError("Azure CLI not installed")
         info("Checking Azure login status...")
-        login_check = subprocess.run([self.az_path, "account", "show"], capture_output=True, text=True)
+        login_check = run_command([self.az_path, "account", "show"], check=False, timeout=self.timeout, retry=self.retry)
         if login_check.returncode != 0:
             warn("Not logged in to Azure. Initiating login...")
             login = subprocess.run([self.az_path, "login"])
             if login.returncode != 0:
                 error("Azure login failed")
                 raise RuntimeError("Azure login failed")
+            login_check = run_command([self.az_path, "account", "show"], check=False, timeout=self.timeout)
+        self._bind_subscription(login_check.stdout)
         info("Azure login verified")
 
-    def cmd(self, args: list[str], *, capture_output: bool = True, check: bool = True) -> subprocess.CompletedProcess[str]:
-        az_path = self.require_path()
-        return run_command([az_path, *args], capture_output=capture_output, check=check)
+    def _bind_subscription(self, account_json: str) -> None:
+        # ARM budgets are per subscription, so share the limiter state with every process using the same one.
+        try:
+            subscription_id = json.loads(account_json or "{}").get("id")
+        except ValueError:
+            subscription_id = None
+        self.subscription_id = subscription_id
+        if subscription_id and self.rate_limiter.key == "default":
+            self.rate_limiter = ArmRateLimiter(subscription_id, state_dir=self.rate_limiter.state_dir)
+
+    def _run(
+        self,
+        args: list[str],
+        *,
+        check: bool,
+        timeout: Optional[float],
+        stream: bool,
+        retry: Optional[RetryPolicy] = None,
+    ) -> subprocess.CompletedProcess[str]:
+        cmd = [self.require_path(), *args]
+        retry = self.retry if retry is None else retry
+        kind = arm_kind(args)
+        if kind is None:
+            return run_command(cmd, check=check, timeout=timeout or self.timeout, retry=retry, stream=stream)
+        limiter = self.rate_limiter
+        debug = self.observe_ratelimit_headers and "--debug" not in args and not returns_secrets(args)
+        if debug:
+            # --debug logs response headers to stderr, which is where the remaining-budget values come from.
+            cmd.append("--debug")
+        filters = {"stdout": DebugFilter(), "stderr": DebugFilter()}
+
+        def echo(name: str, line: str) -> None:
+            if not (debug and filters[name].is_debug(line)):
+                info(line)
+
+        def transient(result: subprocess.CompletedProcess[str]) -> bool:
+            # The debug dump mentions status codes and timeouts of every request, not just the failed one.
+            return is_transient(subprocess.CompletedProcess(result.args, result.returncode, result.stdout, strip_debug(result.stderr)))
+
+        def observe(result: subprocess.CompletedProcess[str]) -> None:
+            filters["stdout"], filters["stderr"] = DebugFilter(), DebugFilter()
+            limiter.observe_output(result.stderr or "")
+
+        result = run_command(
+            cmd,
+            check=False,
+            timeout=timeout or self.timeout,
+            retry=retry,
+            on_line=echo if stream else None,
+            before_attempt=lambda: limiter.acquire(kind),
+            after_attempt=observe,
+            transient=transient if debug else is_transient,
+        )
+        if debug:
+            result = subprocess.CompletedProcess(result.args, result.returncode, result.stdout, strip_debug(result.stderr))
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+        return result
+
+    def cmd(
+        self,
+        args: list[str],
+        *,
+        capture_output: bool = True,
+        check: bool = True,
+        timeout: Optional[float] = None,
+        retry: Optional[RetryPolicy] = None,
+    ) -> subprocess.CompletedProcess[str]:
+        # Uncaptured commands are streamed line by line so failures can still be classified for retry.
+        return self._run(args, check=check, timeout=timeout, stream=not capture_output, retry=retry)
 
     def json(self, args: list[str]) -> dict:
-        az_path = self.require_path()
-        cmd = [az_path, *args]
         if "-o" not in args and "--output" not in args:
-            cmd += ["-o", "json"]
-        result = run_command(cmd)
+            args = [*args, "-o", "json"]
+        result = self._run(args, check=True, timeout=None, stream=False)
         return json.loads(result.stdout or "{}")
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from cloud.azure.cli import AzureCli
+from cloud.core.console import info, success, warn
+from cloud.core.models import DeploymentConfig
+
+PAGE_SIZE = 1000
+GROUP_TYPE = "microsoft.resources/subscriptions/resourcegroups"
+PLAN_TYPE = "microsoft.web/serverfarms"
+SITE_TYPE = "microsoft.web/sites"
+
+# (query, skip_token) -> one page shaped like `az graph query` output: {"data": [...], "skip_token": ...}
+GraphQuery = Callable[[str, Optional[str]], dict]
+
+
+def plan_name_for(config: DeploymentConfig) -> str:
+    return f"{config.web_app_name}-plan"
+
+
+def linux_fx_version(runtime: str) -> Optional[str]:
+    """NODE:20-lts -> NODE|20-lts; Windows runtimes have no linuxFxVersion."""
+    return runtime.replace(":", "|") if ":" in runtime else None
+
+
+def _kql_list(values: Iterable[str]) -> str:
+    return ", ".join("'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'" for value in sorted(set(values)))
+
+
+def build_query(resource_groups: Iterable[str]) -> str:
+    """Resource groups, App Service plans and web apps in the given groups, in one Resource Graph query."""
+    groups = _kql_list(resource_groups)
+    return (
+        "resourcecontainers"
+        f" | where type =~ '{GROUP_TYPE}' and name in~ ({groups})"
+        " | project id, type, name, resourceGroup = name, location, sku = '', runtime = '', serverFarmId = '',"
+        " siteProperties = dynamic(null)"
+        " | union (resources"
+        f" | where type in~ ('{PLAN_TYPE}', '{SITE_TYPE}') and resourceGroup in~ ({groups})"
+        " | project id, type, name, resourceGroup, location, sku = tostring(sku.name),"
+        " runtime = tostring(properties.siteConfig.linuxFxVersion), serverFarmId = tostring(properties.serverFarmId),"
+        " siteProperties = properties.siteProperties.properties)"
+        " | order by id asc"
+    )
+
+
+def cli_graph_query(cli: AzureCli, page_size: int = PAGE_SIZE) -> GraphQuery:
+    """Pages through `az graph query` (resource-graph extension), scoped to the logged-in subscription."""
+
+    def query(kql: str, skip_token: Optional[str]) -> dict:
+        args = ["graph", "query", "-q", kql, "--first", str(page_size)]
+        if cli.subscription_id:
+            args += ["--subscriptions", cli.subscription_id]
+        if skip_token:
+            args += ["--skip-token", skip_token]
+        return cli.json(args)
+
+    return query
+
+
+def canned_query(rows: list[dict], page_size: int = PAGE_SIZE) -> GraphQuery:
+    """Stand-in for Resource Graph that pages through fixed rows, e.g. a saved `az graph query` result."""
+
+    def query(_kql: str, skip_token: Optional[str]) -> dict:
+        start = int(skip_token or 0)
+        end = start + page_size
+        return {"data": rows[start:end], "skip_token": str(end) if end < len(rows) else None}
+
+    return query
+
+
+@dataclass(frozen=True)
+class ResourceState:
+    name: str
+    resource_group: str
+    location: str = ""
+    sku: Optional[str] = None
+    # linuxFxVersion for web apps; None when unknown (Windows, or not returned).
+    runtime: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "ResourceState":
+        runtime = row.get("runtime") or None
+        if not runtime:
+            for prop in row.get("siteProperties") or []:
+                if str(prop.get("name", "")).lower() == "linuxfxversion" and prop.get("value"):
+                    runtime = prop["value"]
+        return cls(row.get("name", ""), row.get("resourceGroup", ""), row.get("location", ""), row.get("sku") or None, runtime)
+
+    @classmethod
+    def from_show(cls, data: dict[str, Any]) -> "ResourceState":
+        """State from `az group|appservice plan|webapp show` JSON."""
+        sku = data.get("sku")
+        site_config = data.get("siteConfig") or {}
+        return cls(
+            data.get("name", ""),
+            data.get("resourceGroup") or data.get("name", ""),
+            data.get("location", ""),
+            (sku.get("name") if isinstance(sku, dict) else sku) or None,
+            site_config.get("linuxFxVersion") or None,
+        )
+
+
+@dataclass(frozen=True)
+class Action:
+    resource: str
+    name: str
+    action: str
+    detail: str = ""
+
+
+def group_action(state: Optional[ResourceState], name: str, location: str) -> Action:
+    if state is None:
+        return Action("resource group", name, "create", f"in {location}")
+    return Action("resource group", name, "leave")
+
+
+def plan_action(state: Optional[ResourceState], name: str, sku: str, location: str) -> Action:
+    if state is None:
+        return Action("app service plan", name, "create", f"{sku} in {location}")
+    if state.sku and state.sku.lower() != sku.lower():
+        return Action("app service plan", name, "update", f"sku {state.sku} -> {sku}")
+    return Action("app service plan", name, "leave")
+
+
+def site_action(state: Optional[ResourceState], name: str, runtime: str) -> Action:
+    if state is None:
+        return Action("web app", name, "create", runtime)
+    wanted = linux_fx_version(runtime)
+    if wanted and state.runtime and state.runtime.lower() != wanted.lower():
+        return Action("web app", name, "update", f"runtime {state.runtime} -> {wanted}")
+    return Action("web app", name, "leave")
+
+
+class ResourceSnapshot:
+    """Resource groups, plans and web apps keyed case-insensitively, as Azure names are."""
+
+    def __init__(self, rows: Iterable[dict[str, Any]] = ()) -> None:
+        self.groups: dict[str, ResourceState] = {}
+        self.plans: dict[tuple[str, str], ResourceState] = {}
+        self.sites: dict[tuple[str, str], ResourceState] = {}
+        self.pages = 0
+        for row in rows:
+            self.add(str(row.get("type", "")).lower(), ResourceState.from_row(row))
+
+    @classmethod
+    def fetch(cls, query: GraphQuery, resource_groups: Iterable[str]) -> "ResourceSnapshot":
+        kql = build_query(resource_groups)
+        rows: list[dict] = []
+        pages = 0
+        skip_token: Optional[str] = None
+        while True:
+            page = query(kql, skip_token)
+            pages += 1
+            rows.extend(page.get("data") or [])
+            skip_token = page.get("skip_token") or page.get("$skipToken")
+            if not skip_token:
+                break
+        snapshot = cls(rows)
+        snapshot.pages = pages
+        return snapshot
+
+    def add(self, kind: str, state: ResourceState) -> None:
+        rg = state.resource_group.lower()
+        if kind == GROUP_TYPE:
+            self.groups[rg] = state
+        elif kind == PLAN_TYPE:
+            self.plans[(rg, state.name.lower())] = state
+        elif kind == SITE_TYPE:
+            self.sites[(rg, state.name.lower())] = state
+
+    def group(self, resource_group: str) -> Optional[ResourceState]:
+        return self.groups.get(resource_group.lower())
+
+    def plan(self, resource_group: str, name: str) -> Optional[ResourceState]:
+        return self.plans.get((resource_group.lower(), name.lower()))
+
+    def site(self, resource_group: str, name: str) -> Optional[ResourceState]:
+        return self.sites.get((resource_group.lower(), name.lower()))
+
+    def plan_target(self, config: DeploymentConfig) -> list[Action]:
+        rg = config.resource_group
+        plan_name = plan_name_for(config)
+        return [
+            group_action(self.group(rg), rg, config.location),
+            plan_action(self.plan(rg, plan_name), plan_name, config.sku, config.location),
+            site_action(self.site(rg, config.web_app_name), config.web_app_name, config.runtime),
+        ]
+
+    def apply(self, config: DeploymentConfig) -> None:
+        """Record the target's resources as provisioned, so later targets sharing them see them."""
+        rg = config.resource_group
+        self.add(GROUP_TYPE, ResourceState(rg, rg, config.location))
+        self.add(PLAN_TYPE, ResourceState(plan_name_for(config), rg, config.location, config.sku))
+        self.add(SITE_TYPE, ResourceState(config.web_app_name, rg, config.location, None, linux_fx_version(config.runtime)))
+
+
+def plan_fleet(snapshot: ResourceSnapshot, configs: Iterable[DeploymentConfig]) -> list[tuple[DeploymentConfig, list[Action]]]:
+    """Per-target actions in order; a resource group created for one target is not created again for the next."""
+    working = copy.deepcopy(snapshot)
+    plans = []
+    for config in configs:
+        plans.append((config, working.plan_target(config)))
+        working.apply(config)
+    return plans
+
+
+def print_plan(plans: list[tuple[DeploymentConfig, list[Action]]]) -> dict[str, int]:
+    totals = {"create": 0, "update": 0, "leave": 0}
+    held = 0
+    for config, actions in plans:
+        info(f"{config.resource_group}/{config.web_app_name}")
+        for action in actions:
+            totals[action.action] += 1
+            held += action.action == "update" and not config.apply_updates
+            line = f"   {action.action.ljust(6)} {action.resource} {action.name}" + (f" ({action.detail})" if action.detail else "")
+            if action.action == "leave":
+                info(line)
+            else:
+                warn(line)
+    summary = f"Plan: {totals['create']} to create, {totals['update']} to update, {totals['leave']} unchanged."
+    if totals["create"] or totals["update"]:
+        info(summary)
+    else:
+        success(summary)
+    if held:
+        warn(f"{held} update(s) will only be reported, not applied, unless apply_updates (--apply-updates) is set.")
+    return totals
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+
+from cloud.azure.kudu import KuduClient
+from cloud.core.fingerprint import FINGERPRINT_FILE
+
+DIRECTORY_MIME = "inode/directory"
+LISTING_WORKERS = 16
+HASH_WORKERS = 8
+# Most suspect files downloaded and hashed per check; the rest are reported as unverified.
+HASH_LIMIT = 200
+# Zip entries store times at two-second resolution.
+MTIME_TOLERANCE_SEC = 2
+# Files Kudu or the platform may leave in wwwroot that are not part of the build.
+IGNORED_REMOTE = {FINGERPRINT_FILE, "hostingstart.html"}
+
+
+@dataclass
+class IntegrityReport:
+    missing: list[str] = field(default_factory=list)
+    extra: list[str] = field(default_factory=list)
+    mismatched: list[str] = field(default_factory=list)
+    # Same size as the local file, but its mtime does not match the build; confirmed by content hash.
+    suspect: list[str] = field(default_factory=list)
+    unverified: list[str] = field(default_factory=list)
+    checked: int = 0
+    hashed: int = 0
+    listings: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.mismatched)
+
+
+def list_remote_tree(client: KuduClient, root: str = "site/wwwroot", workers: int = LISTING_WORKERS) -> tuple[dict[str, dict], int]:
+    """List every file under root through the VFS API, fetching directory listings concurrently."""
+    files: dict[str, dict] = {}
+    listings = 0
+
+    def fetch(rel_dir: str) -> tuple[str, list]:
+        path = f"/api/vfs/{root}/{quote(rel_dir)}" if rel_dir else f"/api/vfs/{root}/"
+        return rel_dir, client.get_json(path.rstrip("/") + "/") or []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(fetch, "")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel_dir, entries = future.result()
+                listings += 1
+                for entry in entries:
+                    name = entry.get("name", "")
+                    rel_path = f"{rel_dir}{name}"
+                    if entry.get("mime") == DIRECTORY_MIME:
+                        pending.add(pool.submit(fetch, rel_path + "/"))
+                    else:
+                        files[rel_path] = entry
+    return files, listings
+
+
+def _remote_mtime(entry: dict) -> Optional[float]:
+    value = entry.get("mtime")
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def compare_tree(
+    local: dict[str, dict],
+    remote: dict[str, dict],
+    *,
+    check_mtime: bool = False,
+) -> IntegrityReport:
+    """Size (or listed sha256) differences are mismatches; same-size files that look stale become suspects.
+
+    With check_mtime, a file looks stale when its mtime differs from the local manifest. That only works
+    because Kudu keeps the entry times of the zip and the package stamps them from the manifest; whether
+    the file was written during this deploy says nothing. Only a content hash can confirm a suspect.
+    """
+    report = IntegrityReport()
+    for rel_path, expected in local.items():
+        entry = remote.get(rel_path)
+        if entry is None:
+            report.missing.append(rel_path)
+            continue
+        report.checked += 1
+        if int(entry.get("size", -1)) != expected["size"]:
+            report.mismatched.append(rel_path)
+            continue
+        if entry.get("sha256"):
+            if entry["sha256"] != expected["sha256"]:
+                report.mismatched.append(rel_path)
+            continue
+        remote_mtime = _remote_mtime(entry)
+        if check_mtime and (remote_mtime is None or abs(remote_mtime - expected["mtime"]) > MTIME_TOLERANCE_SEC):
+            report.suspect.append(rel_path)
+    report.extra = sorted(p for p in set(remote) - set(local) if p not in IGNORED_REMOTE)
+    report.missing.sort()
+    report.mismatched.sort()
+    report.suspect.sort()
+    return report
+
+
+def remote_sha256(client: KuduClient, rel_path: str, root: str = "site/wwwroot") -> Optional[str]:
+    status, body = client.request("GET", f"/api/vfs/{root}/{quote(rel_path)}")
+    return hashlib.sha256(body).hexdigest() if status == 200 else None
+
+
+def confirm_suspects(
+    client: KuduClient, local: dict[str, dict], report: IntegrityReport, *, limit: int = HASH_LIMIT, workers: int = HASH_WORKERS
+) -> None:
+    """Download up to limit suspect files and move those whose content differs into mismatched."""
+    to_hash, report.unverified = report.suspect[:limit], report.suspect[limit:]
+    if not to_hash:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(lambda rel_path: remote_sha256(client, rel_path), to_hash))
+    report.hashed = len(to_hash)
+    for rel_path, digest in zip(to_hash, digests):
+        if digest != local[rel_path]["sha256"]:
+            report.mismatched.append(rel_path)
+    report.mismatched.sort()
+
+
+def verify_wwwroot(
+    client: KuduClient,
+    local: dict[str, dict],
+    *,
+    check_mtime: bool = False,
+    hash_limit: int = HASH_LIMIT,
+) -> IntegrityReport:
+    started = time.perf_counter()
+    remote, listings = list_remote_tree(client)
+    report = compare_tree(local, remote, check_mtime=check_mtime)
+    confirm_suspects(client, local, report, limit=hash_limit)
+    report.listings = listings
+    report.elapsed = time.perf_counter() - started
+    return report
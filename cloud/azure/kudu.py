@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import base64
+import http.client
+import json
+import threading
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote
+
+from cloud.azure.cli import AzureCli
+from cloud.core.console import info, warn
+from cloud.core.http import HttpSession
+from cloud.core.metrics import RunMetrics
+
+# Kudu deployment log messages grouped into the phases we report on.
+PHASES = (
+    ("server.extract", ("extract", "sync", "copy", "clean", "unzip")),
+    ("server.build", ("build", "oryx", "npm", "yarn")),
+    ("server.restart", ("restart", "recycl", "starting", "warm")),
+)
+
+
+def parse_kudu_time(value: Optional[str]) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    text = value.rstrip("Z")
+    if "." in text:
+        head, frac = text.split(".", 1)
+        # Kudu emits 7 fractional digits; datetime accepts at most 6.
+        text = f"{head}.{frac[:6]}"
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def phase_for(message: str) -> str:
+    lowered = message.lower()
+    for phase, needles in PHASES:
+        if any(n in lowered for n in needles):
+            return phase
+    return "server.other"
+
+
+class KuduClient:
+    def __init__(self, scm_host: str, username: str, password: str, *, timeout: int = 20, scheme: str = "https") -> None:
+        self.base_url = f"{scheme}://{scm_host}"
+        token = base64.b64encode(f"{username}:{password}".encode("ascii")).decode("ascii")
+        self.timeout = timeout
+        self.session = HttpSession(self.base_url, timeout=timeout, headers={"Authorization": f"Basic {token}"})
+
+    @classmethod
+    def from_cli(cls, cli: AzureCli, resource_group: str, webapp_name: str, *, scheme: str = "https") -> Optional["KuduClient"]:
+        hostnames = cli.json(
+            ["webapp", "show", "--resource-group", resource_group, "--name", webapp_name, "--query", "enabledHostNames"]
+        )
+        scm_host = next((h for h in hostnames or [] if h and ".scm." in h), None)
+        if not scm_host:
+            return None
+        creds = cli.json(
+            ["webapp", "deployment", "list-publishing-credentials", "--resource-group", resource_group, "--name", webapp_name]
+        )
+        return cls(scm_host, creds.get("publishingUserName", ""), creds.get("publishingPassword", ""), scheme=scheme)
+
+    def request(self, method: str, path: str, data: Optional[bytes] = None, headers: Optional[dict] = None) -> tuple[int, bytes]:
+        status, _, body = self.session.request(method, path, data=data, headers=headers)
+        return status, body
+
+    def get_json(self, path: str):
+        status, body = self.request("GET", path)
+        if status != 200:
+            raise RuntimeError(f"Kudu GET {path} returned {status}")
+        return json.loads(body.decode("utf-8", errors="ignore") or "null")
+
+    def head(self, path: str) -> int:
+        status, _ = self.request("HEAD", path)
+        return status
+
+    def put_file(self, rel_path: str, data: bytes) -> None:
+        status, body = self.request(
+            "PUT", f"/api/vfs/site/wwwroot/{quote(rel_path)}", data=data, headers={"If-Match": "*"}
+        )
+        if status not in (200, 201, 204):
+            raise RuntimeError(f"Kudu PUT {rel_path} returned {status}: {body[:200]!r}")
+
+    def put_package(self, name: str, data: bytes) -> None:
+        """Store a zip under /home/data/SitePackages and name it in packagename.txt, to be mounted at the next restart."""
+        for rel_path, body in ((name, data), ("packagename.txt", name.encode("utf-8"))):
+            status, response = self.request(
+                "PUT", f"/api/vfs/data/SitePackages/{quote(rel_path)}", data=body, headers={"If-Match": "*"}
+            )
+            if status not in (200, 201, 204):
+                raise RuntimeError(f"Kudu PUT SitePackages/{rel_path} returned {status}: {response[:200]!r}")
+
+    def delete_file(self, rel_path: str) -> None:
+        status, body = self.request("DELETE", f"/api/vfs/site/wwwroot/{quote(rel_path)}", headers={"If-Match": "*"})
+        if status not in (200, 204, 404):
+            raise RuntimeError(f"Kudu DELETE {rel_path} returned {status}: {body[:200]!r}")
+
+    def latest_deployment(self) -> Optional[dict]:
+        try:
+            deployment = self.get_json("/api/deployments/latest")
+        except (RuntimeError, OSError, ValueError, http.client.HTTPException):
+            return None
+        return deployment if isinstance(deployment, dict) else None
+
+
+class KuduDeploymentTail:
+    """Polls the Kudu log of the deployment started after `start()` and echoes new entries while the upload runs."""
+
+    def __init__(self, client: KuduClient, metrics: RunMetrics, poll_interval: float = 2.0) -> None:
+        self.client = client
+        self.metrics = metrics
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._baseline_id: Optional[str] = None
+        self._deployment: Optional[dict] = None
+        self._entries: list[dict] = []
+        self._seen: set[str] = set()
+
+    def start(self) -> None:
+        baseline = self.client.latest_deployment()
+        self._baseline_id = baseline.get("id") if baseline else None
+        self._thread = threading.Thread(target=self._loop, name="kudu-log-tail", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Never raises: it runs in deploy_package's finally block and must not mask the deploy result."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.poll_interval * 2 + self.client.timeout)
+        try:
+            # One last poll so entries written right before completion are not lost.
+            self._poll()
+            self._record_phases()
+        except Exception as exc:
+            warn(f"   Kudu log tail failed: {exc}")
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self._poll()
+            except Exception as exc:
+                warn(f"   Kudu log tail stopped: {exc}")
+                return
+
+    def _poll(self) -> None:
+        deployment = self.client.latest_deployment()
+        if not deployment or deployment.get("id") in (None, self._baseline_id):
+            return
+        self._deployment = deployment
+        try:
+            entries = self.client.get_json(f"/api/deployments/{deployment['id']}/log") or []
+        except (RuntimeError, OSError, ValueError, http.client.HTTPException):
+            return
+        if not isinstance(entries, list):
+            return
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            key = entry.get("id") or f"{entry.get('log_time')}|{entry.get('message')}"
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            self._entries.append(entry)
+            stamp = parse_kudu_time(entry.get("log_time"))
+            label = stamp.strftime("%H:%M:%S") if stamp else "--:--:--"
+            info(f"   [kudu {label}] {str(entry.get('message') or '').strip()}")
+
+    def _record_phases(self) -> None:
+        if not self._deployment or not self._entries:
+            return
+        times = [parse_kudu_time(e.get("log_time")) for e in self._entries]
+        end = parse_kudu_time(self._deployment.get("end_time"))
+        for index, entry in enumerate(self._entries):
+            started = times[index]
+            finished = times[index + 1] if index + 1 < len(times) else end
+            if started and finished and finished >= started:
+                self.metrics.record(phase_for(str(entry.get("message") or "")), (finished - started).total_seconds())
+        received = parse_kudu_time(self._deployment.get("received_time") or self._deployment.get("start_time"))
+        if received and end and end >= received:
+            self.metrics.set_value("server.total_sec", (end - received).total_seconds())
+        if self._deployment.get("status") not in (None, 4):
+            warn(f"   Kudu reports deployment status {self._deployment.get('status')}: {self._deployment.get('status_text', '')}")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:
+    import msvcrt  # type: ignore
+except ImportError:
+    msvcrt = None
+
+from cloud.core.console import warn
+
+# ARM subscription budgets (per hour) used until response headers tell us otherwise.
+DEFAULT_BUDGETS = {"read": 12000, "write": 1200}
+DEFAULT_BURST = {"read": 50, "write": 20}
+WINDOW_SEC = 3600
+MIN_RATE = 0.05
+
+HEADER_RE = re.compile(r"x-ms-ratelimit-remaining-subscription-(reads|writes)'?\s*[:=]\s*'?(\d+)", re.IGNORECASE)
+RETRY_AFTER_RE = re.compile(r"Retry-After'?\s*[:=]\s*'?(\d+)", re.IGNORECASE)
+THROTTLED_RE = re.compile(r"Response status:\s*'?429|\(429\)|TooManyRequests", re.IGNORECASE)
+
+
+def default_state_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA") or str(Path.home() / ".cache")
+    return Path(base) / "deployscript"
+
+
+class ArmRateLimiter:
+    """Token buckets for ARM reads/writes, shared by every process on the host through a locked state file."""
+
+    def __init__(self, key: str = "default", state_dir: Optional[Path] = None) -> None:
+        self.key = re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+        directory = state_dir or default_state_dir()
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            directory = Path(tempfile.gettempdir()) / "deployscript"
+            directory.mkdir(parents=True, exist_ok=True)
+        self.state_dir = directory
+        self.state_path = directory / f"arm-ratelimit-{self.key}.json"
+        self.lock_path = directory / f"arm-ratelimit-{self.key}.lock"
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            with open(self.lock_path, "a+b") as handle:
+                if fcntl:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                elif msvcrt:
+                    handle.seek(0)
+                    while True:
+                        try:
+                            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                            break
+                        except OSError:
+                            time.sleep(0.05)
+                try:
+                    yield
+                finally:
+                    if fcntl:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                    elif msvcrt:
+                        handle.seek(0)
+                        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _load(self, now: float) -> dict:
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            state = {}
+        for kind, budget in DEFAULT_BUDGETS.items():
+            bucket = state.get(kind)
+            if not isinstance(bucket, dict):
+                state[kind] = {
+                    "tokens": float(DEFAULT_BURST[kind]),
+                    "capacity": float(DEFAULT_BURST[kind]),
+                    "rate": budget / WINDOW_SEC,
+                    "updated": now,
+                }
+        state.setdefault("blocked_until", 0.0)
+        return state
+
+    def _save(self, state: dict) -> None:
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    @staticmethod
+    def _refill(bucket: dict, now: float) -> None:
+        elapsed = max(0.0, now - bucket["updated"])
+        bucket["tokens"] = min(bucket["capacity"], bucket["tokens"] + elapsed * bucket["rate"])
+        bucket["updated"] = now
+
+    def acquire(self, kind: str) -> None:
+        waited = False
+        while True:
+            now = time.time()
+            with self._locked():
+                state = self._load(now)
+                bucket = state[kind]
+                self._refill(bucket, now)
+                blocked = state["blocked_until"] - now
+                if blocked <= 0 and bucket["tokens"] >= 1:
+                    bucket["tokens"] -= 1
+                    self._save(state)
+                    return
+                self._save(state)
+                wait = max(blocked, (1 - bucket["tokens"]) / bucket["rate"])
+            if not waited and wait > 1:
+                warn(f"ARM {kind} budget low; pacing calls (next slot in {wait:.1f}s)")
+                waited = True
+            time.sleep(min(wait, 1.0))
+
+    def observe(self, kind: str, remaining: int) -> None:
+        # Spread what is left of the hourly window evenly so concurrent deploys slow down before hitting 429s.
+        now = time.time()
+        with self._locked():
+            state = self._load(now)
+            bucket = state[kind]
+            self._refill(bucket, now)
+            bucket["rate"] = max(MIN_RATE, remaining / WINDOW_SEC)
+            bucket["capacity"] = float(max(1, min(DEFAULT_BURST[kind], remaining)))
+            bucket["tokens"] = min(bucket["tokens"], bucket["capacity"], float(remaining))
+            self._save(state)
+
+    def throttled(self, retry_after: float) -> None:
+        now = time.time()
+        with self._locked():
+            state = self._load(now)
+            state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+            for kind in DEFAULT_BUDGETS:
+                state[kind]["tokens"] = 0.0
+                state[kind]["updated"] = now
+            self._save(state)
+
+    def observe_output(self, text: str) -> None:
+        seen: dict[str, int] = {}
+        for match in HEADER_RE.finditer(text):
+            kind = "read" if match.group(1).lower() == "reads" else "write"
+            # The last value logged reflects the most recent response.
+            seen[kind] = int(match.group(2))
+        for kind, remaining in seen.items():
+            self.observe(kind, remaining)
+        if THROTTLED_RE.search(text):
+            retry = RETRY_AFTER_RE.search(text)
+            self.throttled(float(retry.group(1)) if retry else 5.0)
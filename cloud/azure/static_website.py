@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from cloud.azure.blob import EMULATOR_ACCOUNT, EMULATOR_KEY, BlobClient, file_md5_b64
+from cloud.azure.cdn import CdnPurger
+from cloud.azure.cli import AzureCli
+from cloud.core.base import CloudProvider
+from cloud.core.console import error, info, success
+from cloud.core.content import cache_control, content_type, edge_paths, publish_order
+from cloud.core.manifest import build_manifest
+from cloud.core.metrics import RunMetrics
+from cloud.core.models import DeploymentConfig
+from cloud.core.workspaces import run_workspace_build
+
+WEB_CONTAINER = "$web"
+UPLOAD_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    uploaded: list[str]
+    skipped: int
+    deleted: list[str]
+    # Unchanged content whose Content-Type/Cache-Control were rewritten in place.
+    retagged: list[str] = field(default_factory=list)
+
+
+def default_account_name(web_app_name: str) -> str:
+    # Storage account names are 3-24 lowercase alphanumerics.
+    return (re.sub(r"[^a-z0-9]", "", web_app_name.lower()) or "staticsite")[:24]
+
+
+@dataclass
+class AzureStaticWebsiteProvider(CloudProvider):
+    config: DeploymentConfig
+    cli: Optional[AzureCli]
+    workspace_root: str
+    metrics: RunMetrics = field(default_factory=RunMetrics)
+    _client: Optional[BlobClient] = field(default=None, init=False, repr=False)
+
+    @property
+    def emulated(self) -> bool:
+        return bool(self.config.storage_endpoint)
+
+    @property
+    def account(self) -> str:
+        if self.config.storage_account:
+            return self.config.storage_account
+        return EMULATOR_ACCOUNT if self.emulated else default_account_name(self.config.web_app_name)
+
+    def _require_cli(self) -> AzureCli:
+        if not self.cli:
+            raise RuntimeError("Azure CLI is required unless storage_endpoint points at an emulator")
+        return self.cli
+
+    def ensure_resources(self) -> None:
+        if self.emulated:
+            info(f"Using storage endpoint {self.config.storage_endpoint}; skipping account provisioning.")
+            return
+        cli = self._require_cli()
+        info("Checking if resource group exists...")
+        if cli.cmd(["group", "exists", "--name", self.config.resource_group]).stdout.strip().lower() != "true":
+            info(f"Creating resource group: {self.config.resource_group}")
+            cli.cmd(["group", "create", "--name", self.config.resource_group, "--location", self.config.location], capture_output=False)
+        info("Checking if storage account exists...")
+        check = cli.cmd(
+            ["storage", "account", "show", "--name", self.account, "--resource-group", self.config.resource_group],
+            check=False,
+        )
+        if check.returncode != 0:
+            info(f"Creating storage account: {self.account}")
+            created = cli.cmd(
+                [
+                    "storage",
+                    "account",
+                    "create",
+                    "--name",
+                    self.account,
+                    "--resource-group",
+                    self.config.resource_group,
+                    "--location",
+                    self.config.location,
+                    "--kind",
+                    "StorageV2",
+                    "--sku",
+                    "Standard_LRS",
+                ],
+                capture_output=False,
+                check=False,
+            )
+            if created.returncode != 0:
+                error("Failed to create storage account")
+                raise RuntimeError("Storage account creation failed")
+            success("Storage account created")
+        else:
+            success("Storage account already exists")
+
+    def account_key(self) -> str:
+        key = os.environ.get("AZURE_STORAGE_KEY")
+        if key:
+            return key
+        if self.emulated:
+            return EMULATOR_KEY
+        result = self._require_cli().cmd(
+            [
+                "storage",
+                "account",
+                "keys",
+                "list",
+                "--account-name",
+                self.account,
+                "--resource-group",
+                self.config.resource_group,
+                "--query",
+                "[0].value",
+                "-o",
+                "tsv",
+            ]
+        )
+        return result.stdout.strip()
+
+    def client(self) -> BlobClient:
+        if self._client is None:
+            self._client = BlobClient(self.account, self.account_key(), endpoint=self.config.storage_endpoint)
+        return self._client
+
+    def build_app(self) -> None:
+        run_workspace_build(self.workspace_root, self.config, self.metrics)
+
+    def deploy_app(self) -> None:
+        client = self.client()
+        with self.metrics.step("configure"):
+            info("Enabling static website hosting (index.html, SPA fallback)...")
+            client.enable_static_website("index.html", "index.html")
+            client.ensure_container(WEB_CONTAINER)
+        dist_path = os.path.join(self.workspace_root, self.config.dist_dir)
+        if not os.path.isdir(dist_path):
+            error(f"Build output folder '{self.config.dist_dir}' not found.")
+            raise RuntimeError("Missing build output")
+        with self.metrics.step("upload"):
+            result = self.sync(dist_path)
+        success(
+            f"Synced $web: {len(result.uploaded)} uploaded, {len(result.retagged)} retagged, "
+            f"{result.skipped} unchanged, {len(result.deleted)} deleted"
+        )
+        purger = CdnPurger(self.cli, self.config) if self.cli else None
+        if purger and purger.enabled:
+            with self.metrics.step("purge"):
+                purger.purge(edge_paths(result.uploaded + result.retagged + result.deleted))
+
+    def sync(self, dist_path: str, delete_stale: bool = True) -> SyncResult:
+        client = self.client()
+        info("Listing existing blobs in $web...")
+        remote = client.list_blobs(WEB_CONTAINER)
+        local = build_manifest(dist_path)
+        self.metrics.set_value("artifact.files", len(local))
+
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+            hashes = dict(zip(local, pool.map(lambda p: file_md5_b64(os.path.join(dist_path, p)), local)))
+            to_upload = [p for p in local if not remote.get(p) or remote[p].content_md5 != hashes[p]]
+            to_retag = [
+                p
+                for p in local
+                if p not in to_upload
+                and (remote[p].content_type != content_type(p) or remote[p].cache_control != cache_control(p))
+            ]
+            info(f"Uploading {len(to_upload)} of {len(local)} file(s)...")
+            # Hashed assets land before the entry points that reference them, so no page points at a missing file.
+            for wave in publish_order(to_upload):
+                list(pool.map(lambda p: client.upload_file(WEB_CONTAINER, p, os.path.join(dist_path, p), hashes[p]), wave))
+            list(pool.map(lambda p: client.set_properties(WEB_CONTAINER, p, hashes[p]), to_retag))
+            stale = sorted(set(remote) - set(local)) if delete_stale else []
+            # Deletes run after uploads so the site never loses a file that the new index.html still references.
+            list(pool.map(lambda name: client.delete_blob(WEB_CONTAINER, name), stale))
+        return SyncResult(to_upload, len(local) - len(to_upload) - len(to_retag), stale, to_retag)
+
+    def web_endpoint(self) -> str:
+        if self.emulated:
+            return f"{self.config.storage_endpoint.rstrip('/')}/{WEB_CONTAINER}"
+        result = self._require_cli().cmd(
+            [
+                "storage",
+                "account",
+                "show",
+                "--name",
+                self.account,
+                "--resource-group",
+                self.config.resource_group,
+                "--query",
+                "primaryEndpoints.web",
+                "-o",
+                "tsv",
+            ]
+        )
+        return result.stdout.strip().rstrip("/")
@@ -1,17 +1,25 @@
+from cloud.core.artifacts import ArtifactRecord, ArtifactStore
 from cloud.core.base import CloudProvider
 from cloud.core.config import load_yaml_config
 from cloud.core.console import error, info, success, warn
-from cloud.core.exec import run_command
+from cloud.core.exec import RetryPolicy, is_transient, run_command, set_max_concurrency
+from cloud.core.metrics import RunMetrics
 from cloud.core.models import DeploymentConfig, WorkflowContext
 
 __all__ = [
+    "ArtifactRecord",
+    "ArtifactStore",
     "CloudProvider",
     "DeploymentConfig",
+    "RetryPolicy",
+    "RunMetrics",
     "WorkflowContext",
     "error",
     "info",
+    "is_transient",
     "load_yaml_config",
     "run_command",
+    "set_max_concurrency",
     "success",
     "warn",
 ]
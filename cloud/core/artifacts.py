@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from cloud.core.console import info
+from cloud.core.manifest import load_manifest, manifest_digest, write_manifest
+
+PACKAGE_NAME = "package.zip"
+MANIFEST_NAME = "manifest.json"
+META_NAME = "meta.json"
+CURRENT_NAME = "CURRENT"
+
+
+@dataclass(frozen=True)
+class ArtifactRecord:
+    artifact_id: str
+    path: Path
+    meta: dict
+
+    @property
+    def package_path(self) -> Path:
+        return self.path / PACKAGE_NAME
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path / MANIFEST_NAME
+
+    def manifest(self) -> dict[str, dict]:
+        return load_manifest(self.manifest_path)
+
+    @property
+    def size_bytes(self) -> int:
+        return int(self.meta.get("size_bytes", 0))
+
+
+class ArtifactStore:
+    """Keeps the last deployed packages per web app so a rollback can skip build and packaging."""
+
+    def __init__(self, root: Path, max_count: int = 5, max_bytes: int = 500 * 1024 * 1024) -> None:
+        self.root = root
+        self.max_count = max(1, max_count)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def app_key(resource_group: str, web_app_name: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", f"{resource_group}__{web_app_name}")
+
+    def _app_dir(self, app_key: str) -> Path:
+        return self.root / app_key
+
+    def add(self, app_key: str, package_path: str, manifest: dict[str, dict], meta: dict) -> ArtifactRecord:
+        digest = manifest_digest(manifest)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        # Ids sort chronologically; the same build recorded twice in one tick gets a counter, never a shared directory.
+        artifact_id = f"{stamp}-{digest[:8]}"
+        self._app_dir(app_key).mkdir(parents=True, exist_ok=True)
+        for attempt in range(2, 100):
+            target = self._app_dir(app_key) / artifact_id
+            try:
+                target.mkdir()
+                break
+            except FileExistsError:
+                artifact_id = f"{stamp}-{digest[:8]}-{attempt}"
+        else:
+            raise RuntimeError(f"Could not allocate a deploy history entry for {app_key}")
+        shutil.move(package_path, target / PACKAGE_NAME)
+        write_manifest(target / MANIFEST_NAME, manifest)
+        full_meta = {
+            **meta,
+            "artifact_id": artifact_id,
+            "created": stamp,
+            "manifest_digest": digest,
+            "file_count": len(manifest),
+            "size_bytes": (target / PACKAGE_NAME).stat().st_size,
+        }
+        (target / META_NAME).write_text(json.dumps(full_meta, indent=2), encoding="utf-8")
+        self.prune(app_key)
+        return ArtifactRecord(artifact_id, target, full_meta)
+
+    def list(self, app_key: str) -> list[ArtifactRecord]:
+        app_dir = self._app_dir(app_key)
+        if not app_dir.is_dir():
+            return []
+        records = []
+        for entry in sorted(app_dir.iterdir(), reverse=True):
+            meta_path = entry / META_NAME
+            if entry.is_dir() and meta_path.exists() and (entry / PACKAGE_NAME).exists():
+                records.append(ArtifactRecord(entry.name, entry, json.loads(meta_path.read_text(encoding="utf-8"))))
+        return records
+
+    def get(self, app_key: str, artifact_id: str) -> Optional[ArtifactRecord]:
+        """The record with this id, or the only one starting with it; an ambiguous prefix raises ValueError."""
+        records = self.list(app_key)
+        for record in records:
+            if record.artifact_id == artifact_id:
+                return record
+        matches = [record for record in records if artifact_id and record.artifact_id.startswith(artifact_id)]
+        if len(matches) > 1:
+            shown = ", ".join(record.artifact_id for record in matches)
+            raise ValueError(f"Artifact id '{artifact_id}' is ambiguous; it matches {shown}")
+        return matches[0] if matches else None
+
+    def current(self, app_key: str) -> Optional[str]:
+        pointer = self._app_dir(app_key) / CURRENT_NAME
+        if not pointer.exists():
+            return None
+        return pointer.read_text(encoding="utf-8").strip() or None
+
+    def set_current(self, app_key: str, artifact_id: str) -> None:
+        app_dir = self._app_dir(app_key)
+        app_dir.mkdir(parents=True, exist_ok=True)
+        (app_dir / CURRENT_NAME).write_text(artifact_id, encoding="utf-8")
+
+    def previous(self, app_key: str) -> Optional[ArtifactRecord]:
+        records = self.list(app_key)
+        current = self.current(app_key)
+        ids = [r.artifact_id for r in records]
+        if current in ids:
+            older = records[ids.index(current) + 1:]
+        else:
+            older = records[1:]
+        return older[0] if older else None
+
+    def prune(self, app_key: str) -> None:
+        records = self.list(app_key)
+        current = self.current(app_key)
+        total = 0
+        for index, record in enumerate(records):
+            total += record.size_bytes
+            # Newest is always kept; the live artifact is never pruned.
+            over_budget = index >= self.max_count or (index > 0 and total > self.max_bytes)
+            if over_budget and record.artifact_id != current:
+                info(f"Pruning deploy history entry {record.artifact_id}")
+                shutil.rmtree(record.path, ignore_errors=True)
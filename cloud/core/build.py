@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from cloud.core.console import error, info, success, warn
+
+
+def build_command(script: str = "build") -> list[str]:
+    yarn_cmd = shutil.which("yarn.cmd") or shutil.which("yarn")
+    yarn_ps1 = Path(os.environ.get("USERPROFILE", "")) / "AppData/Roaming/npm/yarn.ps1"
+    npm_cmd = shutil.which("npm")
+
+    if yarn_cmd:
+        return [yarn_cmd, script]
+    if yarn_ps1.exists():
+        return ["powershell", "-ExecutionPolicy", "Bypass", "-File", str(yarn_ps1), script]
+    if npm_cmd:
+        warn(f"yarn not found; falling back to npm run {script}")
+        return [npm_cmd, "run", script]
+    error("Neither yarn nor npm found on PATH. Please install Node.js tooling.")
+    raise RuntimeError("Node tooling not found")
+
+
+def run_build(workspace_root: str) -> None:
+    info("Building React application...")
+    result = subprocess.run(build_command(), cwd=workspace_root)
+    if result.returncode != 0:
+        error("Build failed")
+        raise RuntimeError("Build failed")
+    success("Build completed successfully")
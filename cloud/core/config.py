@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import dataclasses
 from pathlib import Path
 from typing import Any
 
+from cloud.core.models import DeploymentConfig
+
 
 def load_yaml_config(path: Path) -> dict[str, Any]:
     if not path.exists():
@@ -12,9 +15,34 @@ def load_yaml_config(path: Path) -> dict[str, Any]:
     except ImportError as exc:  # pragma: no cover - runtime safeguard
         raise RuntimeError("PyYAML is required to load YAML config. Install with 'pip install pyyaml'.") from exc
 
-    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    try:
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    except yaml.YAMLError as exc:
+        raise ValueError(f"Invalid YAML in {path}: {exc}") from exc
     if not data:
         return {}
     if not isinstance(data, dict):
         raise ValueError("Config YAML must be a mapping (key/value pairs).")
     return data
+
+
+def load_targets(path: Path, base: DeploymentConfig) -> list[DeploymentConfig]:
+    """Configs for a fleet file: a `targets` list of overrides applied on top of `defaults` and then base."""
+    if not path.exists():
+        raise FileNotFoundError(f"Targets file not found: {path}")
+    data = load_yaml_config(path)
+    known = {f.name for f in dataclasses.fields(DeploymentConfig)}
+    defaults = data.get("defaults") or {}
+    targets = data.get("targets") or []
+    if not isinstance(targets, list):
+        raise ValueError("Targets file must contain a 'targets' list.")
+    configs = []
+    for index, overrides in enumerate(targets):
+        if not isinstance(overrides, dict):
+            raise ValueError(f"Target #{index + 1} must be a mapping.")
+        merged = {**defaults, **overrides}
+        unknown = sorted(set(merged) - known)
+        if unknown:
+            raise ValueError(f"Target #{index + 1}: unknown config field(s): {', '.join(unknown)}")
+        configs.append(dataclasses.replace(base, **merged))
+    return configs
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import mimetypes
+import re
+from typing import Iterable
+from urllib.parse import quote
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+DEFAULT_CACHE = "public, max-age=3600"
+
+# Bundler output names such as index-BxT3kq9a.js or main.3f9a1c2e.css.
+HASHED_NAME_RE = re.compile(r"[.-](?=[A-Za-z0-9_]*\d)[A-Za-z0-9_]{8,}\.[A-Za-z0-9]+(\.map)?$")
+# Entry points that must always be revalidated so clients pick up new hashed assets.
+ALWAYS_FRESH = {"index.html", "manifest.json", "manifest.webmanifest", "sw.js", "service-worker.js", "asset-manifest.json"}
+
+EXTRA_TYPES = {
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".map": "application/json",
+    ".webmanifest": "application/manifest+json",
+    ".svg": "image/svg+xml",
+    ".wasm": "application/wasm",
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".ico": "image/x-icon",
+    ".txt": "text/plain",
+}
+
+
+def content_type(rel_path: str) -> str:
+    lowered = rel_path.lower()
+    for ext, mime in EXTRA_TYPES.items():
+        if lowered.endswith(ext):
+            return mime
+    guessed, _ = mimetypes.guess_type(rel_path)
+    if guessed and guessed.startswith("text/"):
+        return f"{guessed}; charset=utf-8" if guessed == "text/html" else guessed
+    return guessed or "application/octet-stream"
+
+
+def is_content_hashed(rel_path: str) -> bool:
+    path = rel_path.replace("\\", "/").lstrip("/")
+    name = path.rsplit("/", 1)[-1]
+    if name in ALWAYS_FRESH:
+        return False
+    # Only the name says whether the content is fingerprinted; assets/ may also hold stable names like logo.svg.
+    return bool(HASHED_NAME_RE.search(name))
+
+
+def cache_control(rel_path: str) -> str:
+    name = rel_path.replace("\\", "/").rsplit("/", 1)[-1]
+    if is_content_hashed(rel_path):
+        return IMMUTABLE_CACHE
+    if name in ALWAYS_FRESH or name.endswith(".html"):
+        return REVALIDATE_CACHE
+    return DEFAULT_CACHE
+
+
+def publish_order(rel_paths: Iterable[str]) -> list[list[str]]:
+    """Upload waves: fingerprinted assets, then other files, then the revalidated entry points that reference them."""
+    waves: list[list[str]] = [[], [], []]
+    for rel_path in rel_paths:
+        if is_content_hashed(rel_path):
+            waves[0].append(rel_path)
+        elif cache_control(rel_path) == REVALIDATE_CACHE:
+            waves[2].append(rel_path)
+        else:
+            waves[1].append(rel_path)
+    return waves
+
+
+def edge_paths(rel_paths: Iterable[str]) -> list[str]:
+    """CDN paths to purge for changed files; fingerprinted assets are skipped since their names change with them."""
+    paths: set[str] = set()
+    for rel_path in rel_paths:
+        if is_content_hashed(rel_path):
+            continue
+        path = "/" + quote(rel_path.lstrip("/"), safe="/-_.~")
+        paths.add(path)
+        if path.endswith("/index.html"):
+            paths.add(path[: -len("index.html")])
+    return sorted(paths)
@@ -1,5 +1,151 @@
+from __future__ import annotations
+
+import random
+import re
 import subprocess
-from typing import Sequence
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Sequence
+
+from cloud.core.console import info, warn
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Output fragments that indicate a retryable failure (ARM throttling, gateway errors, dropped connections).
+# Status codes are only matched next to "status"/"HTTP" so ids, sizes or a 404 body mentioning 503 don't count.
+TRANSIENT_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"\b(status|HTTP)( code)?[: ]+'?(429|50[234])\b",
+        r"\bTooManyRequests\b",
+        r"\bthrottl(ed|ing)\b",
+        r"\bServiceUnavailable\b",
+        r"\bGatewayTimeout\b",
+        r"\bBadGateway\b",
+        r"\bInternalServerError\b",
+        r"\b(ReadTimeout|ConnectTimeout)(Error)?\b",
+        r"\btimed out\b",
+        r"\bConnection (reset|aborted|refused)\b",
+        r"\bRemoteDisconnected\b",
+        r"\btemporarily unavailable\b",
+    )
+]
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 1
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int) -> float:
+        # Full jitter: uniform over [0, min(max, base * 2^attempt)].
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+NO_RETRY = RetryPolicy()
+
+
+class _ConcurrencyLimiter:
+    def __init__(self, limit: int) -> None:
+        self._lock = threading.Lock()
+        self._sem = threading.BoundedSemaphore(limit)
+        self.limit = limit
+
+    def resize(self, limit: int) -> None:
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        with self._lock:
+            # In-flight holders release into the semaphore they acquired.
+            self._sem = threading.BoundedSemaphore(limit)
+            self.limit = limit
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._lock:
+            sem = self._sem
+        sem.acquire()
+        try:
+            yield
+        finally:
+            sem.release()
+
+
+_limiter = _ConcurrencyLimiter(DEFAULT_MAX_CONCURRENCY)
+
+
+def set_max_concurrency(limit: int) -> None:
+    _limiter.resize(limit)
+
+
+def is_transient(result: subprocess.CompletedProcess[str]) -> bool:
+    if result.returncode == 0:
+        return False
+    text = f"{result.stdout or ''}\n{result.stderr or ''}"
+    return any(p.search(text) for p in TRANSIENT_PATTERNS)
+
+
+def _echo(stream: str, line: str) -> None:
+    info(line)
+
+
+def _run_streaming(
+    cmd: list[str],
+    timeout: Optional[float],
+    on_line: Callable[[str, str], None],
+    cwd: Optional[str],
+) -> subprocess.CompletedProcess[str]:
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+    )
+    captured: dict[str, list[str]] = {"stdout": [], "stderr": []}
+
+    def pump(name: str, pipe) -> None:
+        for line in iter(pipe.readline, ""):
+            captured[name].append(line)
+            on_line(name, line.rstrip("\r\n"))
+        pipe.close()
+
+    readers = [
+        threading.Thread(target=pump, args=("stdout", proc.stdout), daemon=True),
+        threading.Thread(target=pump, args=("stderr", proc.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        for reader in readers:
+            reader.join(timeout=1)
+        raise subprocess.TimeoutExpired(
+            cmd, timeout, "".join(captured["stdout"]), "".join(captured["stderr"])
+        ) from None
+    for reader in readers:
+        reader.join()
+    return subprocess.CompletedProcess(cmd, proc.returncode, "".join(captured["stdout"]), "".join(captured["stderr"]))
+
+
+def _run_once(
+    cmd: list[str],
+    capture_output: bool,
+    timeout: Optional[float],
+    stream: bool,
+    on_line: Optional[Callable[[str, str], None]],
+    cwd: Optional[str],
+) -> subprocess.CompletedProcess[str]:
+    if stream or on_line:
+        return _run_streaming(cmd, timeout, on_line or _echo, cwd)
+    return subprocess.run(cmd, capture_output=capture_output, text=True, timeout=timeout, cwd=cwd)
 
 
 def run_command(
@@ -7,8 +153,38 @@ def run_command(
     *,
     capture_output: bool = True,
     check: bool = True,
+    timeout: Optional[float] = None,
+    retry: RetryPolicy = NO_RETRY,
+    stream: bool = False,
+    on_line: Optional[Callable[[str, str], None]] = None,
+    cwd: Optional[str] = None,
+    before_attempt: Optional[Callable[[], None]] = None,
+    after_attempt: Optional[Callable[[subprocess.CompletedProcess[str]], None]] = None,
+    transient: Callable[[subprocess.CompletedProcess[str]], bool] = is_transient,
 ) -> subprocess.CompletedProcess[str]:
-    result = subprocess.run(list(cmd), capture_output=capture_output, text=True)
+    args = list(cmd)
+    attempts = max(1, retry.attempts)
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        if before_attempt:
+            before_attempt()
+        try:
+            with _limiter.slot():
+                result = _run_once(args, capture_output, timeout, stream, on_line, cwd)
+        except subprocess.TimeoutExpired:
+            if last_attempt:
+                raise
+            delay = retry.delay(attempt)
+            warn(f"Command timed out after {timeout}s; retrying in {delay:.1f}s ({attempt + 1}/{attempts - 1})")
+            time.sleep(delay)
+            continue
+        if after_attempt:
+            after_attempt(result)
+        if result.returncode == 0 or last_attempt or not transient(result):
+            break
+        delay = retry.delay(attempt)
+        warn(f"Transient failure (exit {result.returncode}); retrying in {delay:.1f}s ({attempt + 1}/{attempts - 1})")
+        time.sleep(delay)
     if check and result.returncode != 0:
         raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
     return result
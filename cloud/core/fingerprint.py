@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from cloud.core.manifest import file_sha256, manifest_digest
+
+FINGERPRINT_FILE = "deploy-fingerprint.json"
+INPUT_EXCLUDES = ("node_modules", ".git", ".deploy", "__pycache__", ".cache", ".turbo", "coverage")
+
+
+def _git_files(root: str) -> Optional[list[str]]:
+    """Tracked and untracked-but-not-ignored files under root, or None outside a git work tree."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=root,
+            capture_output=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return sorted({path for path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if path})
+
+
+def _walk_files(root: str, skipped: set[str]) -> list[str]:
+    paths = []
+    for current, dirs, files in os.walk(root):
+        rel_dir = os.path.relpath(current, root).replace("\\", "/")
+        dirs[:] = sorted(
+            d for d in dirs if d not in skipped and (d if rel_dir == "." else f"{rel_dir}/{d}") not in skipped
+        )
+        paths.extend(name if rel_dir == "." else f"{rel_dir}/{name}" for name in files)
+    return sorted(paths)
+
+
+def _is_excluded(rel_path: str, skipped: set[str]) -> bool:
+    parts = rel_path.split("/")
+    if any(part in skipped for part in parts[:-1]):
+        return True
+    return any(rel_path == s or rel_path.startswith(s + "/") for s in skipped)
+
+
+def inputs_digest(root: str, exclude: Iterable[str] = ()) -> str:
+    """Hash every build input under root so a deploy can be skipped before building.
+
+    In a git work tree only tracked and non-ignored files count, so build output, logs and other
+    ignored files don't change the digest; elsewhere every file outside INPUT_EXCLUDES does.
+    """
+    skipped = set(INPUT_EXCLUDES) | {e.strip("/\\").replace("\\", "/") for e in exclude if e}
+    paths = _git_files(root)
+    if paths is None:
+        paths = _walk_files(root, skipped)
+    digest = hashlib.sha256()
+    for rel_path in paths:
+        name = rel_path.rsplit("/", 1)[-1]
+        if _is_excluded(rel_path, skipped) or (name.startswith("deploy_") and name.endswith(".zip")):
+            continue
+        full_path = os.path.join(root, rel_path)
+        if not os.path.isfile(full_path):
+            # Tracked but deleted in the work tree.
+            continue
+        digest.update(f"{rel_path}\0{file_sha256(full_path)}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_fingerprint(manifest: dict[str, dict], inputs: str) -> dict:
+    return {
+        "manifest": manifest_digest(manifest),
+        "inputs": inputs,
+        "files": len(manifest),
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def fingerprint_bytes(fingerprint: dict) -> bytes:
+    return json.dumps(fingerprint, indent=2).encode("utf-8")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import http.client
+import os
+import shutil
+import subprocess
+import threading
+import urllib.request
+from typing import Optional
+from urllib.parse import urlsplit
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class HttpSession:
+    """Keep-alive connections to one origin, one per thread, so concurrent callers reuse sockets and TLS sessions."""
+
+    def __init__(self, base_url: str, *, timeout: float = 20, headers: Optional[dict] = None) -> None:
+        parsed = urlsplit(base_url)
+        self.scheme = parsed.scheme
+        self.netloc = parsed.netloc
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            factory = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = factory(self.netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+    ) -> tuple[int, dict[str, str], bytes]:
+        merged = {**self.headers, **(headers or {})}
+        for attempt in range(2):
+            reused = getattr(self._local, "conn", None) is not None
+            conn = self._connection()
+            try:
+                conn.request(method, self.base_path + path, body=data, headers=merged)
+                resp = conn.getresponse()
+                body = resp.read()
+                response_headers = {k.lower(): v for k, v in resp.getheaders()}
+                if response_headers.get("connection", "").lower() == "close":
+                    self._drop_connection()
+                return resp.status, response_headers, body
+            except (http.client.HTTPException, OSError) as exc:
+                # Stale keep-alive sockets fail on first use; reconnect once before giving up. A write that
+                # timed out or failed on a fresh connection may have reached the server, so it is not resent.
+                self._drop_connection()
+                if attempt or (method not in SAFE_METHODS and (isinstance(exc, TimeoutError) or not reused)):
+                    raise
+        raise RuntimeError("unreachable")
+
+
+def http_status(url: str, timeout: int) -> str:
+    curl = shutil.which("curl")
+    if curl:
+        try:
+            result = subprocess.run(
+                [curl, "-sS", "-o", os.devnull, "-w", "%{http_code}", url],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+            return (result.stdout or "000").strip()
+        except Exception:
+            return "000"
+    try:
+        req = urllib.request.Request(url, method="HEAD")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return str(resp.getcode())
+    except Exception:
+        return "000"
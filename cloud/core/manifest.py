@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Iterable
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(root: str, exclude: Iterable[str] = ()) -> dict[str, dict]:
+    """Map each file under root (posix relative path) to its size, mtime and sha256."""
+    skipped = set(exclude)
+    manifest: dict[str, dict] = {}
+    for current, _, files in os.walk(root):
+        for name in files:
+            full_path = os.path.join(current, name)
+            rel_path = os.path.relpath(full_path, root).replace("\\", "/")
+            if rel_path in skipped:
+                continue
+            stat = os.stat(full_path)
+            manifest[rel_path] = {
+                "size": stat.st_size,
+                "mtime": int(stat.st_mtime),
+                "sha256": file_sha256(full_path),
+            }
+    return dict(sorted(manifest.items()))
+
+
+def manifest_digest(manifest: dict[str, dict]) -> str:
+    # Only paths and content matter; mtimes change on every rebuild.
+    digest = hashlib.sha256()
+    for rel_path in sorted(manifest):
+        digest.update(f"{rel_path}\0{manifest[rel_path]['sha256']}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def diff_manifests(old: dict[str, dict], new: dict[str, dict]) -> tuple[list[str], list[str], list[str]]:
+    """Return (added, changed, removed) paths between two manifests."""
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(p for p in set(old) & set(new) if old[p]["sha256"] != new[p]["sha256"])
+    return added, changed, removed
+
+
+def write_manifest(path: Path, manifest: dict[str, dict]) -> None:
+    path.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from cloud.core.console import info
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class RunMetrics:
+    """Named step durations collected over one workflow run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.durations: dict[str, float] = {}
+        self.values: dict[str, float] = {}
+        self.listeners: list[Callable[[str, float], None]] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+        for listener in self.listeners:
+            listener(name, seconds)
+
+    def set_value(self, name: str, value: float) -> None:
+        with self._lock:
+            self.values[name] = value
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> None:
+        if not self.durations:
+            return
+        info("Step timings:")
+        width = max(len(name) for name in self.durations)
+        for name, seconds in self.durations.items():
+            info(f"   {name.ljust(width)}  {seconds:7.2f}s")
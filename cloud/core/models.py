@@ -11,14 +11,54 @@ class DeploymentConfig:
     location: str = "centralus"
     sku: str = "B1"
     runtime: str = "NODE:20-lts"
+    environment: Optional[str] = None
     dist_dir: str = "dist"
+    build: bool = True
+    app_package: Optional[str] = None
+    app_dist_dir: str = "dist"
+    build_workers: int = 4
+    deploy_mode: str = "zip"
     quick_check: bool = False
     check_timeout_sec: int = 15
+    az_path: Optional[str] = None
+    az_timeout_sec: int = 300
+    # Directory for the shared ARM rate-limiter state; defaults to the user cache.
+    ratelimit_dir: Optional[str] = None
+    resource_graph: bool = True
+    # Change the SKU or runtime of an existing plan/web app when they differ from the config.
+    apply_updates: bool = False
+    url_scheme: str = "https"
     provider: str = "azure"
+    hosting: str = "app_service"
     workflow: Optional[str] = None
     iac_tool: Optional[str] = None
     validations: list[str] = field(default_factory=list)
     policy_checks: list[str] = field(default_factory=list)
+    policy_rules: Optional[str] = None
+    history_dir: str = ".deploy/history"
+    history_max_count: int = 5
+    history_max_mb: int = 500
+    stats_db: str = ".deploy/runs.sqlite"
+    rollback_to: Optional[str] = None
+    plan_only: bool = False
+    watch: bool = False
+    watch_path: Optional[str] = None
+    watch_debounce_ms: int = 500
+    storage_account: Optional[str] = None
+    storage_endpoint: Optional[str] = None
+    aws_region: str = "us-east-1"
+    s3_bucket: Optional[str] = None
+    s3_endpoint: Optional[str] = None
+    cloudfront_distribution_id: Optional[str] = None
+    cloudfront_endpoint: Optional[str] = None
+    cdn_kind: str = "afd"
+    cdn_profile: Optional[str] = None
+    cdn_endpoint: Optional[str] = None
+    cdn_resource_group: Optional[str] = None
+    warmup: bool = False
+    warmup_routes: list[str] = field(default_factory=list)
+    warmup_rps: float = 20
+    warmup_max_rounds: int = 5
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import sqlite3
+import statistics
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from cloud.core.console import info, warn
+from cloud.core.metrics import RunMetrics, percentile
+
+# Top-level steps in the order a deploy runs them.
+ETA_STEPS = ("build", "provision", "configure", "package", "deploy.total", "restart", "purge", "warmup", "verify")
+# upload is nested inside deploy.total, and ready spans deploy.total through warmup.
+TRACKED_STEPS = ETA_STEPS + ("upload", "ready")
+BASELINE_RUNS = 20
+MIN_BASELINE = 5
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SEC = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    app TEXT NOT NULL,
+    workflow TEXT NOT NULL,
+    started REAL NOT NULL,
+    ok INTEGER NOT NULL,
+    total_sec REAL,
+    artifact_bytes INTEGER,
+    artifact_files INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_app_started ON runs (app, started);
+CREATE TABLE IF NOT EXISTS steps (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    step TEXT NOT NULL,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS steps_run ON steps (run_id);
+"""
+
+
+@dataclass(frozen=True)
+class StepStats:
+    app: str
+    step: str
+    count: int
+    p50: float
+    p90: float
+    p95: float
+    latest: float
+
+
+def _step_rank(step: str) -> int:
+    return TRACKED_STEPS.index(step) if step in TRACKED_STEPS else len(TRACKED_STEPS)
+
+
+class RunHistory:
+    """Per-step deploy durations in a local SQLite file, one row per run plus one per step."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Service mode records from several worker threads; each call gets its own connection.
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def record(self, app: str, workflow: str, metrics: RunMetrics, ok: bool, started: float, total_sec: float) -> int:
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (app, workflow, started, ok, total_sec, artifact_bytes, artifact_files) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    app,
+                    workflow,
+                    started,
+                    int(ok),
+                    total_sec,
+                    metrics.values.get("artifact.bytes"),
+                    metrics.values.get("artifact.files"),
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO steps (run_id, step, seconds) VALUES (?, ?, ?)",
+                [(run_id, step, seconds) for step, seconds in metrics.durations.items()],
+            )
+        return run_id
+
+    def baseline(self, app: str, limit: int = BASELINE_RUNS) -> dict[str, list[float]]:
+        """Durations per step from the last `limit` successful runs of app, oldest first."""
+        if not self.path.exists():
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT s.step, s.seconds FROM steps s
+                JOIN (SELECT id, started FROM runs WHERE app = ? AND ok = 1 ORDER BY started DESC LIMIT ?) r
+                  ON r.id = s.run_id
+                ORDER BY r.started
+                """,
+                (app, limit),
+            ).fetchall()
+        samples: dict[str, list[float]] = {}
+        for step, seconds in rows:
+            samples.setdefault(step, []).append(seconds)
+        return samples
+
+    def summary(self, app: Optional[str] = None, limit: int = 100) -> list[StepStats]:
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            apps = [app] if app else [row[0] for row in conn.execute("SELECT DISTINCT app FROM runs ORDER BY app")]
+            rows = []
+            for name in apps:
+                rows.extend(
+                    (name, step, seconds)
+                    for step, seconds in conn.execute(
+                        """
+                        SELECT s.step, s.seconds FROM steps s
+                        JOIN (SELECT id, started FROM runs WHERE app = ? AND ok = 1 ORDER BY started DESC LIMIT ?) r
+                          ON r.id = s.run_id
+                        ORDER BY r.started
+                        """,
+                        (name, limit),
+                    )
+                )
+        grouped: dict[tuple[str, str], list[float]] = {}
+        for name, step, seconds in rows:
+            grouped.setdefault((name, step), []).append(seconds)
+        return [
+            StepStats(name, step, len(v), percentile(v, 50), percentile(v, 90), percentile(v, 95), v[-1])
+            for (name, step), v in sorted(grouped.items(), key=lambda item: (item[0][0], _step_rank(item[0][1]), item[0][1]))
+        ]
+
+    def step_samples(self, since: float = 0.0) -> dict[str, list[float]]:
+        """Durations per step across every app for successful runs started at or after `since`."""
+        if not self.path.exists():
+            return {}
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT s.step, s.seconds FROM steps s JOIN runs r ON r.id = s.run_id WHERE r.ok = 1 AND r.started >= ?",
+                (since,),
+            ).fetchall()
+        samples: dict[str, list[float]] = {}
+        for step, seconds in rows:
+            samples.setdefault(step, []).append(seconds)
+        return samples
+
+    def runs(self, app: Optional[str] = None, limit: int = 10) -> list[tuple]:
+        if not self.path.exists():
+            return []
+        with closing(self._connect()) as conn:
+            query = "SELECT app, workflow, started, ok, total_sec, artifact_bytes, artifact_files FROM runs"
+            params: tuple = ()
+            if app:
+                query += " WHERE app = ?"
+                params = (app,)
+            return conn.execute(query + " ORDER BY started DESC LIMIT ?", (*params, limit)).fetchall()
+
+
+def regressions(baseline: dict[str, list[float]], durations: dict[str, float]) -> list[tuple[str, float, float]]:
+    """(step, seconds, baseline median) for tracked steps much slower than their rolling median."""
+    slow = []
+    for step in TRACKED_STEPS:
+        samples = baseline.get(step, [])
+        if step not in durations or len(samples) < MIN_BASELINE:
+            continue
+        median = statistics.median(samples)
+        seconds = durations[step]
+        if seconds > median * REGRESSION_RATIO and seconds - median > REGRESSION_MIN_SEC:
+            slow.append((step, seconds, median))
+    return slow
+
+
+class EtaTracker:
+    """Prints the expected remaining time as top-level steps finish, based on rolling medians."""
+
+    def __init__(self, baseline: dict[str, list[float]]) -> None:
+        self.expected = {
+            step: statistics.median(baseline[step]) for step in ETA_STEPS if len(baseline.get(step, [])) >= MIN_BASELINE
+        }
+        self.done: set[str] = set()
+        self.started = time.perf_counter()
+
+    def start(self) -> None:
+        if self.expected:
+            info(f"ETA: ~{self._format(sum(self.expected.values()))} based on recent deploys")
+
+    def on_record(self, name: str, seconds: float) -> None:
+        if name not in self.expected or name in self.done:
+            return
+        self.done.add(name)
+        remaining = sum(v for step, v in self.expected.items() if step not in self.done)
+        if remaining > 0:
+            info(f"ETA: ~{self._format(remaining)} remaining ({self._format(time.perf_counter() - self.started)} elapsed)")
+
+    @staticmethod
+    def _format(seconds: float) -> str:
+        return f"{int(seconds // 60)}m{int(seconds % 60):02d}s" if seconds >= 60 else f"{seconds:.0f}s"
+
+
+def warn_regressions(baseline: dict[str, list[float]], durations: dict[str, float]) -> None:
+    for step, seconds, median in regressions(baseline, durations):
+        warn(f"Step '{step}' took {seconds:.1f}s, {seconds / median:.1f}x its rolling median of {median:.1f}s")
+
+
+def print_stats(history: RunHistory, app: Optional[str] = None, limit: int = 100) -> None:
+    rows = history.summary(app, limit)
+    if not rows:
+        info(f"No deploy history in {history.path}")
+        return
+    width = max(len(row.step) for row in rows)
+    current = None
+    for row in rows:
+        if row.app != current:
+            current = row.app
+            info(f"\n{row.app}")
+            info(f"   {'step'.ljust(width)}  {'runs':>4}  {'p50':>7}  {'p90':>7}  {'p95':>7}  {'last':>7}")
+        info(
+            f"   {row.step.ljust(width)}  {row.count:>4}  {row.p50:6.1f}s  {row.p90:6.1f}s  {row.p95:6.1f}s  {row.latest:6.1f}s"
+        )
+    info("\nRecent runs:")
+    for app_name, workflow, started, ok, total, size, files in history.runs(app):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(started))
+        size_mb = f"{(size or 0) / 1024 / 1024:.1f}MB"
+        info(f"   {when}  {app_name}  {'ok' if ok else 'FAILED'}  {total or 0:.1f}s  {size_mb}  {files or 0} files  ({workflow})")
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import http.client
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urlsplit
+
+from cloud.core.console import info, warn
+from cloud.core.http import HttpSession
+from cloud.core.metrics import percentile
+
+LINK_RELS = {"stylesheet", "modulepreload", "preload", "icon", "manifest", "apple-touch-icon"}
+# Ask for the encodings browsers ask for, so the compressed variants are the ones that get cached.
+WARMUP_HEADERS = {"Accept-Encoding": "gzip, deflate, br", "User-Agent": "deployscript-warmup"}
+
+
+class _RefParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.refs: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        values = dict(attrs)
+        if tag in ("script", "img", "source") and values.get("src"):
+            self.refs.append(values["src"])
+        elif tag == "link" and values.get("href"):
+            rels = set((values.get("rel") or "").lower().split())
+            if rels & LINK_RELS:
+                self.refs.append(values["href"])
+        elif tag == "a" and values.get("href"):
+            self.refs.append(values["href"])
+
+
+def _local_path(ref: str) -> Optional[str]:
+    parsed = urlsplit(ref.strip())
+    if parsed.scheme or parsed.netloc or not parsed.path:
+        return None
+    path = parsed.path if parsed.path.startswith("/") else "/" + parsed.path
+    return f"{path}?{parsed.query}" if parsed.query else path
+
+
+def discover_routes(dist_path: str, extra_routes: Optional[list[str]] = None) -> list[str]:
+    """Same-origin routes and assets referenced by the local build's index.html, plus any configured routes."""
+    routes = ["/"]
+    index = os.path.join(dist_path, "index.html")
+    if os.path.exists(index):
+        parser = _RefParser()
+        with open(index, encoding="utf-8", errors="ignore") as handle:
+            parser.feed(handle.read())
+        routes.extend(path for path in map(_local_path, parser.refs) if path)
+    routes.extend(route if route.startswith("/") else "/" + route for route in extra_routes or [])
+    return list(dict.fromkeys(routes))
+
+
+class _Pacer:
+    """Spaces request starts so the crawl never exceeds `rps` across all workers."""
+
+    def __init__(self, rps: float) -> None:
+        self.interval = 1.0 / rps if rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class RouteLatency:
+    route: str
+    before: list[float] = field(default_factory=list)
+    after: list[float] = field(default_factory=list)
+    statuses: set[int] = field(default_factory=set)
+
+
+@dataclass
+class WarmupReport:
+    routes: list[RouteLatency]
+    rounds: int
+    settled: bool
+    elapsed: float
+
+    @property
+    def failed(self) -> list[RouteLatency]:
+        # A route counts as failed only if no request succeeded; one-off errors still leave it warm.
+        return [r for r in self.routes if not any(200 <= s < 400 for s in r.statuses)]
+
+    def print(self) -> None:
+        state = "settled" if self.settled else "not settled"
+        info(f"Warm-up: {len(self.routes)} route(s), {self.rounds} round(s), latency {state} ({self.elapsed:.1f}s)")
+        width = min(60, max(len(r.route) for r in self.routes))
+        info(f"   {'route'.ljust(width)}  before p50/p95 ms   after p50/p95 ms  status")
+        for r in self.routes:
+            before = f"{percentile(r.before, 50) * 1000:6.0f}/{percentile(r.before, 95) * 1000:<6.0f}"
+            after = f"{percentile(r.after, 50) * 1000:6.0f}/{percentile(r.after, 95) * 1000:<6.0f}"
+            statuses = ",".join(str(s) for s in sorted(r.statuses)) or "-"
+            info(f"   {r.route[:width].ljust(width)}  {before}      {after}     {statuses}")
+        for r in self.failed:
+            warn(f"   Warm-up request failed for {r.route} (status {','.join(map(str, sorted(r.statuses))) or 'none'})")
+
+
+def warm_up(
+    base_url: str,
+    routes: list[str],
+    *,
+    rps: float = 20,
+    max_rounds: int = 5,
+    samples: int = 3,
+    workers: int = 8,
+    timeout: float = 30,
+    settle_ratio: float = 0.1,
+) -> WarmupReport:
+    """Request every route `samples` times per round until the round's p50 moves less than `settle_ratio`."""
+    session = HttpSession(base_url, timeout=timeout, headers=WARMUP_HEADERS)
+    pacer = _Pacer(rps)
+    results = {route: RouteLatency(route) for route in routes}
+
+    def fetch(route: str) -> tuple[str, int, Optional[float]]:
+        pacer.wait()
+        started = time.perf_counter()
+        try:
+            status, _, _ = session.request("GET", route)
+        except (http.client.HTTPException, OSError):
+            return route, 0, None
+        return route, status, time.perf_counter() - started
+
+    started = time.perf_counter()
+    previous_p50: Optional[float] = None
+    settled = False
+    rounds = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while rounds < max_rounds and not settled:
+            rounds += 1
+            samples_by_route: dict[str, list[float]] = {route: [] for route in routes}
+            for route, status, elapsed in pool.map(fetch, [route for route in routes for _ in range(samples)]):
+                results[route].statuses.add(status)
+                if elapsed is not None:
+                    samples_by_route[route].append(elapsed)
+            for route, values in samples_by_route.items():
+                if rounds == 1:
+                    results[route].before = values
+                results[route].after = values
+            round_p50 = percentile([v for values in samples_by_route.values() for v in values], 50)
+            if previous_p50 and abs(round_p50 - previous_p50) <= settle_ratio * previous_p50:
+                settled = True
+            previous_p50 = round_p50
+    return WarmupReport(list(results.values()), rounds, settled, time.perf_counter() - started)
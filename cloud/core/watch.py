@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Iterable, Iterator, Optional, Protocol
+
+DEFAULT_EXCLUDES = ("node_modules", ".git", ".deploy", "__pycache__")
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+ROOT_POLL_SEC = 0.2
+
+
+class Watcher(Protocol):
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def _excluded(rel_path: str, excludes: tuple[str, ...]) -> bool:
+    parts = rel_path.replace("\\", "/").split("/")
+    return any(part in excludes for part in parts)
+
+
+class PollingWatcher:
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, interval: float = 0.5) -> None:
+        self.root = root
+        self.excludes = tuple(excludes)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        for current, dirs, files in os.walk(self.root):
+            rel_dir = os.path.relpath(current, self.root)
+            dirs[:] = [d for d in dirs if not _excluded(os.path.join(rel_dir, d), self.excludes)]
+            for name in files:
+                full_path = os.path.join(current, name)
+                try:
+                    stat = os.stat(full_path)
+                except OSError:
+                    continue
+                snapshot[os.path.relpath(full_path, self.root)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {p for p in current.keys() | self._snapshot.keys() if current.get(p) != self._snapshot.get(p)}
+            self._snapshot = current
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.root = root
+        self.excludes = tuple(excludes)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+        self._root_missing = False
+        self._add_tree(root)
+
+    def _add(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, path: str) -> set[str]:
+        """Watch path and its non-excluded subdirectories; returns the files already in them."""
+        found: set[str] = set()
+        for current, dirs, files in os.walk(path):
+            rel_dir = os.path.relpath(current, self.root)
+            dirs[:] = [d for d in dirs if not _excluded(os.path.join(rel_dir, d), self.excludes)]
+            self._add(current)
+            found.update(os.path.relpath(os.path.join(current, f), self.root) for f in files)
+        return found
+
+    def _await_root(self, timeout: Optional[float]) -> set[str]:
+        # With the root gone there is nothing left to watch, so poll until a rebuild recreates it.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not os.path.isdir(self.root):
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(ROOT_POLL_SEC)
+        self._root_missing = False
+        return self._add_tree(self.root) | {"."}
+
+    def wait(self, timeout: Optional[float]) -> set[str]:
+        if self._root_missing:
+            return self._await_root(timeout)
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                base = self._dirs.get(wd)
+                if base is None:
+                    continue
+                full_path = os.path.join(base, name) if name else base
+                rel_path = os.path.relpath(full_path, self.root)
+                if _excluded(rel_path, self.excludes):
+                    continue
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # New directories need their own watch (and may already hold files).
+                    changed.update(self._add_tree(full_path))
+                if mask & IN_DELETE_SELF:
+                    self._dirs.pop(wd, None)
+                    if base == self.root:
+                        self._root_missing = True
+                changed.add(rel_path)
+        if self._root_missing and os.path.isdir(self.root):
+            # Deleted and already recreated (rm -rf dist && build): re-arm right away.
+            changed.update(self._await_root(0))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES) -> Watcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, excludes)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, excludes)
+
+
+def debounced_changes(watcher: Watcher, quiet_sec: float = 0.5) -> Iterator[set[str]]:
+    """Yield batches of changed paths once no further change has arrived for quiet_sec."""
+    while True:
+        batch = watcher.wait(None)
+        while True:
+            more = watcher.wait(quiet_sec)
+            if not more:
+                break
+            batch |= more
+        yield batch
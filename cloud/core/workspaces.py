@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional
+
+from cloud.core.build import build_command, run_build
+from cloud.core.console import error, info, success, warn
+from cloud.core.exec import run_command
+from cloud.core.fingerprint import inputs_digest
+from cloud.core.metrics import RunMetrics
+from cloud.core.models import DeploymentConfig
+
+BUILD_CACHE_FILE = ".deploy/build-cache.json"
+# Build outputs are not inputs; hashing them would make every package look changed after its own build.
+OUTPUT_DIRS = ("dist", "build", "out", ".next")
+DEPENDENCY_FIELDS = ("dependencies", "devDependencies", "peerDependencies", "optionalDependencies")
+
+_workspace_locks: dict[str, threading.Lock] = {}
+_workspace_locks_guard = threading.Lock()
+
+
+@contextmanager
+def workspace_lock(workspace_root: str) -> Iterator[None]:
+    """Serializes build and packaging per workspace; targets sharing one write the same dist_dir."""
+    key = os.path.normcase(os.path.realpath(workspace_root))
+    with _workspace_locks_guard:
+        lock = _workspace_locks.setdefault(key, threading.Lock())
+    with lock:
+        yield
+
+
+@dataclass
+class WorkspacePackage:
+    name: str
+    path: Path
+    deps: set[str] = field(default_factory=set)
+    has_build: bool = False
+
+
+def _read_json(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def workspace_patterns(root: Path) -> list[str]:
+    workspaces = _read_json(root / "package.json").get("workspaces")
+    if isinstance(workspaces, dict):
+        workspaces = workspaces.get("packages")
+    return [p for p in workspaces or [] if isinstance(p, str)]
+
+
+def discover_packages(root: Path) -> dict[str, WorkspacePackage]:
+    """Yarn workspace packages under root, with dependencies narrowed to other workspace packages."""
+    manifests: dict[str, tuple[Path, dict]] = {}
+    for pattern in workspace_patterns(root):
+        if pattern.startswith("!"):
+            continue
+        for directory in sorted(root.glob(pattern.rstrip("/"))):
+            data = _read_json(directory / "package.json")
+            if data.get("name"):
+                manifests[data["name"]] = (directory, data)
+    packages: dict[str, WorkspacePackage] = {}
+    for name, (directory, data) in manifests.items():
+        declared = {dep for field_name in DEPENDENCY_FIELDS for dep in (data.get(field_name) or {})}
+        packages[name] = WorkspacePackage(
+            name=name,
+            path=directory,
+            deps=declared & set(manifests) - {name},
+            has_build="build" in (data.get("scripts") or {}),
+        )
+    return packages
+
+
+def build_order(packages: dict[str, WorkspacePackage], targets: list[str]) -> list[str]:
+    """Targets plus their workspace dependencies, dependencies first. Raises on cycles."""
+    order: list[str] = []
+    state: dict[str, str] = {}
+
+    def visit(name: str, chain: list[str]) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise RuntimeError(f"Workspace dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = "visiting"
+        for dep in sorted(packages[name].deps):
+            visit(dep, chain + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for target in targets:
+        visit(target, [])
+    return order
+
+
+def select_app(packages: dict[str, WorkspacePackage], app_package: Optional[str]) -> str:
+    if app_package:
+        if app_package not in packages:
+            raise RuntimeError(f"app_package '{app_package}' is not a workspace package ({', '.join(sorted(packages))})")
+        return app_package
+    depended_on = {dep for package in packages.values() for dep in package.deps}
+    leaves = sorted(name for name, package in packages.items() if package.has_build and name not in depended_on)
+    if len(leaves) != 1:
+        raise RuntimeError(f"Set app_package to choose the app to deploy; candidates: {', '.join(leaves) or 'none'}")
+    return leaves[0]
+
+
+class BuildCache:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, str] = _read_json(path) if path.exists() else {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _has_output(package: WorkspacePackage) -> bool:
+    return any((package.path / name).exists() for name in OUTPUT_DIRS)
+
+
+def build_workspaces(
+    root: Path,
+    packages: dict[str, WorkspacePackage],
+    targets: list[str],
+    *,
+    workers: int = 4,
+    metrics: Optional[RunMetrics] = None,
+) -> dict[str, Optional[float]]:
+    """Build targets and their dependencies in dependency order on a bounded pool.
+
+    A package is skipped when its own inputs and its dependencies' keys match the cache. Returns build seconds
+    per package, with None for skipped packages.
+    """
+    order = build_order(packages, targets)
+    cache = BuildCache(root / BUILD_CACHE_FILE)
+    digests: dict[str, str] = {}
+    timings: dict[str, Optional[float]] = {}
+    pending = {name: set(packages[name].deps) for name in order}
+    running: dict[Future, str] = {}
+
+    def cache_key(name: str) -> str:
+        package = packages[name]
+        own = inputs_digest(str(package.path), exclude=OUTPUT_DIRS)
+        combined = own + "".join(f"\n{dep}:{digests[dep]}" for dep in sorted(package.deps))
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+
+    def build(name: str) -> float:
+        started = time.perf_counter()
+        result = run_command(build_command(), cwd=str(packages[name].path), check=False)
+        if result.returncode != 0:
+            error(f"Build failed for {name}")
+            for line in (result.stdout + result.stderr).strip().splitlines()[-20:]:
+                error(f"   {line}")
+            raise RuntimeError(f"Build failed for {name}")
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending or running:
+            for name in [n for n in order if n in pending and not pending[n]]:
+                del pending[name]
+                package = packages[name]
+                digests[name] = cache_key(name)
+                if not package.has_build or (cache.entries.get(name) == digests[name] and _has_output(package)):
+                    timings[name] = None
+                    info(f"   {name}: unchanged, skipping build" if package.has_build else f"   {name}: no build script")
+                    for deps in pending.values():
+                        deps.discard(name)
+                    continue
+                info(f"   {name}: building...")
+                running[pool.submit(build, name)] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                timings[name] = future.result()
+                cache.entries[name] = digests[name]
+                cache.save()
+                if metrics:
+                    metrics.record(f"build.{name}", timings[name])
+                for deps in pending.values():
+                    deps.discard(name)
+    return timings
+
+
+def assemble_dist(package: WorkspacePackage, output_dir: str, root: Path, dist_path: Path) -> None:
+    """Replace dist_path with a copy of the app's build output.
+
+    dist_path is deleted first, so it must be a folder strictly inside the workspace and must not contain the
+    build output itself.
+    """
+    source = package.path / output_dir
+    if not source.is_dir():
+        error(f"Build output '{output_dir}' not found for {package.name}.")
+        raise RuntimeError("Missing build output")
+    dist, src = dist_path.resolve(), source.resolve()
+    if dist == src:
+        return
+    if root.resolve() not in dist.parents or dist in src.parents:
+        error(f"dist_dir '{dist_path}' must be a folder inside the workspace that does not contain {package.name}'s build output.")
+        raise RuntimeError("Unsafe dist_dir")
+    if dist_path.exists():
+        shutil.rmtree(dist_path)
+    shutil.copytree(source, dist_path)
+
+
+def run_workspace_build(workspace_root: str, config: DeploymentConfig, metrics: Optional[RunMetrics] = None) -> None:
+    """Build a yarn-workspaces monorepo package by package, or fall back to a single root build."""
+    if not config.build:
+        info("Skipping build (build disabled); deploying the existing dist_dir.")
+        return
+    root = Path(workspace_root)
+    packages = discover_packages(root) if workspace_patterns(root) else {}
+    if not packages:
+        run_build(workspace_root)
+        return
+
+    app = select_app(packages, config.app_package)
+    info(f"Building workspace app {app} and its dependencies ({config.build_workers} workers)...")
+    timings = build_workspaces(root, packages, [app], workers=config.build_workers, metrics=metrics)
+    assemble_dist(packages[app], config.app_dist_dir, root, root / config.dist_dir)
+
+    width = max(len(name) for name in timings)
+    for name, seconds in timings.items():
+        info(f"   {name.ljust(width)}  {'cached' if seconds is None else f'{seconds:6.1f}s'}")
+    built = sum(1 for seconds in timings.values() if seconds is not None)
+    if built == 0:
+        warn("All workspace packages were unchanged; reused previous build outputs.")
+    success(f"Workspace build completed ({built} built, {len(timings) - built} cached)")
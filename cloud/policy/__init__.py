@@ -1,10 +1,15 @@
 from cloud.policy.base import PolicyCheck, PolicyResult
-from cloud.policy.checks import LocationDefinedPolicy
+from cloud.policy.checks import DeclarativePolicy, LocationDefinedPolicy
+from cloud.policy.rules import RuleSet, Violation, load_rule_set
 from cloud.policy.runner import run_policy_checks
 
 __all__ = [
+    "DeclarativePolicy",
     "LocationDefinedPolicy",
     "PolicyCheck",
     "PolicyResult",
+    "RuleSet",
+    "Violation",
+    "load_rule_set",
     "run_policy_checks",
 ]
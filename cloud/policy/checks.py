@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from cloud.core.models import WorkflowContext
 from cloud.policy.base import PolicyResult
+from cloud.policy.rules import load_rule_set, resolve_rules_path
 
 
 class LocationDefinedPolicy:
@@ -11,3 +12,21 @@ class LocationDefinedPolicy:
         if context.config.location:
             return PolicyResult(self.name, True, f"Location set to {context.config.location}.")
         return PolicyResult(self.name, False, "Location is empty.")
+
+
+class DeclarativePolicy:
+    name = "policy.rules"
+
+    def evaluate(self, context: WorkflowContext) -> PolicyResult:
+        path = resolve_rules_path(context.config, context.workspace_root)
+        if not path:
+            return PolicyResult(self.name, True, "No policy rules configured.")
+        try:
+            rule_set = load_rule_set(path)
+        except (OSError, ValueError, RuntimeError) as exc:
+            return PolicyResult(self.name, False, str(exc))
+        violations = rule_set.evaluate(context.config)
+        if violations:
+            details = "; ".join(f"{v.rule}: {v.message} (got {v.value!r})" for v in violations)
+            return PolicyResult(self.name, False, details)
+        return PolicyResult(self.name, True, f"{len(rule_set)} rule check(s) passed.")
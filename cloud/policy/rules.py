@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import dataclasses
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from cloud.core.config import load_yaml_config
+from cloud.core.models import DeploymentConfig
+
+OPERATORS = ("required", "equals", "in", "not_in", "matches", "min", "max")
+CONFIG_FIELDS = frozenset(f.name for f in dataclasses.fields(DeploymentConfig))
+
+
+@dataclass(frozen=True)
+class Violation:
+    target: str
+    rule: str
+    field: str
+    value: Any
+    message: str
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    field: str
+    test: Callable[[Any], bool]
+    # (field, allowed values) pairs that must all match for the rule to apply.
+    when: tuple[tuple[str, frozenset], ...]
+    message: str
+
+    @property
+    def reads(self) -> tuple[str, ...]:
+        return tuple(sorted({self.field, *(name for name, _ in self.when)}))
+
+    def applies(self, values: dict[str, Any]) -> bool:
+        return all(_hashable(values[name]) in allowed for name, allowed in self.when)
+
+
+def target_name(config: DeploymentConfig) -> str:
+    return f"{config.resource_group}/{config.web_app_name}"
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _as_set(value: Any) -> frozenset:
+    return frozenset(_hashable(v) for v in (value if isinstance(value, list) else [value]))
+
+
+def _when_values(name: str, key: str, value: Any) -> frozenset:
+    """A `when` value is a scalar, or a list of scalars meaning "any of"."""
+    values = value if isinstance(value, list) else [value]
+    if not all(v is None or isinstance(v, (str, int, float, bool)) for v in values):
+        raise ValueError(f"Rule '{name}': 'when' value for {key} must be a scalar or a list of scalars.")
+    return frozenset(values)
+
+
+def _compile_test(name: str, op: str, expected: Any) -> tuple[Callable[[Any], bool], str]:
+    if op == "required":
+        return (lambda v: v not in (None, "", [])) if expected else (lambda v: True), "is required"
+    if op == "equals":
+        return (lambda v: v == expected), f"must equal {expected!r}"
+    if op in ("in", "not_in"):
+        allowed = _as_set(expected)
+        shown = ", ".join(sorted(str(v) for v in allowed))
+        if op == "in":
+            return (lambda v: _hashable(v) in allowed), f"must be one of [{shown}]"
+        return (lambda v: _hashable(v) not in allowed), f"must not be one of [{shown}]"
+    if op == "matches":
+        try:
+            pattern = re.compile(str(expected))
+        except re.error as exc:
+            raise ValueError(f"Rule '{name}': invalid pattern {expected!r}: {exc}") from exc
+        return (lambda v: v is not None and pattern.fullmatch(str(v)) is not None), f"must match {expected!r}"
+    if op in ("min", "max"):
+        if not isinstance(expected, (int, float)):
+            raise ValueError(f"Rule '{name}': {op} must be a number.")
+        if op == "min":
+            return (lambda v: isinstance(v, (int, float)) and v >= expected), f"must be >= {expected}"
+        return (lambda v: isinstance(v, (int, float)) and v <= expected), f"must be <= {expected}"
+    raise ValueError(f"Rule '{name}': unknown operator '{op}' (expected one of {', '.join(OPERATORS)}).")
+
+
+def compile_rule(data: dict[str, Any], index: int) -> list[Rule]:
+    """One rule entry may use several operators; each becomes its own compiled check."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Rule #{index + 1} must be a mapping.")
+    name = str(data.get("name") or f"rule-{index + 1}")
+    field = data.get("field")
+    if field not in CONFIG_FIELDS:
+        raise ValueError(f"Rule '{name}': unknown config field {field!r}.")
+    when = data.get("when") or {}
+    if not isinstance(when, dict):
+        raise ValueError(f"Rule '{name}': 'when' must map config fields to a value or list of values.")
+    unknown = sorted(set(when) - CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(f"Rule '{name}': unknown field(s) in 'when': {', '.join(unknown)}")
+    extra = sorted(set(data) - {"name", "field", "when", "message", *OPERATORS})
+    if extra:
+        raise ValueError(f"Rule '{name}': unknown key(s) {', '.join(extra)}")
+    ops = [op for op in OPERATORS if op in data]
+    if not ops:
+        raise ValueError(f"Rule '{name}': needs one of {', '.join(OPERATORS)}.")
+    conditions = tuple(sorted((key, _when_values(name, key, value)) for key, value in when.items()))
+    rules = []
+    for op in ops:
+        test, description = _compile_test(name, op, data[op])
+        rules.append(Rule(name, field, test, conditions, data.get("message") or f"{field} {description}"))
+    return rules
+
+
+class RuleSet:
+    """Rules compiled once and grouped by the config fields they read.
+
+    Targets that share the values of a group's fields share its verdict, so a fleet
+    that varies only in names evaluates region/SKU/runtime rules once per distinct combination.
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.rules = list(rules)
+        self.groups: dict[tuple[str, ...], list[Rule]] = {}
+        for rule in self.rules:
+            self.groups.setdefault(rule.reads, []).append(rule)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "RuleSet":
+        entries = data.get("rules") or []
+        if not isinstance(entries, list):
+            raise ValueError("Policy rules file must contain a 'rules' list.")
+        return cls(rule for index, entry in enumerate(entries) for rule in compile_rule(entry, index))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RuleSet":
+        if not path.exists():
+            raise FileNotFoundError(f"Policy rules file not found: {path}")
+        return cls.from_dict(load_yaml_config(path))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @staticmethod
+    def _failures(rules: list[Rule], values: dict[str, Any]) -> list[Rule]:
+        return [rule for rule in rules if rule.applies(values) and not rule.test(values[rule.field])]
+
+    def _violations(self, config: DeploymentConfig, failed: list[Rule]) -> list[Violation]:
+        target = target_name(config)
+        return [
+            Violation(target, rule.name, rule.field, getattr(config, rule.field), rule.message)
+            for rule in failed
+        ]
+
+    def evaluate(self, config: DeploymentConfig) -> list[Violation]:
+        failed: list[Rule] = []
+        for fields_read, rules in self.groups.items():
+            failed.extend(self._failures(rules, {name: getattr(config, name) for name in fields_read}))
+        return self._violations(config, failed)
+
+    def evaluate_many(self, configs: Iterable[DeploymentConfig]) -> list[list[Violation]]:
+        """Violations for each config, in input order, memoizing each group's verdict by field values.
+
+        Results are positional rather than keyed by target name, so two entries for the same target are both reported.
+        """
+        memo: dict[tuple[str, ...], dict[tuple, list[Rule]]] = {fields_read: {} for fields_read in self.groups}
+        results: list[list[Violation]] = []
+        for config in configs:
+            failed: list[Rule] = []
+            for fields_read, rules in self.groups.items():
+                key = tuple(_hashable(getattr(config, name)) for name in fields_read)
+                cache = memo[fields_read]
+                verdict = cache.get(key)
+                if verdict is None:
+                    verdict = cache[key] = self._failures(rules, {name: getattr(config, name) for name in fields_read})
+                failed.extend(verdict)
+            results.append(self._violations(config, failed))
+        return results
+
+
+_cache: dict[Path, tuple[float, RuleSet]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_rule_set(path: Path) -> RuleSet:
+    """Compiled rules for path, recompiled only when the file changes (service mode evaluates it per job)."""
+    path = path.resolve()
+    mtime = path.stat().st_mtime if path.exists() else -1.0
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    rule_set = RuleSet.from_file(path)
+    with _cache_lock:
+        _cache[path] = (mtime, rule_set)
+    return rule_set
+
+
+def resolve_rules_path(config: DeploymentConfig, workspace_root: str) -> Optional[Path]:
+    if not config.policy_rules:
+        return None
+    path = Path(config.policy_rules)
+    return path if path.is_absolute() else Path(workspace_root) / path
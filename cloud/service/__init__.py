@@ -0,0 +1,4 @@
+from cloud.service.queue import DeployQueue, Job
+from cloud.service.server import make_server, serve
+
+__all__ = ["DeployQueue", "Job", "make_server", "serve"]
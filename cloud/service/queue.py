@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from cloud.core.console import error, info
+from cloud.core.models import WorkflowContext
+from cloud.workflows.base import WorkflowResult
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SUPERSEDED = "superseded"
+
+
+@dataclass
+class Job:
+    job_id: str
+    target: str
+    context: WorkflowContext
+    status: str = QUEUED
+    message: str = ""
+    superseded_by: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.job_id,
+            "target": self.target,
+            "status": self.status,
+            "message": self.message,
+            "superseded_by": self.superseded_by,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+def target_key(context: WorkflowContext) -> str:
+    config = context.config
+    return f"{config.provider}/{config.resource_group}/{config.web_app_name}"
+
+
+class DeployQueue:
+    """Per-target queues where a newer request replaces any pending one; distinct targets run in parallel."""
+
+    def __init__(self, runner: Callable[[WorkflowContext], WorkflowResult], max_workers: int = 4, keep_finished: int = 500) -> None:
+        self.runner = runner
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deploy-worker")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: dict[str, Job] = {}
+        self._pending: dict[str, Job] = {}
+        self._active: set[str] = set()
+
+    def submit(self, context: WorkflowContext) -> Job:
+        with self._lock:
+            job = Job(f"job-{next(self._ids)}", target_key(context), context)
+            self._jobs[job.job_id] = job
+            previous = self._pending.get(job.target)
+            if previous:
+                previous.status = SUPERSEDED
+                previous.superseded_by = job.job_id
+                previous.finished = time.time()
+                info(f"[SERVICE] {previous.job_id} superseded by {job.job_id} for {job.target}")
+            self._pending[job.target] = job
+            if job.target not in self._active:
+                self._active.add(job.target)
+                self._executor.submit(self._drain, job.target)
+            self._trim()
+        return job
+
+    def _drain(self, target: str) -> None:
+        while True:
+            with self._lock:
+                job = self._pending.pop(target, None)
+                if job is None:
+                    self._active.discard(target)
+                    return
+                job.status = RUNNING
+                job.started = time.time()
+            info(f"[SERVICE] {job.job_id} started for {target}")
+            try:
+                result = self.runner(job.context)
+                status, message = (SUCCEEDED if result.ok else FAILED), result.message
+            except SystemExit as exc:
+                status, message = FAILED, f"Workflow exited with code {exc.code}"
+            except Exception as exc:
+                status, message = FAILED, str(exc)
+            with self._lock:
+                job.status, job.message, job.finished = status, message, time.time()
+            (info if status == SUCCEEDED else error)(f"[SERVICE] {job.job_id} {status}: {message}")
+
+    def _trim(self) -> None:
+        finished = [j for j in self._jobs.values() if j.finished is not None]
+        for job in sorted(finished, key=lambda j: j.finished or 0)[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created, reverse=True)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import socketserver
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from cloud.core.console import info, warn
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.service.queue import DeployQueue
+from cloud.workflows.base import WorkflowResult
+
+# Fields a deploy request may set: which target to deploy and how. Everything else (tool paths, local
+# state, workflows, build and watch settings, endpoints) stays as the service was started with.
+ALLOWED_FIELDS = {
+    "resource_group",
+    "web_app_name",
+    "location",
+    "sku",
+    "runtime",
+    "environment",
+    "provider",
+    "hosting",
+    "deploy_mode",
+    "app_package",
+    "quick_check",
+    "plan_only",
+    "rollback_to",
+    "storage_account",
+    "aws_region",
+    "s3_bucket",
+    "cloudfront_distribution_id",
+    "cdn_kind",
+    "cdn_profile",
+    "cdn_endpoint",
+    "cdn_resource_group",
+    "warmup",
+    "warmup_routes",
+}
+
+
+def _check_type(name: str, annotation: str, value: object) -> None:
+    if value is None and annotation.startswith("Optional["):
+        return
+    if annotation == "bool":
+        ok = isinstance(value, bool)
+    elif annotation == "list[str]":
+        ok = isinstance(value, list) and all(isinstance(item, str) for item in value)
+    else:
+        ok = isinstance(value, str)
+    if not ok:
+        raise ValueError(f"Config field {name} must be {annotation}")
+
+
+def config_overrides(base: DeploymentConfig, payload: dict) -> DeploymentConfig:
+    fields = {f.name: f for f in dataclasses.fields(DeploymentConfig)}
+    unknown = sorted(set(payload) - ALLOWED_FIELDS)
+    if unknown:
+        raise ValueError(f"Config field(s) not allowed in a deploy request: {', '.join(unknown)}")
+    for name, value in payload.items():
+        _check_type(name, str(fields[name].type), value)
+    return dataclasses.replace(base, **payload)
+
+
+def make_handler(queue: DeployQueue, base_config: DeploymentConfig, workspace_root: str) -> type[BaseHTTPRequestHandler]:
+    class DeployRequestHandler(BaseHTTPRequestHandler):
+        def address_string(self) -> str:
+            # Unix-socket peers have no (host, port) tuple.
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def _send(self, status: int, body) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self) -> None:
+            path = self.path.rstrip("/")
+            if path == "/healthz":
+                self._send(200, {"ok": True})
+            elif path == "/jobs":
+                self._send(200, [job.to_dict() for job in queue.list()])
+            elif path.startswith("/jobs/"):
+                job = queue.get(path.split("/", 2)[2])
+                if job:
+                    self._send(200, job.to_dict())
+                else:
+                    self._send(404, {"error": "job not found"})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            if self.path.rstrip("/") != "/deploys":
+                self._send(404, {"error": "not found"})
+                return
+            # Browsers send cross-origin text/plain and form POSTs without a preflight; JSON needs one.
+            if self.headers.get_content_type() != "application/json":
+                self._send(415, {"error": "Content-Type must be application/json"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(payload, dict):
+                    raise ValueError("Request body must be a JSON object")
+                config = config_overrides(base_config, payload)
+            except (ValueError, TypeError) as exc:
+                self._send(400, {"error": str(exc)})
+                return
+            job = queue.submit(WorkflowContext(config=config, workspace_root=workspace_root))
+            self._send(202, job.to_dict())
+
+    return DeployRequestHandler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(
+    queue: DeployQueue,
+    base_config: DeploymentConfig,
+    workspace_root: str,
+    *,
+    listen: Optional[str] = None,
+    socket_path: Optional[str] = None,
+) -> socketserver.BaseServer:
+    handler = make_handler(queue, base_config, workspace_root)
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return UnixHTTPServer(socket_path, handler)
+    host, _, port = (listen or "127.0.0.1:8787").rpartition(":")
+    return ThreadingHTTPServer((host or "127.0.0.1", int(port)), handler)
+
+
+def serve(
+    runner: Callable[[WorkflowContext], WorkflowResult],
+    base_config: DeploymentConfig,
+    workspace_root: str,
+    *,
+    listen: Optional[str] = None,
+    socket_path: Optional[str] = None,
+    workers: int = 4,
+) -> None:
+    if base_config.watch:
+        # Requests cannot turn watch on, but a watching base config would pin every worker forever.
+        raise ValueError("watch is not supported in service mode; set watch: false in the service config")
+    queue = DeployQueue(runner, max_workers=workers)
+    server = make_server(queue, base_config, workspace_root, listen=listen, socket_path=socket_path)
+    where = socket_path or listen or "127.0.0.1:8787"
+    info(f"Deploy service listening on {where} with {workers} worker(s).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        warn("Deploy service stopping; waiting for running jobs...")
+    finally:
+        server.server_close()
+        queue.shutdown()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,7 @@
+from cloud.sim.blob import BlobSimServer
+from cloud.sim.fake_az import write_az_shim
+from cloud.sim.profile import Faults, Latency, SimProfile
+from cloud.sim.s3 import S3SimServer
+from cloud.sim.server import SimProcess, SimServer
+
+__all__ = ["BlobSimServer", "Faults", "Latency", "S3SimServer", "SimProfile", "SimProcess", "SimServer", "write_az_shim"]
@@ -0,0 +1,42 @@
+"""Serve the simulator: python -m cloud.sim [--port 8900] [--profile sim.yaml] [--time-scale 0.05]."""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from cloud.core.config import load_yaml_config
+from cloud.sim.profile import SimProfile
+from cloud.sim.server import SimServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m cloud.sim", description="Fake ARM/Kudu/site endpoints for deploy testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="Port to listen on (default: any free port).")
+    parser.add_argument("--profile", default=None, help="YAML/JSON file with SimProfile fields.")
+    parser.add_argument("--profile-json", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--time-scale", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    data = json.loads(args.profile_json) if args.profile_json else load_yaml_config(Path(args.profile)) if args.profile else {}
+    profile = SimProfile.from_dict(data)
+    if args.time_scale is not None:
+        profile = replace(profile, time_scale=args.time_scale)
+    if args.seed is not None:
+        profile = replace(profile, seed=args.seed)
+    server = SimServer(profile, args.host, args.port)
+    # The first line is machine-read by SimProcess; point az_path at write_az_shim(dir, url) to use it.
+    print(f"DEPLOYSIM_URL={server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
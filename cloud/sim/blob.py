@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import threading
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from cloud.azure.blob import EMULATOR_ACCOUNT, EMULATOR_KEY
+
+WEB_CONTAINER = "$web"
+
+
+@dataclass
+class StoredBlob:
+    data: bytes
+    content_type: str = "application/octet-stream"
+    cache_control: str = ""
+    content_md5: str = ""
+
+
+@dataclass
+class BlobSimState:
+    account: str
+    key: bytes
+    page_size: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    containers: dict[str, dict[str, StoredBlob]] = field(default_factory=dict)
+    # (container, blob) -> staged block id -> bytes, until a block list commits them.
+    blocks: dict[tuple[str, str], dict[str, bytes]] = field(default_factory=dict)
+    website: dict[str, str] = field(default_factory=dict)
+    counters: Counter = field(default_factory=Counter)
+
+    def expected_signature(self, method: str, raw_path: str, headers: dict[str, str]) -> str:
+        """SharedKey string-to-sign for path-style (emulator) URLs, built from the request as received."""
+        lookup = {k.lower(): v for k, v in headers.items()}
+        url_path, _, query = raw_path.partition("?")
+        canonical_headers = "".join(f"{k}:{v.strip()}\n" for k, v in sorted(lookup.items()) if k.startswith("x-ms-"))
+        resource = f"/{self.account}{url_path}"
+        params: dict[str, list[str]] = {}
+        for k, v in parse_qsl(query, keep_blank_values=True):
+            params.setdefault(k.lower(), []).append(v)
+        for k in sorted(params):
+            resource += f"\n{k}:{','.join(sorted(params[k]))}"
+        length = lookup.get("content-length", "")
+        fields = [
+            method,
+            lookup.get("content-encoding", ""),
+            lookup.get("content-language", ""),
+            "" if length == "0" else length,
+            lookup.get("content-md5", ""),
+            lookup.get("content-type", ""),
+            "",
+            lookup.get("if-modified-since", ""),
+            lookup.get("if-match", ""),
+            lookup.get("if-none-match", ""),
+            lookup.get("if-unmodified-since", ""),
+            lookup.get("range", ""),
+        ]
+        string_to_sign = "\n".join(fields) + "\n" + canonical_headers + resource
+        digest = hmac.new(self.key, string_to_sign.encode("utf-8"), hashlib.sha256).digest()
+        return f"SharedKey {self.account}:{base64.b64encode(digest).decode('ascii')}"
+
+
+class BlobSimHandler(BaseHTTPRequestHandler):
+    """Path-style Blob endpoints (/<account>/<container>/<blob>) covering what the static website sync uses."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "BlobSim/1.0"
+    state: BlobSimState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-ms-version", "2021-08-06")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _error(self, status: int, code: str) -> None:
+        body = f'<?xml version="1.0" encoding="utf-8"?><Error><Code>{code}</Code></Error>'.encode("utf-8")
+        self._send(status, body, {"Content-Type": "application/xml", "x-ms-error-code": code})
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _route(self) -> None:
+        data = self._body()
+        state = self.state
+        parsed = urlsplit(self.path)
+        prefix = f"/{state.account}"
+        if not (parsed.path == prefix or parsed.path.startswith(prefix + "/")):
+            self._error(400, "InvalidUri")
+            return
+        parts = parsed.path[len(prefix):].lstrip("/").split("/", 1)
+        container = unquote(parts[0])
+        blob = unquote(parts[1]) if len(parts) > 1 else ""
+        query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        with state.lock:
+            state.counters[f"{self.command} {query.get('comp') or query.get('restype') or 'blob'}"] += 1
+        if self.command in ("GET", "HEAD") and container == WEB_CONTAINER and "comp" not in query:
+            # The static website endpoint is anonymous.
+            self._website(blob)
+            return
+        expected = state.expected_signature(self.command, self.path, dict(self.headers.items()))
+        if not hmac.compare_digest(self.headers.get("Authorization", ""), expected):
+            self._error(403, "AuthenticationFailed")
+            return
+        if not container and query.get("restype") == "service" and query.get("comp") == "properties":
+            self._service_properties(data)
+        elif not blob and query.get("restype") == "container":
+            self._container(container, query)
+        elif self.command == "PUT" and query.get("comp") == "block":
+            self._put_block(container, blob, query.get("blockid", ""), data)
+        elif self.command == "PUT" and query.get("comp") == "blocklist":
+            self._put_block_list(container, blob, data)
+        elif self.command == "PUT" and query.get("comp") == "properties" and blob:
+            self._set_properties(container, blob)
+        elif self.command == "PUT" and blob:
+            self._put_blob(container, blob, data)
+        elif self.command == "DELETE" and blob:
+            with state.lock:
+                found = state.containers.get(container, {}).pop(blob, None)
+            self._send(202) if found else self._error(404, "BlobNotFound")
+        elif self.command in ("GET", "HEAD") and blob:
+            with state.lock:
+                stored = state.containers.get(container, {}).get(blob)
+            self._send_blob(stored)
+        else:
+            self._error(400, "UnsupportedOperation")
+
+    def _service_properties(self, data: bytes) -> None:
+        website = ET.fromstring(data).find("StaticWebsite")
+        if website is not None:
+            with self.state.lock:
+                self.state.website = {
+                    "enabled": website.findtext("Enabled") or "false",
+                    "index": website.findtext("IndexDocument") or "",
+                    "error": website.findtext("ErrorDocument404Path") or "",
+                }
+        self._send(202)
+
+    def _container(self, container: str, query: dict[str, str]) -> None:
+        state = self.state
+        if self.command == "PUT":
+            with state.lock:
+                exists = container in state.containers
+                state.containers.setdefault(container, {})
+            self._error(409, "ContainerAlreadyExists") if exists else self._send(201)
+            return
+        if query.get("comp") != "list":
+            self._error(400, "UnsupportedOperation")
+            return
+        with state.lock:
+            blobs = state.containers.get(container)
+            names = sorted(blobs) if blobs is not None else None
+        if names is None:
+            self._error(404, "ContainerNotFound")
+            return
+        limit = min(int(query.get("maxresults") or 5000), state.page_size)
+        marker = query.get("marker", "")
+        start = next((i for i, name in enumerate(names) if name >= marker), len(names)) if marker else 0
+        page, rest = names[start : start + limit], names[start + limit :]
+        items = []
+        for name in page:
+            stored = blobs[name]
+            items.append(
+                f"<Blob><Name>{escape(name)}</Name><Properties>"
+                f"<Content-Length>{len(stored.data)}</Content-Length>"
+                f"<Content-Type>{escape(stored.content_type)}</Content-Type>"
+                f"<Content-MD5>{stored.content_md5}</Content-MD5>"
+                f"<Cache-Control>{escape(stored.cache_control)}</Cache-Control>"
+                "<BlobType>BlockBlob</BlobType></Properties></Blob>"
+            )
+        next_marker = escape(rest[0]) if rest else ""
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?><EnumerationResults>'
+            f"<Blobs>{''.join(items)}</Blobs><NextMarker>{next_marker}</NextMarker></EnumerationResults>"
+        ).encode("utf-8")
+        self._send(200, body, {"Content-Type": "application/xml"})
+
+    def _properties(self) -> dict[str, str]:
+        return {
+            "content_type": self.headers.get("x-ms-blob-content-type") or "application/octet-stream",
+            "cache_control": self.headers.get("x-ms-blob-cache-control") or "",
+            "content_md5": self.headers.get("x-ms-blob-content-md5") or "",
+        }
+
+    def _put_blob(self, container: str, blob: str, data: bytes) -> None:
+        if self.headers.get("x-ms-blob-type") != "BlockBlob":
+            self._error(400, "InvalidHeaderValue")
+            return
+        with self.state.lock:
+            if container not in self.state.containers:
+                stored = None
+            else:
+                stored = self.state.containers[container][blob] = StoredBlob(data, **self._properties())
+        self._send(201) if stored else self._error(404, "ContainerNotFound")
+
+    def _set_properties(self, container: str, blob: str) -> None:
+        with self.state.lock:
+            stored = self.state.containers.get(container, {}).get(blob)
+            if stored is not None:
+                properties = self._properties()
+                stored.content_type = properties["content_type"]
+                stored.cache_control = properties["cache_control"]
+                stored.content_md5 = properties["content_md5"]
+        self._send(200) if stored else self._error(404, "BlobNotFound")
+
+    def _put_block(self, container: str, blob: str, block_id: str, data: bytes) -> None:
+        with self.state.lock:
+            self.state.blocks.setdefault((container, blob), {})[block_id] = data
+        self._send(201)
+
+    def _put_block_list(self, container: str, blob: str, data: bytes) -> None:
+        ids = [element.text or "" for element in ET.fromstring(data)]
+        with self.state.lock:
+            staged = self.state.blocks.get((container, blob), {})
+            missing = [block_id for block_id in ids if block_id not in staged]
+            if not missing and container in self.state.containers:
+                content = b"".join(staged[block_id] for block_id in ids)
+                self.state.containers[container][blob] = StoredBlob(content, **self._properties())
+                self.state.blocks.pop((container, blob), None)
+        if missing:
+            self._error(400, "InvalidBlockList")
+        else:
+            self._send(201)
+
+    def _send_blob(self, stored: Optional[StoredBlob]) -> None:
+        if stored is None:
+            self._error(404, "BlobNotFound")
+            return
+        headers = {"Content-Type": stored.content_type, "Last-Modified": formatdate(usegmt=True)}
+        if stored.cache_control:
+            headers["Cache-Control"] = stored.cache_control
+        if stored.content_md5:
+            headers["Content-MD5"] = stored.content_md5
+        self._send(200, stored.data, headers)
+
+    def _website(self, rel_path: str) -> None:
+        with self.state.lock:
+            website = dict(self.state.website)
+            files = self.state.containers.get(WEB_CONTAINER, {})
+            stored = files.get(rel_path) if rel_path else None
+            if stored is None and website.get("enabled") == "true":
+                stored = files.get(rel_path.rstrip("/") + "/" + website["index"] if rel_path else website["index"])
+                if stored is None and website.get("error"):
+                    stored = files.get(website["error"])
+        self._send_blob(stored)
+
+    def do_GET(self) -> None:
+        self._route()
+
+    do_HEAD = do_GET
+    do_PUT = do_GET
+    do_DELETE = do_GET
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class BlobSimServer:
+    """In-memory stand-in for an Azurite-style storage emulator, with Shared Key auth checked on every call."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        account: str = EMULATOR_ACCOUNT,
+        key: str = EMULATOR_KEY,
+        page_size: int = 5000,
+    ) -> None:
+        self.state = BlobSimState(account, base64.b64decode(key), page_size)
+        handler = type("BoundBlobSimHandler", (BlobSimHandler,), {"state": self.state})
+        self._server = _Server((host, port), handler)
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Value for storage_endpoint."""
+        return f"http://{self.host}:{self.port}/{self.state.account}"
+
+    def blobs(self, container: str = WEB_CONTAINER) -> dict[str, StoredBlob]:
+        with self.state.lock:
+            return dict(self.state.containers.get(container, {}))
+
+    def stats(self) -> dict[str, int]:
+        with self.state.lock:
+            return dict(self.state.counters)
+
+    def start(self) -> "BlobSimServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="blob-sim", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "BlobSimServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
@@ -0,0 +1,61 @@
+"""Stand-in for the `az` executable that forwards each invocation to a running simulator.
+
+Usage: DEPLOYSIM_URL=http://127.0.0.1:8900 python cloud/sim/fake_az.py webapp show --name app -g rg
+
+Only the standard library is imported, so each call starts about as fast as Python itself.
+"""
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional
+
+URL_ENV = "DEPLOYSIM_URL"
+SCRIPT = Path(__file__).resolve()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    url = os.environ.get(URL_ENV)
+    if not url:
+        print(f"ERROR: {URL_ENV} is not set; start a simulator first.", file=sys.stderr)
+        return 2
+    args = list(sys.argv[1:] if argv is None else argv)
+    payload = json.dumps({"args": args, "cwd": os.getcwd()}).encode("utf-8")
+    request = urllib.request.Request(f"{url.rstrip('/')}/_az", data=payload, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request) as response:
+            result = json.loads(response.read().decode("utf-8"))
+    except (urllib.error.URLError, OSError) as exc:
+        print(f"ERROR: simulator at {url} is unreachable: {exc}", file=sys.stderr)
+        return 1
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    return int(result.get("code", 1))
+
+
+def write_az_shim(directory: Path, server_url: str) -> str:
+    """Write an executable `az` that runs this module against server_url; returns its path for `az_path`."""
+    directory.mkdir(parents=True, exist_ok=True)
+    if os.name == "nt":
+        path = directory / "az.cmd"
+        path.write_text(
+            f'@set "{URL_ENV}={server_url}"\r\n@"{sys.executable}" "{SCRIPT}" %*\r\n',
+            encoding="utf-8",
+        )
+    else:
+        path = directory / "az"
+        path.write_text(
+            f'#!/bin/sh\n{URL_ENV}="{server_url}" exec "{sys.executable}" "{SCRIPT}" "$@"\n',
+            encoding="utf-8",
+        )
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return str(path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Optional
+
+# z-score of the 99th percentile of a standard normal, used to fit lognormal latencies from (median, p99).
+Z_P99 = 2.326
+
+
+@dataclass(frozen=True)
+class Latency:
+    """Lognormal latency described by its median and 99th percentile, in milliseconds."""
+
+    median_ms: float = 50.0
+    p99_ms: float = 200.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / Z_P99
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000.0
+
+
+@dataclass(frozen=True)
+class Faults:
+    """Per-request probabilities of an injected 429, 5xx or hang."""
+
+    throttle: float = 0.0
+    server_error: float = 0.0
+    timeout: float = 0.0
+
+    def pick(self, rng: random.Random) -> Optional[str]:
+        roll = rng.random()
+        for name, probability in (("throttle", self.throttle), ("server_error", self.server_error), ("timeout", self.timeout)):
+            if roll < probability:
+                return name
+            roll -= probability
+        return None
+
+
+@dataclass(frozen=True)
+class SimProfile:
+    arm_read: Latency = Latency(80, 400)
+    arm_write: Latency = Latency(900, 4000)
+    # Server-side zip deploy (extract + sync), on top of the upload itself.
+    deploy: Latency = Latency(6000, 25000)
+    upload_mbps: float = 40.0
+    # KuduSync copies files into wwwroot on shared storage; zip deploys add len(files) / this rate.
+    sync_files_per_sec: float = 150.0
+    kudu: Latency = Latency(40, 250)
+    site: Latency = Latency(15, 120)
+    # First requests after a restart pay the cold start (pm2 boot, empty file cache).
+    cold_start: Latency = Latency(2500, 9000)
+    cold_requests: int = 3
+    # Run-from-package: storing the zip and remounting wwwroot replaces extraction, and the first
+    # requests read from the mounted zip instead of thousands of files on shared storage.
+    package_mount: Latency = Latency(1500, 6000)
+    package_cold_start: Latency = Latency(1500, 6000)
+    arm_faults: Faults = field(default_factory=Faults)
+    kudu_faults: Faults = field(default_factory=Faults)
+    site_faults: Faults = field(default_factory=Faults)
+    reads_per_hour: int = 12000
+    writes_per_hour: int = 1200
+    read_burst: int = 250
+    write_burst: int = 50
+    hang_sec: float = 60.0
+    retry_after_sec: int = 5
+    # Multiplies every latency, hang and the length of the rate-limit window, so scenarios can run faster than real time.
+    time_scale: float = 1.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SimProfile":
+        """Build a profile from YAML/JSON; latencies are [median_ms, p99_ms] or {median_ms, p99_ms}."""
+        values: dict[str, Any] = {}
+        for f in fields(cls):
+            if f.name not in data:
+                continue
+            raw = data[f.name]
+            default = getattr(cls(), f.name)
+            if isinstance(default, Latency):
+                values[f.name] = Latency(*raw) if isinstance(raw, (list, tuple)) else Latency(**raw)
+            elif isinstance(default, Faults):
+                values[f.name] = Faults(**raw)
+            else:
+                values[f.name] = raw
+        unknown = sorted(set(data) - {f.name for f in fields(cls)})
+        if unknown:
+            raise ValueError(f"Unknown simulator profile field(s): {', '.join(unknown)}")
+        return cls(**values)
+
+    def with_faults(self, faults: Faults) -> "SimProfile":
+        return replace(self, arm_faults=faults, kudu_faults=faults, site_faults=faults)
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import threading
+import uuid
+import xml.etree.ElementTree as ET
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qsl, quote, unquote, urlsplit
+from xml.sax.saxutils import escape
+
+from cloud.aws.sigv4 import AwsCredentials
+
+S3_XMLNS = "http://s3.amazonaws.com/doc/2006-03-01/"
+MAX_DELETE_KEYS = 1000
+
+
+@dataclass
+class StoredObject:
+    data: bytes
+    etag: str
+    content_type: str = "application/octet-stream"
+    cache_control: str = ""
+
+
+@dataclass
+class S3Bucket:
+    objects: dict[str, StoredObject] = field(default_factory=dict)
+    website: Optional[dict[str, str]] = None
+
+
+@dataclass
+class S3SimState:
+    credentials: AwsCredentials
+    region: str
+    page_size: int
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    buckets: dict[str, S3Bucket] = field(default_factory=dict)
+    # upload id -> (bucket, key, headers from CreateMultipartUpload, part number -> bytes)
+    uploads: dict[str, tuple[str, str, dict[str, str], dict[int, bytes]]] = field(default_factory=dict)
+    counters: Counter = field(default_factory=Counter)
+
+    def check_signature(self, method: str, raw_path: str, headers: dict[str, str], body: bytes) -> Optional[str]:
+        """Recompute the SigV4 signature from the request as received; returns an error code or None."""
+        lookup = {k.lower(): v for k, v in headers.items()}
+        auth = lookup.get("authorization", "")
+        if not auth.startswith("AWS4-HMAC-SHA256 "):
+            return "AccessDenied"
+        parts = dict(item.strip().split("=", 1) for item in auth[len("AWS4-HMAC-SHA256 ") :].split(","))
+        access_key, date, region, service, _ = parts.get("Credential", "////").split("/", 4)
+        if access_key != self.credentials.access_key:
+            return "InvalidAccessKeyId"
+        payload_hash = lookup.get("x-amz-content-sha256", "")
+        if payload_hash != hashlib.sha256(body).hexdigest():
+            return "XAmzContentSHA256Mismatch"
+        url_path, _, query = raw_path.partition("?")
+        pairs = sorted(parse_qsl(query, keep_blank_values=True))
+        canonical_query = "&".join(f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in pairs)
+        names = parts.get("SignedHeaders", "").split(";")
+        canonical_headers = "".join(f"{name}:{' '.join(lookup.get(name, '').split())}\n" for name in names)
+        canonical_request = "\n".join([method, url_path or "/", canonical_query, canonical_headers, ";".join(names), payload_hash])
+        amz_date = lookup.get("x-amz-date", "")
+        scope = f"{date}/{region}/{service}/aws4_request"
+        string_to_sign = "\n".join(
+            ["AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()]
+        )
+        key = ("AWS4" + self.credentials.secret_key).encode("utf-8")
+        for part in (date, region, service, "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        expected = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(parts.get("Signature", ""), expected):
+            return "SignatureDoesNotMatch"
+        return None
+
+
+def _children(node: ET.Element, name: str) -> list[ET.Element]:
+    return node.findall(f"{{{S3_XMLNS}}}{name}") or node.findall(name)
+
+
+def _text(node: ET.Element, name: str) -> str:
+    found = _children(node, name)
+    return (found[0].text or "") if found else ""
+
+
+class S3SimHandler(BaseHTTPRequestHandler):
+    """Path-style S3 endpoints (/<bucket>/<key>) covering what the website sync uses."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "S3Sim/1.0"
+    state: S3SimState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _xml(self, status: int, root: str, inner: str) -> None:
+        body = f'<?xml version="1.0" encoding="UTF-8"?><{root} xmlns="{S3_XMLNS}">{inner}</{root}>'.encode("utf-8")
+        self._send(status, body, {"Content-Type": "application/xml"})
+
+    def _error(self, status: int, code: str) -> None:
+        body = f'<?xml version="1.0" encoding="UTF-8"?><Error><Code>{code}</Code></Error>'.encode("utf-8")
+        self._send(status, body, {"Content-Type": "application/xml"})
+
+    def _route(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        state = self.state
+        failure = state.check_signature(self.command, self.path, dict(self.headers.items()), data)
+        if failure:
+            self._error(403, failure)
+            return
+        md5 = self.headers.get("Content-MD5")
+        if md5 and md5 != base64.b64encode(hashlib.md5(data).digest()).decode("ascii"):
+            self._error(400, "BadDigest")
+            return
+        parsed = urlsplit(self.path)
+        bucket_name, _, key = parsed.path.lstrip("/").partition("/")
+        key = unquote(key)
+        query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+        operation = next((name for name in ("website", "uploads", "uploadId", "delete", "list-type") if name in query), "object")
+        with state.lock:
+            state.counters[f"{self.command} {operation}"] += 1
+            bucket = state.buckets.get(bucket_name)
+        if not key:
+            self._bucket(bucket_name, bucket, query, data)
+        elif bucket is None:
+            self._error(404, "NoSuchBucket")
+        elif "uploads" in query and self.command == "POST":
+            upload_id = uuid.uuid4().hex
+            headers = {name: self.headers.get(name, "") for name in ("Content-Type", "Cache-Control")}
+            with state.lock:
+                state.uploads[upload_id] = (bucket_name, key, headers, {})
+            self._xml(200, "InitiateMultipartUploadResult", f"<Bucket>{bucket_name}</Bucket><Key>{escape(key)}</Key><UploadId>{upload_id}</UploadId>")
+        elif "uploadId" in query:
+            self._multipart(bucket, key, query, data)
+        elif self.command == "PUT":
+            stored = StoredObject(
+                data,
+                hashlib.md5(data).hexdigest(),
+                self.headers.get("Content-Type") or "application/octet-stream",
+                self.headers.get("Cache-Control") or "",
+            )
+            with state.lock:
+                bucket.objects[key] = stored
+            self._send(200, headers={"ETag": f'"{stored.etag}"'})
+        elif self.command in ("GET", "HEAD"):
+            with state.lock:
+                stored = bucket.objects.get(key)
+            if stored is None:
+                self._error(404, "NoSuchKey")
+            else:
+                headers = {"ETag": f'"{stored.etag}"', "Content-Type": stored.content_type}
+                if stored.cache_control:
+                    headers["Cache-Control"] = stored.cache_control
+                self._send(200, stored.data, headers)
+        elif self.command == "DELETE":
+            with state.lock:
+                bucket.objects.pop(key, None)
+            self._send(204)
+        else:
+            self._error(405, "MethodNotAllowed")
+
+    def _bucket(self, name: str, bucket: Optional[S3Bucket], query: dict[str, str], data: bytes) -> None:
+        state = self.state
+        if self.command == "HEAD":
+            self._send(200 if bucket else 404)
+            return
+        if self.command == "PUT" and "website" not in query:
+            with state.lock:
+                exists = name in state.buckets
+                state.buckets.setdefault(name, S3Bucket())
+            self._error(409, "BucketAlreadyOwnedByYou") if exists else self._send(200)
+            return
+        if bucket is None:
+            self._error(404, "NoSuchBucket")
+        elif "website" in query and self.command == "PUT":
+            root = ET.fromstring(data)
+            index = _children(root, "IndexDocument")
+            error = _children(root, "ErrorDocument")
+            with state.lock:
+                bucket.website = {
+                    "index": _text(index[0], "Suffix") if index else "",
+                    "error": _text(error[0], "Key") if error else "",
+                }
+            self._send(200)
+        elif "website" in query and self.command == "GET":
+            with state.lock:
+                website = dict(bucket.website) if bucket.website else None
+            if website is None:
+                self._error(404, "NoSuchWebsiteConfiguration")
+            else:
+                inner = f"<IndexDocument><Suffix>{website['index']}</Suffix></IndexDocument>"
+                if website["error"]:
+                    inner += f"<ErrorDocument><Key>{website['error']}</Key></ErrorDocument>"
+                self._xml(200, "WebsiteConfiguration", inner)
+        elif "delete" in query and self.command == "POST":
+            self._delete_objects(bucket, data)
+        elif query.get("list-type") == "2" and self.command == "GET":
+            self._list(name, bucket, query)
+        else:
+            self._error(400, "InvalidRequest")
+
+    def _list(self, name: str, bucket: S3Bucket, query: dict[str, str]) -> None:
+        with self.state.lock:
+            items = sorted(bucket.objects.items())
+        limit = min(int(query.get("max-keys") or 1000), self.state.page_size)
+        token = query.get("continuation-token", "")
+        start = int(token) if token else 0
+        page = items[start : start + limit]
+        truncated = start + limit < len(items)
+        contents = "".join(
+            f"<Contents><Key>{escape(key)}</Key><Size>{len(stored.data)}</Size><ETag>&quot;{stored.etag}&quot;</ETag></Contents>"
+            for key, stored in page
+        )
+        inner = f"<Name>{name}</Name><KeyCount>{len(page)}</KeyCount><IsTruncated>{str(truncated).lower()}</IsTruncated>{contents}"
+        if truncated:
+            inner += f"<NextContinuationToken>{start + limit}</NextContinuationToken>"
+        self._xml(200, "ListBucketResult", inner)
+
+    def _multipart(self, bucket: S3Bucket, key: str, query: dict[str, str], data: bytes) -> None:
+        state = self.state
+        upload_id = query["uploadId"]
+        with state.lock:
+            upload = state.uploads.get(upload_id)
+        if upload is None or upload[1] != key:
+            self._error(404, "NoSuchUpload")
+            return
+        _, _, headers, parts = upload
+        if self.command == "PUT":
+            number = int(query.get("partNumber") or 0)
+            with state.lock:
+                parts[number] = data
+            self._send(200, headers={"ETag": f'"{hashlib.md5(data).hexdigest()}"'})
+        elif self.command == "DELETE":
+            with state.lock:
+                state.uploads.pop(upload_id, None)
+            self._send(204)
+        elif self.command == "POST":
+            listed = [(int(_text(part, "PartNumber")), _text(part, "ETag").strip('"')) for part in _children(ET.fromstring(data), "Part")]
+            with state.lock:
+                if any(number not in parts or hashlib.md5(parts[number]).hexdigest() != etag for number, etag in listed):
+                    invalid = True
+                else:
+                    invalid = False
+                    content = b"".join(parts[number] for number, _ in listed)
+                    digest = hashlib.md5(b"".join(hashlib.md5(parts[number]).digest() for number, _ in listed)).hexdigest()
+                    etag = f"{digest}-{len(listed)}"
+                    bucket.objects[key] = StoredObject(
+                        content, etag, headers.get("Content-Type") or "application/octet-stream", headers.get("Cache-Control") or ""
+                    )
+                    state.uploads.pop(upload_id, None)
+            if invalid:
+                self._error(400, "InvalidPart")
+            else:
+                self._xml(200, "CompleteMultipartUploadResult", f"<Key>{escape(key)}</Key><ETag>&quot;{etag}&quot;</ETag>")
+        else:
+            self._error(405, "MethodNotAllowed")
+
+    def _delete_objects(self, bucket: S3Bucket, data: bytes) -> None:
+        if not self.headers.get("Content-MD5"):
+            self._error(400, "InvalidRequest")
+            return
+        root = ET.fromstring(data)
+        keys = [_text(item, "Key") for item in _children(root, "Object")]
+        if len(keys) > MAX_DELETE_KEYS:
+            self._error(400, "MalformedXML")
+            return
+        with self.state.lock:
+            for key in keys:
+                bucket.objects.pop(key, None)
+        quiet = _text(root, "Quiet").lower() == "true"
+        self._xml(200, "DeleteResult", "" if quiet else "".join(f"<Deleted><Key>{escape(k)}</Key></Deleted>" for k in keys))
+
+    def do_GET(self) -> None:
+        self._route()
+
+    do_HEAD = do_GET
+    do_PUT = do_GET
+    do_POST = do_GET
+    do_DELETE = do_GET
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class S3SimServer:
+    """In-memory S3-compatible stand-in that verifies SigV4 signatures, payload hashes and Content-MD5 on every call."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        credentials: Optional[AwsCredentials] = None,
+        region: str = "us-east-1",
+        page_size: int = 1000,
+    ) -> None:
+        self.credentials = credentials or AwsCredentials("AKIDSIMULATOR", "simulator-secret")
+        self.state = S3SimState(self.credentials, region, page_size)
+        handler = type("BoundS3SimHandler", (S3SimHandler,), {"state": self.state})
+        self._server = _Server((host, port), handler)
+        self.host, self.port = self._server.server_address[:2]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Value for s3_endpoint."""
+        return f"http://{self.host}:{self.port}"
+
+    def objects(self, bucket: str) -> dict[str, StoredObject]:
+        with self.state.lock:
+            found = self.state.buckets.get(bucket)
+            return dict(found.objects) if found else {}
+
+    def website(self, bucket: str) -> Optional[dict[str, str]]:
+        with self.state.lock:
+            found = self.state.buckets.get(bucket)
+            return dict(found.website) if found and found.website else None
+
+    def stats(self) -> dict[str, int]:
+        with self.state.lock:
+            return dict(self.state.counters)
+
+    def start(self) -> "S3SimServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="s3-sim", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "S3SimServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
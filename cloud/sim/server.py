@@ -0,0 +1,775 @@
+from __future__ import annotations
+
+import base64
+import calendar
+import io
+import json
+import os
+import random
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+from urllib.request import urlopen
+
+from cloud.azure.cli import arm_kind
+from cloud.azure.integrity import DIRECTORY_MIME
+from cloud.core.content import content_type
+from cloud.sim.profile import Faults, Latency, SimProfile
+
+SCM_SUFFIX = ".scm.sim"
+SITE_SUFFIX = ".web.sim"
+# Options that take several values, e.g. --settings A=1 B=2.
+MULTI_VALUE = {"--settings", "--setting-names", "--content-paths", "--set", "--ids"}
+SHORT_OPTIONS = {"-g": "--resource-group", "-n": "--name", "-o": "--output", "-l": "--location", "-p": "--plan"}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+class AzError(Exception):
+    def __init__(self, code: str, message: str, exit_code: int = 1, status: int = 400) -> None:
+        super().__init__(message)
+        self.code = code
+        self.exit_code = exit_code
+        self.status = status
+
+
+def parse_args(args: list[str]) -> tuple[list[str], dict[str, list[str]]]:
+    verbs: list[str] = []
+    options: dict[str, list[str]] = {}
+    current: Optional[str] = None
+    for arg in args:
+        if arg.startswith("-") and not arg.lstrip("-").isdigit():
+            current = SHORT_OPTIONS.get(arg, arg)
+            options.setdefault(current, [])
+        elif current is None:
+            verbs.append(arg)
+        else:
+            options[current].append(arg)
+            if current not in MULTI_VALUE:
+                current = None
+    return verbs, options
+
+
+def apply_query(value: Any, query: str) -> Any:
+    """The subset of JMESPath the deploy code uses: dotted fields and [n] indexes."""
+    for part in query.replace("[", ".[").split("."):
+        if not part:
+            continue
+        if part.startswith("["):
+            index = int(part.strip("[]"))
+            value = value[index] if isinstance(value, list) and -len(value) <= index < len(value) else None
+        else:
+            value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def format_output(value: Any, output: str) -> str:
+    if output == "tsv":
+        if value is None:
+            return ""
+        if isinstance(value, list):
+            return "".join(f"{item}\n" for item in value)
+        if isinstance(value, bool):
+            return "true\n" if value else "false\n"
+        return f"{value}\n"
+    return json.dumps(value, indent=2) + "\n"
+
+
+class _Window:
+    """ARM-style hourly request budget; the window shrinks with time_scale."""
+
+    def __init__(self, per_hour: int, window_sec: float) -> None:
+        self.per_hour = per_hour
+        self.window_sec = window_sec
+        self.started = time.monotonic()
+        self.used = 0
+
+    def take(self) -> tuple[bool, int]:
+        now = time.monotonic()
+        if now - self.started >= self.window_sec:
+            self.started, self.used = now, 0
+        if self.used >= self.per_hour:
+            return False, 0
+        self.used += 1
+        return True, self.per_hour - self.used
+
+    def retry_after(self) -> float:
+        return max(0.0, self.window_sec - (time.monotonic() - self.started))
+
+
+@dataclass
+class SimApp:
+    name: str
+    resource_group: str
+    plan: str
+    runtime: str
+    password: str = field(default_factory=lambda: uuid.uuid4().hex)
+    settings: dict[str, str] = field(default_factory=dict)
+    site_config: dict[str, Any] = field(default_factory=dict)
+    files: dict[str, tuple[bytes, float]] = field(default_factory=dict)
+    deployments: list[dict] = field(default_factory=list)
+    cold_left: int = 0
+    # Name of the mounted zip under /home/data/SitePackages when running from package.
+    package: Optional[str] = None
+    packages: dict[str, int] = field(default_factory=dict)
+    # Zips uploaded to SitePackages through the VFS API, and the one packagename.txt names for the next mount.
+    package_data: dict[str, bytes] = field(default_factory=dict)
+    package_next: Optional[str] = None
+    syncing: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+def _extract(archive: zipfile.ZipFile) -> dict[str, tuple[bytes, float]]:
+    # Like Kudu on a UTC host, extracted files keep the zip entry times.
+    return {info.filename: (archive.read(info), calendar.timegm(info.date_time)) for info in archive.infolist() if not info.is_dir()}
+
+
+class SimState:
+    """In-memory ARM, Kudu and site state for every simulated target."""
+
+    def __init__(self, profile: SimProfile) -> None:
+        self.profile = profile
+        self.rng = random.Random(profile.seed)
+        self.lock = threading.Lock()
+        self.subscription_id = f"sim-{uuid.uuid4().hex[:12]}"
+        self.groups: dict[str, str] = {}
+        self.plans: dict[tuple[str, str], dict] = {}
+        self.apps: dict[str, SimApp] = {}
+        self.counters: Counter[str] = Counter()
+        window = 3600 * profile.time_scale
+        self.windows = {"read": _Window(profile.reads_per_hour, window), "write": _Window(profile.writes_per_hour, window)}
+        self.host = ""
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def sample(self, latency: Latency) -> float:
+        with self.lock:
+            return latency.sample(self.rng) * self.profile.time_scale
+
+    def fault(self, faults: Faults) -> Optional[str]:
+        with self.lock:
+            return faults.pick(self.rng)
+
+    def sleep(self, latency: Latency) -> None:
+        delay = self.sample(latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    def hang(self) -> None:
+        time.sleep(self.profile.hang_sec * self.profile.time_scale)
+
+    def hostnames(self, app: str) -> tuple[str, str]:
+        return f"{self.host}/{app}{SITE_SUFFIX}", f"{self.host}/{app}{SCM_SUFFIX}"
+
+    # --- az -----------------------------------------------------------------------------------------------
+
+    def run_az(self, args: list[str], cwd: str) -> tuple[int, str, str]:
+        debug = "--debug" in args
+        args = [a for a in args if a != "--debug"]
+        verbs, options = parse_args(args)
+        kind = arm_kind(args)
+        self.count(f"az.{kind or 'local'}")
+        log: list[str] = [f"DEBUG: cli.knack.cli: Command arguments: {shlex.join(args)}"] if debug else []
+        if kind:
+            with self.lock:
+                allowed, remaining = self.windows[kind].take()
+                retry_after = self.windows[kind].retry_after()
+            fault = None if not allowed else self.fault(self.profile.arm_faults)
+            if not allowed or fault == "throttle":
+                self.count("az.throttled" if not allowed else "az.fault.throttle")
+                wait = retry_after if not allowed else self.profile.retry_after_sec * self.profile.time_scale
+                return self._az_error(
+                    log,
+                    429,
+                    "TooManyRequests",
+                    "The request is being throttled as the limit has been reached for operation type.",
+                    retry_after=max(1, int(wait + 0.999)),
+                )
+            if fault == "server_error":
+                self.count("az.fault.server_error")
+                self.sleep(self.profile.arm_read if kind == "read" else self.profile.arm_write)
+                return self._az_error(log, 503, "ServiceUnavailable", "The service is temporarily unavailable.")
+            if fault == "timeout":
+                self.count("az.fault.timeout")
+                self.hang()
+                return self._az_error(log, 504, "GatewayTimeout", "The gateway did not receive a response in time.")
+            self.sleep(self.profile.arm_read if kind == "read" else self.profile.arm_write)
+            header = "reads" if kind == "read" else "writes"
+            # Reported in real-time units so the client limiter paces to the scaled window.
+            reported = int(remaining / self.profile.time_scale) if self.profile.time_scale > 0 else remaining
+            log.append("DEBUG: cli.azure.cli.core.sdk.policies: Response status: 200")
+            log.append(f"DEBUG: cli.azure.cli.core.sdk.policies:     'x-ms-ratelimit-remaining-subscription-{header}': '{reported}'")
+        try:
+            value = self._dispatch(verbs, options, cwd)
+        except AzError as exc:
+            return self._az_error(log, exc.status, exc.code, str(exc), exit_code=exc.exit_code)
+        stdout = ""
+        if value is not None:
+            query = (options.get("--query") or [None])[0]
+            if query:
+                value = apply_query(value, query)
+            stdout = format_output(value, (options.get("--output") or ["json"])[0])
+        return 0, stdout, "".join(f"{line}\n" for line in log)
+
+    def _az_error(
+        self, log: list[str], status: int, code: str, message: str, *, retry_after: Optional[int] = None, exit_code: int = 1
+    ) -> tuple[int, str, str]:
+        lines = list(log)
+        if log:
+            lines.append(f"DEBUG: cli.azure.cli.core.sdk.policies: Response status: {status}")
+            if retry_after is not None:
+                lines.append(f"DEBUG: cli.azure.cli.core.sdk.policies:     'Retry-After': '{retry_after}'")
+        lines.append(f"ERROR: ({code}) {message}")
+        lines.append(f"Code: {code}")
+        return exit_code, "", "".join(f"{line}\n" for line in lines)
+
+    def _app(self, options: dict[str, list[str]]) -> SimApp:
+        name = (options.get("--name") or [""])[0]
+        with self.lock:
+            app = self.apps.get(name)
+        if not app:
+            raise AzError("ResourceNotFound", f"The Resource 'Microsoft.Web/sites/{name}' was not found.", 3, 404)
+        return app
+
+    def _site_json(self, app: SimApp) -> dict:
+        site, scm = self.hostnames(app.name)
+        return {
+            "id": f"/subscriptions/{self.subscription_id}/resourceGroups/{app.resource_group}/providers/Microsoft.Web/sites/{app.name}",
+            "name": app.name,
+            "resourceGroup": app.resource_group,
+            "type": "Microsoft.Web/sites",
+            "state": "Running",
+            "defaultHostName": site,
+            "hostNames": [site],
+            "enabledHostNames": [site, scm],
+            "serverFarmId": app.plan,
+            "siteConfig": dict(app.site_config),
+        }
+
+    def _dispatch(self, verbs: list[str], options: dict[str, list[str]], cwd: str) -> Any:
+        command = " ".join(verbs)
+        first = lambda name, default="": (options.get(name) or [default])[0]  # noqa: E731
+        if command == "account show":
+            return {"id": self.subscription_id, "name": "Simulated subscription", "state": "Enabled", "isDefault": True}
+        if command == "group exists":
+            with self.lock:
+                return first("--name") in self.groups
+        if command in ("group create", "group show"):
+            name = first("--name")
+            with self.lock:
+                if command == "group create":
+                    self.groups.setdefault(name, first("--location", "centralus"))
+                elif name not in self.groups:
+                    raise AzError("ResourceGroupNotFound", f"Resource group '{name}' could not be found.", 3, 404)
+                location = self.groups[name]
+            return {"id": f"/subscriptions/{self.subscription_id}/resourceGroups/{name}", "name": name, "location": location}
+        if command == "graph query":
+            return self._graph_query(first("-q"), int(first("--first", "100")), int(first("--skip-token", "0")))
+        if command in ("appservice plan show", "appservice plan create", "appservice plan update"):
+            key = (first("--resource-group"), first("--name"))
+            with self.lock:
+                if command == "appservice plan create":
+                    self.plans.setdefault(key, {"name": key[1], "resourceGroup": key[0], "sku": {"name": first("--sku", "B1")}})
+                elif command == "appservice plan update" and key in self.plans and "--sku" in options:
+                    self.plans[key]["sku"] = {"name": first("--sku")}
+                plan = self.plans.get(key)
+            if not plan:
+                raise AzError("ResourceNotFound", f"The Resource 'Microsoft.Web/serverFarms/{key[1]}' was not found.", 3, 404)
+            return plan
+        if command == "webapp create":
+            name = first("--name")
+            with self.lock:
+                app = self.apps.get(name)
+                if not app:
+                    runtime = first("--runtime")
+                    app = self.apps[name] = SimApp(name, first("--resource-group"), first("--plan"), runtime)
+                    if ":" in runtime:
+                        app.site_config["linuxFxVersion"] = runtime.replace(":", "|")
+            return self._site_json(app)
+        if command == "webapp show":
+            return self._site_json(self._app(options))
+        if command.startswith("webapp config appsettings"):
+            app = self._app(options)
+            mounting = False
+            with app.lock:
+                if command.endswith(" set"):
+                    was_on = app.settings.get("WEBSITE_RUN_FROM_PACKAGE") == "1"
+                    for pair in options.get("--settings", []):
+                        key, _, value = pair.partition("=")
+                        app.settings[key] = value
+                    mounting = not was_on and app.settings.get("WEBSITE_RUN_FROM_PACKAGE") == "1"
+                elif command.endswith(" delete"):
+                    for key in options.get("--setting-names", []):
+                        app.settings.pop(key, None)
+                listing = [{"name": k, "value": v, "slotSetting": False} for k, v in sorted(app.settings.items())]
+            if mounting:
+                # The setting change restarts the app, which then mounts the package.
+                self.sleep(self.profile.package_mount)
+                with app.lock:
+                    self._mount(app)
+            return listing
+        if command == "webapp config set":
+            app = self._app(options)
+            with app.lock:
+                if "--startup-file" in options:
+                    app.site_config["appCommandLine"] = first("--startup-file")
+                if "--linux-fx-version" in options:
+                    app.site_config["linuxFxVersion"] = first("--linux-fx-version")
+                return dict(app.site_config)
+        if command == "webapp update":
+            app = self._app(options)
+            with app.lock:
+                for pair in options.get("--set", []):
+                    key, _, value = pair.partition("=")
+                    app.site_config[key.removeprefix("siteConfig.")] = value
+            return self._site_json(app)
+        if command == "webapp restart":
+            app = self._app(options)
+            with app.lock:
+                app.cold_left = self.profile.cold_requests
+            return None
+        if command == "webapp deployment list-publishing-credentials":
+            app = self._app(options)
+            return {"name": app.name, "publishingUserName": f"${app.name}", "publishingPassword": app.password}
+        if command == "webapp deploy":
+            return self._deploy(self._app(options), os.path.join(cwd, first("--src-path")), first("--clean") == "true")
+        if command in ("afd endpoint purge", "cdn endpoint purge"):
+            self.count("purge.paths", len(options.get("--content-paths", [])))
+            return None
+        raise AzError("CommandNotFound", f"'{command}' is not supported by the simulator.", 2)
+
+    def _graph_query(self, kql: str, first: int, skip: int) -> dict:
+        """Answers the deploy tool's Resource Graph query; only the resource group filter is interpreted."""
+        match = re.search(r"name in~ \(([^)]*)\)", kql)
+        wanted = {name.lower() for name in re.findall(r"'((?:[^'\\]|\\.)*)'", match.group(1))} if match else set()
+        prefix = f"/subscriptions/{self.subscription_id}/resourceGroups"
+
+        def row(path: str, kind: str, name: str, rg: str, sku: str = "", runtime: str = "") -> dict:
+            return {
+                "id": f"{prefix}/{path}",
+                "type": kind,
+                "name": name,
+                "resourceGroup": rg,
+                "location": self.groups.get(rg, ""),
+                "sku": sku,
+                "runtime": runtime,
+            }
+
+        rows = []
+        with self.lock:
+            for name in self.groups:
+                if name.lower() in wanted:
+                    rows.append(row(name, "microsoft.resources/subscriptions/resourcegroups", name, name))
+            for (rg, name), plan in self.plans.items():
+                if rg.lower() in wanted:
+                    rows.append(row(f"{rg}/providers/Microsoft.Web/serverFarms/{name}", "microsoft.web/serverfarms", name, rg, plan["sku"]["name"]))
+            for app in self.apps.values():
+                if app.resource_group.lower() in wanted:
+                    path = f"{app.resource_group}/providers/Microsoft.Web/sites/{app.name}"
+                    rows.append(row(path, "microsoft.web/sites", app.name, app.resource_group, runtime=app.site_config.get("linuxFxVersion", "")))
+        rows.sort(key=lambda row: row["id"].lower())
+        page = rows[skip : skip + first]
+        more = skip + first < len(rows)
+        self.count("graph.pages")
+        return {"count": len(page), "data": page, "skip_token": str(skip + first) if more else None, "total_records": len(rows)}
+
+    def _deploy(self, app: SimApp, zip_path: str, clean: bool) -> dict:
+        try:
+            size = os.path.getsize(zip_path)
+        except OSError:
+            raise AzError("FileNotFound", f"Could not find {zip_path}", 1, 400)
+        # Upload time is modelled here because the fake CLI hands over a path instead of streaming bytes.
+        time.sleep(size / (self.profile.upload_mbps * 125_000) * self.profile.time_scale)
+        deployment = {"id": uuid.uuid4().hex, "status": 1, "status_text": "Building", "received_time": _now_iso(), "log": []}
+        with app.lock:
+            app.deployments.append(deployment)
+        server_time = self.sample(self.profile.deploy)
+
+        def log(message: str) -> None:
+            with app.lock:
+                deployment["log"].append({"id": uuid.uuid4().hex, "log_time": _now_iso(), "message": message})
+
+        log("Received zip package")
+        with zipfile.ZipFile(zip_path) as archive:
+            files = _extract(archive)
+        with app.lock:
+            run_from_package = app.settings.get("WEBSITE_RUN_FROM_PACKAGE") == "1"
+        if run_from_package:
+            mount_time = self.sample(self.profile.package_mount)
+            log("Run from package: storing zip in /home/data/SitePackages")
+            time.sleep(mount_time * 0.6)
+            name = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f") + ".zip"
+            with app.lock:
+                # The new tree appears all at once when the zip is mounted, after a restart.
+                app.packages[name] = size
+                app.package = app.package_next = name
+                app.files = files
+                app.cold_left = self.profile.cold_requests
+            log("Updated packagename.txt; restarting the site to mount the new package")
+            time.sleep(mount_time * 0.4)
+        else:
+            time.sleep(server_time * 0.1)
+            log("Extracting zip package")
+            time.sleep(server_time * 0.6)
+            log("Syncing files to wwwroot (clean)" if clean else "Syncing files to wwwroot")
+            sync_time = server_time * 0.3 + len(files) / max(self.profile.sync_files_per_sec, 1e-6) * self.profile.time_scale
+            self._sync(app, files, clean, sync_time)
+        log("Deployment successful.")
+        with app.lock:
+            deployment.update(status=4, status_text="Success", end_time=_now_iso(), complete=True)
+        self.count("deploys")
+        return {"id": deployment["id"], "status": 4, "complete": True}
+
+    def _mount(self, app: SimApp) -> None:
+        """Turning WEBSITE_RUN_FROM_PACKAGE on restarts the app and mounts the zip packagename.txt names; with no
+        package uploaded yet, wwwroot comes up empty. Called with app.lock held."""
+        data = app.package_data.get(app.package_next or "")
+        files: dict[str, tuple[bytes, float]] = {}
+        if data is not None:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                files = _extract(archive)
+        else:
+            self.count("package.empty_mount")
+        app.package = app.package_next if data is not None else ""
+        app.files = files
+        app.cold_left = self.profile.cold_requests
+
+    def _sync(self, app: SimApp, files: dict[str, tuple[bytes, float]], clean: bool, duration: float) -> None:
+        """Copies files into wwwroot in batches, like KuduSync, so the site serves a mixed tree meanwhile."""
+        items = sorted(files.items())
+        batches = max(1, min(10, len(items)))
+        started = time.monotonic()
+        with app.lock:
+            app.package = None
+            app.syncing = True
+        for index in range(batches):
+            with app.lock:
+                app.files.update(items[index * len(items) // batches : (index + 1) * len(items) // batches])
+            time.sleep(duration / batches)
+        with app.lock:
+            if clean:
+                app.files = {path: entry for path, entry in app.files.items() if path in files}
+            app.syncing = False
+        self.count("sync.mixed_ms", int((time.monotonic() - started) * 1000))
+
+    # --- Kudu ---------------------------------------------------------------------------------------------
+
+    def vfs_listing(self, app: SimApp, rel_dir: str) -> list[dict]:
+        prefix = rel_dir.strip("/") + "/" if rel_dir.strip("/") else ""
+        entries: dict[str, dict] = {}
+        with app.lock:
+            items = list(app.files.items())
+        for path, (data, mtime) in items:
+            if not path.startswith(prefix):
+                continue
+            rest = path[len(prefix):]
+            name, sep, _ = rest.partition("/")
+            stamp = datetime.fromtimestamp(mtime, timezone.utc).isoformat()
+            if sep:
+                entries.setdefault(name, {"name": name, "size": 0, "mtime": stamp, "mime": DIRECTORY_MIME})
+            else:
+                entries[name] = {"name": name, "size": len(data), "mtime": stamp, "mime": content_type(name)}
+        return sorted(entries.values(), key=lambda e: e["name"])
+
+
+class SimHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "DeploySim/1.0"
+    state: SimState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def _send(self, status: int, body: bytes = b"", content: str = "application/json", headers: Optional[dict] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, status: int, value: Any) -> None:
+        self._send(status, json.dumps(value).encode("utf-8"))
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _route(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/_az" and self.command == "POST":
+            request = json.loads(self._body() or b"{}")
+            code, stdout, stderr = self.state.run_az(list(request.get("args", [])), request.get("cwd") or os.getcwd())
+            self._json(200, {"code": code, "stdout": stdout, "stderr": stderr})
+            return
+        if path == "/_stats":
+            with self.state.lock:
+                self._json(200, dict(self.state.counters))
+            return
+        segment, _, rest = path.lstrip("/").partition("/")
+        if segment.endswith(SCM_SUFFIX):
+            self._kudu(segment[: -len(SCM_SUFFIX)], "/" + rest)
+        elif segment.endswith(SITE_SUFFIX):
+            self._site(segment[: -len(SITE_SUFFIX)], "/" + rest)
+        else:
+            self._json(404, {"error": "unknown host"})
+
+    def _inject(self, prefix: str, faults: Faults, latency: Latency) -> bool:
+        """Apply latency and any injected fault; True when a fault response was already sent."""
+        state = self.state
+        state.count(f"{prefix}.requests")
+        fault = state.fault(faults)
+        if fault:
+            state.count(f"{prefix}.fault.{fault}")
+        if fault == "throttle":
+            self._send(429, b'{"error":"TooManyRequests"}', headers={"Retry-After": str(state.profile.retry_after_sec)})
+            return True
+        if fault == "timeout":
+            state.hang()
+            self._send(504, b'{"error":"GatewayTimeout"}')
+            return True
+        state.sleep(latency)
+        if fault == "server_error":
+            self._send(503, b'{"error":"ServiceUnavailable"}')
+            return True
+        return False
+
+    def _kudu(self, name: str, path: str) -> None:
+        data = b""
+        if self.command in ("PUT", "POST"):
+            data = self._body()
+        app = self.state.apps.get(name)
+        if app is None:
+            self._json(404, {"error": f"site {name} not found"})
+            return
+        expected = base64.b64encode(f"${app.name}:{app.password}".encode("ascii")).decode("ascii")
+        if self.headers.get("Authorization") != f"Basic {expected}":
+            self._send(401, b"", headers={"WWW-Authenticate": 'Basic realm="site"'})
+            return
+        if self._inject("kudu", self.state.profile.kudu_faults, self.state.profile.kudu):
+            return
+        if path == "/api/deployments/latest":
+            with app.lock:
+                latest = {k: v for k, v in app.deployments[-1].items() if k != "log"} if app.deployments else None
+            if latest is None:
+                self._json(404, {"error": "no deployments"})
+            else:
+                self._json(200, latest)
+            return
+        if path.startswith("/api/deployments/") and path.endswith("/log"):
+            deployment_id = path.split("/")[3]
+            with app.lock:
+                found = next((d for d in app.deployments if d["id"] == deployment_id), None)
+                entries = list(found["log"]) if found else None
+            self._json(200 if entries is not None else 404, entries or [])
+            return
+        if path.startswith("/api/vfs/data/SitePackages/"):
+            self._site_packages(app, path, data)
+            return
+        root = "/api/vfs/site/wwwroot/"
+        if not (path + "/").startswith(root):
+            self._json(404, {"error": "not found"})
+            return
+        rel_path = unquote(path[len(root):]) if len(path) > len(root) else ""
+        if self.command in ("GET", "HEAD") and (path.endswith("/") or not rel_path):
+            self._json(200, self.state.vfs_listing(app, rel_path))
+            return
+        with app.lock:
+            if self.command in ("GET", "HEAD"):
+                entry = app.files.get(rel_path)
+                if entry is None:
+                    self._json(404, {"error": "not found"})
+                else:
+                    self._send(200, entry[0], content_type(rel_path))
+                return
+            if self.command in ("PUT", "DELETE") and app.package:
+                self._json(409, {"error": "wwwroot is read-only while running from package"})
+                return
+            if self.command == "PUT":
+                existed = rel_path in app.files
+                app.files[rel_path] = (data, time.time())
+                self._send(204 if existed else 201)
+                return
+            if self.command == "DELETE":
+                self._send(200 if app.files.pop(rel_path, None) is not None else 404)
+                return
+        self._send(405)
+
+    def _site_packages(self, app: SimApp, path: str, data: bytes) -> None:
+        rel_path = unquote(path[len("/api/vfs/data/SitePackages/"):])
+        if self.command == "PUT" and rel_path:
+            with app.lock:
+                if rel_path == "packagename.txt":
+                    app.package_next = data.decode("utf-8").strip()
+                else:
+                    app.package_data[rel_path] = data
+                    app.packages[rel_path] = len(data)
+            self._send(201)
+            return
+        with app.lock:
+            active, packages = app.package_next, dict(app.packages)
+        if self.command not in ("GET", "HEAD"):
+            self._send(405)
+        elif not rel_path:
+            stamp = datetime.now(timezone.utc).isoformat()
+            listing = [{"name": name, "size": size, "mtime": stamp, "mime": "application/zip"} for name, size in sorted(packages.items())]
+            if active:
+                listing.append({"name": "packagename.txt", "size": len(active), "mtime": stamp, "mime": "text/plain"})
+            self._json(200, listing)
+        elif rel_path == "packagename.txt" and active:
+            self._send(200, active.encode("utf-8"), "text/plain")
+        else:
+            self._json(404, {"error": "not found"})
+
+    def _site(self, name: str, path: str) -> None:
+        app = self.state.apps.get(name)
+        if app is None:
+            self._send(404, b"Site not found", "text/plain")
+            return
+        with app.lock:
+            cold = app.cold_left > 0
+            if cold:
+                app.cold_left -= 1
+            mounted, syncing = app.package is not None, app.syncing
+        profile = self.state.profile
+        if syncing:
+            self.state.count("site.during_sync")
+        cold_start = profile.package_cold_start if mounted else profile.cold_start
+        if self._inject("site", profile.site_faults, cold_start if cold else profile.site):
+            return
+        rel_path = unquote(path.lstrip("/")) or "index.html"
+        with app.lock:
+            entry = app.files.get(rel_path) or app.files.get(rel_path.rstrip("/") + "/index.html")
+            if entry is None and "." not in rel_path.rsplit("/", 1)[-1]:
+                # pm2 --spa serves index.html for client-side routes.
+                entry, rel_path = app.files.get("index.html"), "index.html"
+        if entry is None:
+            self._send(404, b"Not found", "text/plain")
+            return
+        self._send(200, entry[0], content_type(rel_path), {"Cache-Control": "no-cache"})
+
+    def do_GET(self) -> None:
+        self._route()
+
+    do_HEAD = do_GET
+    do_POST = do_GET
+    do_PUT = do_GET
+    do_DELETE = do_GET
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Fleet scenarios open hundreds of keep-alive connections at once.
+    request_queue_size = 1024
+
+
+class SimServer:
+    """ARM (via the fake az CLI), Kudu and site endpoints for many simulated targets on one local port."""
+
+    def __init__(self, profile: Optional[SimProfile] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.state = SimState(profile or SimProfile())
+        handler = type("BoundSimHandler", (SimHandler,), {"state": self.state})
+        self._server = _Server((host, port), handler)
+        self.host, self.port = self._server.server_address[:2]
+        self.state.host = f"{self.host}:{self.port}"
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> "SimServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="deploy-sim", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread:
+            self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> dict[str, int]:
+        with self.state.lock:
+            return dict(self.state.counters)
+
+    def __enter__(self) -> "SimServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+
+class SimProcess:
+    """A SimServer in a child process, so load-test client threads and the simulator do not share one interpreter."""
+
+    def __init__(self, profile: Optional[SimProfile] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.profile = profile or SimProfile()
+        self.host = host
+        self.port = port
+        self.url = ""
+        self._proc: Optional[subprocess.Popen] = None
+
+    def start(self) -> "SimProcess":
+        repo_root = str(Path(__file__).resolve().parents[2])
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in (repo_root, os.environ.get("PYTHONPATH")) if p)}
+        self._proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "cloud.sim",
+                "--host",
+                self.host,
+                "--port",
+                str(self.port),
+                "--profile-json",
+                json.dumps(asdict(self.profile)),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+        line = self._proc.stdout.readline() if self._proc.stdout else ""
+        if not line.startswith("DEPLOYSIM_URL="):
+            self.stop()
+            raise RuntimeError("Simulator process failed to start")
+        self.url = line.split("=", 1)[1].strip()
+        return self
+
+    def stats(self) -> dict[str, int]:
+        with urlopen(f"{self.url}/_stats", timeout=10) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def stop(self) -> None:
+        if self._proc and self._proc.poll() is None:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+    def __enter__(self) -> "SimProcess":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
@@ -1,8 +1,14 @@
 from cloud.validation.base import ValidationResult, Validator
 from cloud.validation.runner import run_validations
-from cloud.validation.validators import AzCliValidator, NodeBuildToolsValidator, WebConfigValidator
+from cloud.validation.validators import (
+    AwsCredentialsValidator,
+    AzCliValidator,
+    NodeBuildToolsValidator,
+    WebConfigValidator,
+)
 
 __all__ = [
+    "AwsCredentialsValidator",
     "AzCliValidator",
     "NodeBuildToolsValidator",
     "WebConfigValidator",
@@ -4,6 +4,7 @@ import os
 import shutil
 from pathlib import Path
 
+from cloud.aws.sigv4 import load_credentials
 from cloud.core.models import WorkflowContext
 from cloud.validation.base import ValidationResult
 
@@ -12,6 +13,11 @@ class AzCliValidator:
     name = "azure.cli.available"
 
     def validate(self, context: WorkflowContext) -> ValidationResult:
+        if context.config.az_path:
+            az = context.config.az_path if os.access(context.config.az_path, os.X_OK) else None
+            if not az:
+                return ValidationResult(self.name, False, f"az_path {context.config.az_path} is not executable.")
+            return ValidationResult(self.name, True, f"Azure CLI found at {az}.")
         az = shutil.which("az") or shutil.which("az.cmd")
         if not az:
             return ValidationResult(self.name, False, "Azure CLI not found on PATH.")
@@ -22,6 +28,8 @@ class NodeBuildToolsValidator:
     name = "node.build.tools"
 
     def validate(self, context: WorkflowContext) -> ValidationResult:
+        if not context.config.build:
+            return ValidationResult(self.name, True, "Build disabled; Node tooling not required.")
         yarn_cmd = shutil.which("yarn.cmd") or shutil.which("yarn")
         yarn_ps1 = Path(os.environ.get("USERPROFILE", "")) / "AppData/Roaming/npm/yarn.ps1"
         npm_cmd = shutil.which("npm")
@@ -43,3 +51,12 @@ class WebConfigValidator:
         if web_config.exists():
             return ValidationResult(self.name, True, "web.config found.")
         return ValidationResult(self.name, False, "web.config not found in workspace root.")
+
+
+class AwsCredentialsValidator:
+    name = "aws.credentials.available"
+
+    def validate(self, context: WorkflowContext) -> ValidationResult:
+        if load_credentials():
+            return ValidationResult(self.name, True, "AWS credentials found.")
+        return ValidationResult(self.name, False, "AWS credentials not found in environment or shared credentials file.")
@@ -1,10 +1,16 @@
+from cloud.workflows.aws_website import AwsWebsiteDeployWorkflow
 from cloud.workflows.azure_app_service import AzureAppServiceDeployWorkflow
+from cloud.workflows.azure_rollback import AzureAppServiceRollbackWorkflow
+from cloud.workflows.azure_static_website import AzureStaticWebsiteWorkflow
 from cloud.workflows.base import Workflow, WorkflowResult
 from cloud.workflows.decision import WorkflowDecider
 from cloud.workflows.registry import WorkflowRegistry
 
 __all__ = [
+    "AwsWebsiteDeployWorkflow",
     "AzureAppServiceDeployWorkflow",
+    "AzureAppServiceRollbackWorkflow",
+    "AzureStaticWebsiteWorkflow",
     "Workflow",
     "WorkflowDecider",
     "WorkflowRegistry",
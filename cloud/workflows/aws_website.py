@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import sys
+
+from cloud.aws.website import AwsWebsiteProvider
+from cloud.core.console import error, info, success
+from cloud.core.models import WorkflowContext
+from cloud.core.workspaces import workspace_lock
+from cloud.policy import DeclarativePolicy, run_policy_checks
+from cloud.validation import AwsCredentialsValidator, NodeBuildToolsValidator, run_validations
+from cloud.workflows.base import WorkflowResult, select_named
+
+
+class AwsWebsiteDeployWorkflow:
+    name = "aws.website.deploy"
+
+    def run(self, context: WorkflowContext) -> WorkflowResult:
+        config = context.config
+        if config.plan_only:
+            return WorkflowResult(self.name, False, "Plan only is supported for App Service deploys only; nothing was changed.")
+        validators = select_named([AwsCredentialsValidator(), NodeBuildToolsValidator()], config.validations, "validations")
+        policies = select_named([DeclarativePolicy()], config.policy_checks, "policy checks")
+
+        if any(not result.ok for result in run_validations(validators, context)):
+            error("Pre-deploy validation failed.")
+            sys.exit(1)
+        if any(not result.ok for result in run_policy_checks(policies, context)):
+            error("Policy checks failed.")
+            sys.exit(1)
+
+        provider = AwsWebsiteProvider(config, context.workspace_root)
+        metrics = provider.metrics
+        # Uploads read dist_dir directly, so other jobs in this workspace wait until they finish.
+        with workspace_lock(context.workspace_root):
+            with metrics.step("build"):
+                provider.build_app()
+            with metrics.step("provision"):
+                provider.ensure_resources()
+
+            info("Deploying to S3...")
+            info(f"   Bucket: {provider.bucket}")
+            info(f"   Region: {config.aws_region}\n")
+            provider.deploy_app()
+
+        metrics.report()
+        success("Deployment completed successfully!\n")
+        info(f"Your app is available at: {provider.website_url()}\n")
+        return WorkflowResult(self.name, True, "Deployment completed successfully.")
@@ -1,39 +1,46 @@
 from __future__ import annotations
 
+import sqlite3
 import sys
+import time
+from pathlib import Path
 
-from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.azure.app_service import DEPLOY_MODE_PACKAGE, DEPLOY_MODES, AzureAppServiceProvider
 from cloud.azure.cli import AzureCli
+from cloud.azure.graph import plan_fleet, print_plan
 from cloud.core.console import error, info, success, warn
 from cloud.core.models import WorkflowContext
+from cloud.core.runstats import EtaTracker, RunHistory, warn_regressions
+from cloud.core.workspaces import workspace_lock
 from cloud.iac import get_orchestrator
-from cloud.policy import LocationDefinedPolicy, run_policy_checks
+from cloud.policy import DeclarativePolicy, LocationDefinedPolicy, run_policy_checks
 from cloud.validation import AzCliValidator, NodeBuildToolsValidator, WebConfigValidator, run_validations
-from cloud.workflows.base import WorkflowResult
+from cloud.workflows.base import WorkflowResult, select_named
+from cloud.workflows.watch import watch_and_sync
 
 
 class AzureAppServiceDeployWorkflow:
     name = "azure.app_service.deploy"
     
     def run(self, context: WorkflowContext) -> WorkflowResult:
+        if context.config.deploy_mode not in DEPLOY_MODES:
+            return WorkflowResult(
+                self.name, False, f"Unknown deploy_mode '{context.config.deploy_mode}' (expected {' or '.join(DEPLOY_MODES)})."
+            )
+        if context.config.watch and context.config.deploy_mode == DEPLOY_MODE_PACKAGE:
+            return WorkflowResult(self.name, False, "Watch mode writes into wwwroot, which run_from_package mounts read-only; use deploy_mode zip.")
+        result, provider = self._deploy(context)
+        if context.config.watch and result.ok and not context.config.plan_only:
+            return watch_and_sync(provider, context, self.name)
+        return result
+
+    def _deploy(self, context: WorkflowContext) -> tuple[WorkflowResult, AzureAppServiceProvider]:
         # validators to ensure we can deploy the app service; location
         validators = [AzCliValidator(), NodeBuildToolsValidator(), WebConfigValidator()]
-        policies = [LocationDefinedPolicy()]
-
-# ignores validations/policies not explicitly selected in the config
-        if context.config.validations:
-            selected = [v for v in validators if v.name in context.config.validations]
-            unknown = sorted(set(context.config.validations) - {v.name for v in validators})
-            if unknown:
-                warn(f"Unknown validations ignored: {', '.join(unknown)}")
-            validators = selected
-
-        if context.config.policy_checks:
-            selected = [p for p in policies if p.name in context.config.policy_checks]
-            unknown = sorted(set(context.config.policy_checks) - {p.name for p in policies})
-            if unknown:
-                warn(f"Unknown policy checks ignored: {', '.join(unknown)}")
-            policies = selected
+        policies = [LocationDefinedPolicy(), DeclarativePolicy()]
+
+        validators = select_named(validators, context.config.validations, "validations")
+        policies = select_named(policies, context.config.policy_checks, "policy checks")
 
         validation_results = run_validations(validators, context)
         if any(not result.ok for result in validation_results):
@@ -45,10 +52,14 @@ class AzureAppServiceDeployWorkflow:
             error("Policy checks failed.")
             sys.exit(1)
 
-        cli = AzureCli()
+        cli = AzureCli.from_config(context.config)
         cli.ensure_login()
         provider = AzureAppServiceProvider(context.config, cli, context.workspace_root)
 
+        if context.config.plan_only:
+            print_plan(plan_fleet(provider.load_snapshot(), [context.config]))
+            return WorkflowResult(self.name, True, "Plan only; nothing was changed."), provider
+
         #todo: future development to include IaC orchestration
         orchestrator = get_orchestrator(context.config.iac_tool)
         if context.config.iac_tool and not orchestrator:
@@ -62,11 +73,51 @@ class AzureAppServiceDeployWorkflow:
         if context.config.quick_check:
             passed, _ = provider.quick_check(context.config.check_timeout_sec, early=True)
             if passed:
-                return WorkflowResult(self.name, True, "QuickCheck passed; skipping deployment.")
-
-        provider.build_app()
-        provider.copy_web_config()
-        provider.ensure_resources()
+                return WorkflowResult(self.name, True, "QuickCheck passed; skipping deployment."), provider
+
+        history = RunHistory(Path(context.workspace_root) / context.config.stats_db)
+        app_key = f"{context.config.resource_group}/{context.config.web_app_name}"
+        try:
+            baseline = history.baseline(app_key)
+        except (sqlite3.Error, OSError) as exc:
+            warn(f"Could not read deploy timings from {history.path}: {exc}")
+            baseline = {}
+        eta = EtaTracker(baseline)
+        provider.metrics.listeners.append(eta.on_record)
+        eta.start()
+        started = time.time()
+        try:
+            result = self._stages(context, provider)
+        except Exception:
+            self._record_run(history, app_key, provider, False, started)
+            raise
+        self._record_run(history, app_key, provider, True, started)
+        warn_regressions(baseline, provider.metrics.durations)
+        return result, provider
+
+    def _record_run(self, history: RunHistory, app_key: str, provider: AzureAppServiceProvider, ok: bool, started: float) -> None:
+        try:
+            history.record(app_key, self.name, provider.metrics, ok, started, time.time() - started)
+        except (sqlite3.Error, OSError) as exc:
+            # Timings only feed ETAs and regression warnings; a locked or broken stats file must not fail the deploy.
+            warn(f"Could not record deploy timings in {history.path}: {exc}")
+
+    def _stages(self, context: WorkflowContext, provider: AzureAppServiceProvider) -> WorkflowResult:
+        metrics = provider.metrics
+        with workspace_lock(context.workspace_root):
+            with metrics.step("build"):
+                provider.build_app()
+                provider.copy_web_config()
+            provider.prepare_package()
+        try:
+            return self._release(context, provider)
+        finally:
+            provider.discard_package()
+
+    def _release(self, context: WorkflowContext, provider: AzureAppServiceProvider) -> WorkflowResult:
+        metrics = provider.metrics
+        with metrics.step("provision"):
+            provider.ensure_resources()
 
         #maybe move this logic?
         should_deploy = True
@@ -83,19 +134,28 @@ class AzureAppServiceDeployWorkflow:
         if not should_deploy:
             hostname = provider.get_hostname()
             warn("Skipping deployment: site already up (QuickCheck).")
-            info(f"Your app is available at: https://{hostname}")
+            info(f"Your app is available at: {provider.site_url(hostname)}")
             return WorkflowResult(self.name, True, "QuickCheck skipped deployment.")
 
         provider.deploy_app()
 
         hostname = provider.get_hostname()
-        success("Deployment completed successfully!\n")
 
-        provider.restart()
-        base_url = f"https://{hostname}"
+        with metrics.step("restart"):
+            provider.restart()
+        provider.purge_cdn()
+        base_url = provider.site_url(hostname)
+        provider.warm_up(base_url)
+        # Time to ready: from handing over the package until the new build serves warm. Recording deploy
+        # history and the CDN purge run in between but don't hold up the new build, so they are left out.
+        excluded = metrics.durations.get("history", 0.0) + metrics.durations.get("purge", 0.0)
+        metrics.record("ready", time.perf_counter() - provider.deploy_started - excluded)
+
+        with metrics.step("verify"):
+            provider.validate_http(base_url)
+            provider.kudu_vfs_check()
+        metrics.report()
+        success("Deployment completed successfully!\n")
         info(f"Your app is available at: {base_url}\n")
 
-        provider.validate_http(base_url)
-        provider.kudu_vfs_check()
-
         return WorkflowResult(self.name, True, "Deployment completed successfully.")
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.azure.cli import AzureCli
+from cloud.core.console import error, info, success
+from cloud.core.models import WorkflowContext
+from cloud.workflows.base import WorkflowResult
+
+
+class AzureAppServiceRollbackWorkflow:
+    name = "azure.app_service.rollback"
+
+    def run(self, context: WorkflowContext) -> WorkflowResult:
+        if context.config.plan_only:
+            return WorkflowResult(self.name, False, "Plan only is not supported for rollbacks; nothing was changed.")
+        cli = AzureCli.from_config(context.config)
+        provider = AzureAppServiceProvider(context.config, cli, context.workspace_root)
+        store = provider.history_store()
+        key = provider.history_key()
+
+        records = store.list(key)
+        if not records:
+            return WorkflowResult(self.name, False, f"No deploy history for {context.config.web_app_name}.")
+
+        current = store.current(key)
+        info("Deploy history (newest first):")
+        for record in records:
+            marker = "*" if record.artifact_id == current else " "
+            commit = record.meta.get("git_commit", "")[:10]
+            info(f" {marker} {record.artifact_id}  {record.size_bytes / 1024:.0f} KiB  {record.meta.get('file_count', '?')} files  {commit}")
+
+        target_id = context.config.rollback_to
+        if target_id and target_id != "previous":
+            try:
+                record = store.get(key, target_id)
+            except ValueError as exc:
+                error(str(exc))
+                return WorkflowResult(self.name, False, "Rollback target is ambiguous.")
+        else:
+            record = store.previous(key)
+        if not record:
+            error(f"Rollback target '{target_id or 'previous'}' not found in history.")
+            return WorkflowResult(self.name, False, "Rollback target not found.")
+        if record.artifact_id == current:
+            return WorkflowResult(self.name, True, f"Artifact {record.artifact_id} is already live.")
+
+        cli.ensure_login()
+        provider.rollback_to(record)
+        provider.restart()
+        provider.purge_cdn()
+        base_url = provider.site_url()
+        # The local dist may not match the rolled-back artifact, so only the homepage is checked.
+        info(f"   Homepage status: {provider.http_status(base_url, timeout=30)}")
+        success(f"Rolled back to {record.artifact_id}")
+        info(f"Your app is available at: {base_url}\n")
+        return WorkflowResult(self.name, True, f"Rolled back to {record.artifact_id}.")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sys
+
+from cloud.azure.cli import AzureCli
+from cloud.azure.static_website import AzureStaticWebsiteProvider
+from cloud.core.console import error, info, success
+from cloud.core.http import http_status
+from cloud.core.models import WorkflowContext
+from cloud.core.workspaces import workspace_lock
+from cloud.policy import DeclarativePolicy, LocationDefinedPolicy, run_policy_checks
+from cloud.validation import AzCliValidator, NodeBuildToolsValidator, run_validations
+from cloud.workflows.base import WorkflowResult, select_named
+
+
+class AzureStaticWebsiteWorkflow:
+    name = "azure.storage.static_website"
+
+    def run(self, context: WorkflowContext) -> WorkflowResult:
+        config = context.config
+        if config.plan_only:
+            return WorkflowResult(self.name, False, "Plan only is supported for App Service deploys only; nothing was changed.")
+        # A local emulator needs neither the Azure CLI nor a login.
+        validators = [NodeBuildToolsValidator()] if config.storage_endpoint else [AzCliValidator(), NodeBuildToolsValidator()]
+        policies = [LocationDefinedPolicy(), DeclarativePolicy()]
+        validators = select_named(validators, config.validations, "validations")
+        policies = select_named(policies, config.policy_checks, "policy checks")
+
+        if any(not result.ok for result in run_validations(validators, context)):
+            error("Pre-deploy validation failed.")
+            sys.exit(1)
+        if any(not result.ok for result in run_policy_checks(policies, context)):
+            error("Policy checks failed.")
+            sys.exit(1)
+
+        cli = None
+        if not config.storage_endpoint:
+            cli = AzureCli.from_config(config)
+            cli.ensure_login()
+        provider = AzureStaticWebsiteProvider(config, cli, context.workspace_root)
+        metrics = provider.metrics
+
+        # Uploads read dist_dir directly, so other jobs in this workspace wait until they finish.
+        with workspace_lock(context.workspace_root):
+            with metrics.step("build"):
+                provider.build_app()
+            with metrics.step("provision"):
+                provider.ensure_resources()
+
+            info("Deploying to Azure Storage static website...")
+            info(f"   Resource Group: {config.resource_group}")
+            info(f"   Storage Account: {provider.account}\n")
+            provider.deploy_app()
+
+        endpoint = provider.web_endpoint()
+        with metrics.step("verify"):
+            status = http_status(endpoint, config.check_timeout_sec)
+            info(f"   Homepage status: {status}")
+        metrics.report()
+        success("Deployment completed successfully!\n")
+        info(f"Your app is available at: {endpoint}\n")
+        return WorkflowResult(self.name, True, "Deployment completed successfully.")
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Protocol, TypeVar
 
+from cloud.core.console import warn
 from cloud.core.models import WorkflowContext
 
+T = TypeVar("T")
+
 
 @dataclass(frozen=True)
 class WorkflowResult:
@@ -18,3 +21,14 @@ class Workflow(Protocol):
 
     def run(self, context: WorkflowContext) -> WorkflowResult:
         ...
+
+
+def select_named(items: list[T], names: list[str], label: str) -> list[T]:
+    # ignores validations/policies not explicitly selected in the config
+    if not names:
+        return items
+    selected = [item for item in items if item.name in names]
+    unknown = sorted(set(names) - {item.name for item in items})
+    if unknown:
+        warn(f"Unknown {label} ignored: {', '.join(unknown)}")
+    return selected
@@ -10,6 +10,10 @@ class WorkflowDecider:
         if context.config.workflow:
             return context.config.workflow
         provider = context.config.provider.lower()
+        if provider == "azure" and context.config.rollback_to:
+            return "azure.app_service.rollback"
+        if provider == "azure" and context.config.hosting.lower() == "static_website":
+            return "azure.storage.static_website"
         if provider == "azure":
             return "azure.app_service.deploy"
         if provider == "aws":
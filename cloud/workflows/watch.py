@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.core.console import error, info, success, warn
+from cloud.core.fingerprint import FINGERPRINT_FILE
+from cloud.core.manifest import build_manifest, diff_manifests
+from cloud.core.models import WorkflowContext
+from cloud.core.watch import DEFAULT_EXCLUDES, create_watcher, debounced_changes
+from cloud.core.workspaces import workspace_lock
+from cloud.workflows.base import WorkflowResult
+
+# Static files are served straight from wwwroot; only these change how the site process starts.
+RESTART_TRIGGERS = {"web.config", "package.json", "ecosystem.config.js", "process.json"}
+PUSH_WORKERS = 8
+
+
+def needs_restart(added: list[str], changed: list[str], removed: list[str]) -> bool:
+    return bool(RESTART_TRIGGERS & {os.path.basename(p) for p in added + changed + removed})
+
+
+def _push(provider: AzureAppServiceProvider, zip_path: str, added: list[str], changed: list[str], removed: list[str]) -> None:
+    client = provider.kudu()
+    if not client:
+        raise RuntimeError("SCM host not found; cannot push incremental changes")
+
+    def upload(rel_path: str) -> None:
+        # Read from the package rather than dist_dir, which the next rebuild may already be rewriting.
+        with zipfile.ZipFile(zip_path) as package:
+            client.put_file(rel_path, package.read(rel_path))
+
+    with ThreadPoolExecutor(max_workers=PUSH_WORKERS) as pool:
+        list(pool.map(upload, added + changed))
+        list(pool.map(client.delete_file, removed))
+    # Keep the deployed fingerprint truthful so a later QuickCheck compares against what is live.
+    upload(FINGERPRINT_FILE)
+
+
+def watch_and_sync(provider: AzureAppServiceProvider, context: WorkflowContext, workflow_name: str) -> WorkflowResult:
+    config = context.config
+    dist_path = os.path.abspath(os.path.join(context.workspace_root, config.dist_dir))
+    watch_root = os.path.abspath(os.path.join(context.workspace_root, config.watch_path)) if config.watch_path else dist_path
+    # Watching sources means every change needs a rebuild before the dist diff is meaningful.
+    rebuild = os.path.commonpath([watch_root, dist_path]) != dist_path
+    excludes = DEFAULT_EXCLUDES + ((config.dist_dir,) if rebuild else ())
+
+    watcher = create_watcher(watch_root, excludes)
+    hostname = provider.get_hostname()
+    baseline = provider.dist_manifest or provider.live_manifest()
+    if baseline is None:
+        baseline = build_manifest(dist_path, exclude=[FINGERPRINT_FILE]) if os.path.isdir(dist_path) else {}
+    info(f"Watching {watch_root} ({type(watcher).__name__}); press Ctrl+C to stop.")
+    try:
+        for batch in debounced_changes(watcher, config.watch_debounce_ms / 1000):
+            started = time.perf_counter()
+            info(f"Detected {len(batch)} changed path(s).")
+            try:
+                # Other jobs in this workspace (service mode) build into the same dist_dir.
+                with workspace_lock(context.workspace_root):
+                    if rebuild:
+                        provider.build_app()
+                        provider.copy_web_config()
+                    zip_path = provider.prepare_package()
+                current = provider.dist_manifest or {}
+                added, changed, removed = diff_manifests(baseline, current)
+                if not (added or changed or removed):
+                    info("   Build output unchanged; nothing to push.")
+                    continue
+                info(f"   Pushing {len(added)} added, {len(changed)} changed, {len(removed)} removed file(s)...")
+                _push(provider, zip_path, added, changed, removed)
+                provider.previous_manifest = baseline
+                baseline = current
+                try:
+                    provider.record_artifact(zip_path, dist_path)
+                except (OSError, ValueError, RuntimeError) as exc:
+                    # Rollbacks and CDN purges read CURRENT; without this entry they would act on a stale build.
+                    warn(f"Pushed, but recording the build in deploy history failed: {exc}")
+                if needs_restart(added, changed, removed):
+                    provider.restart()
+                provider.purge_cdn()
+                success(f"Synced in {time.perf_counter() - started:.1f}s -> {provider.site_url(hostname)}")
+            except Exception as exc:
+                # Keep watching; the next change gets another attempt against the last good baseline.
+                error(f"Incremental deploy failed: {exc}")
+            finally:
+                provider.discard_package()
+    except KeyboardInterrupt:
+        warn("Watch mode stopped.")
+    finally:
+        watcher.close()
+    return WorkflowResult(workflow_name, True, "Watch mode ended.")
@@ -0,0 +1,73 @@
+"""Compare time-to-ready of zip deploy and run-from-package on the local simulator.
+
+Runs the same fleet twice, once per deploy mode, and prints per-step p50/p95 side by side.
+"ready" spans the package deploy through the end of warm-up, leaving out deploy history and the CDN purge.
+
+Examples:
+    python scripts/bench_deploy_mode.py
+    python scripts/bench_deploy_mode.py --targets 20 --time-scale 1 --assets 3000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Allow running this script directly without installing the package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+from cloud.core.console import error, info
+from cloud.core.metrics import percentile
+from simulate import build_parser, run_simulation  # noqa: E402
+
+MODES = ("zip", "run_from_package")
+STEPS = ("deploy.total", "restart", "warmup", "ready")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare zip and run-from-package deploys on the simulator.")
+    parser.add_argument("--targets", type=int, default=5, help="Web apps deployed per mode (default 5).")
+    parser.add_argument("--time-scale", type=float, default=0.25, help="Simulated time per real second (default 0.25).")
+    parser.add_argument("--assets", type=int, default=1000, help="Files in the simulated build (default 1000).")
+    parser.add_argument("--profile", default=None, help="YAML/JSON file with SimProfile overrides.")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in MODES:
+        argv = [
+            "fleet",
+            "--targets", str(args.targets),
+            "--time-scale", str(args.time_scale),
+            "--assets", str(args.assets),
+            "--seed", str(args.seed),
+            "--deploy-mode", mode,
+        ]
+        if args.profile:
+            argv += ["--profile", args.profile]
+        results[mode] = run_simulation(build_parser().parse_args(argv))
+
+    info(f"\n{'step':<14}" + "".join(f"{mode + ' p50/p95':>28}" for mode in MODES))
+    for step in STEPS:
+        cells = []
+        for mode in MODES:
+            values = results[mode].steps.get(step, [])
+            cells.append(f"{percentile(values, 50):>12.2f}s / {percentile(values, 95):>6.2f}s" if values else f"{'-':>28}")
+        info(f"{step:<14}" + "".join(f"{cell:>28}" for cell in cells))
+    for mode in MODES:
+        result = results[mode]
+        mixed = result.stats.get("sync.mixed_ms", 0) / 1000 / max(1, len(result.jobs))
+        info(f"{mode}: {len(result.succeeded)}/{len(result.jobs)} succeeded, wwwroot half-synced for {mixed:.2f}s per deploy")
+
+    zip_ready = results["zip"].steps.get("ready", [])
+    package_ready = results["run_from_package"].steps.get("ready", [])
+    if zip_ready and package_ready:
+        info(f"\nrun_from_package p50 time to ready is {percentile(package_ready, 50) / percentile(zip_ready, 50):.2f}x zip's.")
+    if any(len(result.succeeded) != len(result.jobs) for result in results.values()):
+        error("Some simulated deploys failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
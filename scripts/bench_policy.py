@@ -0,0 +1,110 @@
+"""Benchmark declarative policy evaluation across fleet sizes.
+
+Compares per-target evaluation with batch evaluation (memoized per rule group) and
+prints time per target, which should stay flat as the fleet grows.
+
+Examples:
+    python scripts/bench_policy.py
+    python scripts/bench_policy.py --sizes 1000 10000 100000 --rules config/policy-rules.yaml
+"""
+import argparse
+import random
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Allow running this script directly without installing the package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cloud.core.console import error, info
+from cloud.core.models import DeploymentConfig
+from cloud.policy import RuleSet
+
+ENVIRONMENTS = ("dev", "test", "prod")
+LOCATIONS = ("centralus", "eastus", "eastus2", "westus2", "westeurope", "northeurope", "southeastasia")
+SKUS = ("F1", "B1", "B2", "S1", "P1v3", "P2v3")
+RUNTIMES = ("NODE:18-lts", "NODE:20-lts", "NODE:22-lts", "NODE:16-lts")
+
+SAMPLE_RULES = {
+    "rules": [
+        {"name": "allowed-regions", "field": "location", "in": ["centralus", "eastus", "eastus2", "westus2", "westeurope"]},
+        {"name": "environment-set", "field": "environment", "in": list(ENVIRONMENTS)},
+        {"name": "prod-sku", "field": "sku", "when": {"environment": "prod"}, "in": ["P1v3", "P2v3"]},
+        {"name": "nonprod-sku", "field": "sku", "when": {"environment": ["dev", "test"]}, "not_in": ["P2v3"]},
+        {"name": "prod-regions", "field": "location", "when": {"environment": "prod"}, "in": ["eastus2", "westeurope"]},
+        {"name": "app-naming", "field": "web_app_name", "matches": r"[a-z][a-z0-9-]{2,58}[a-z0-9]"},
+        {"name": "rg-naming", "field": "resource_group", "matches": r"rg-[a-z0-9-]+-(dev|test|prod)"},
+        {"name": "node-lts", "field": "runtime", "matches": r"NODE:(18|20|22)-lts"},
+        {"name": "prod-node", "field": "runtime", "when": {"environment": "prod"}, "in": ["NODE:20-lts", "NODE:22-lts"]},
+        {"name": "prod-history", "field": "history_max_count", "when": {"environment": "prod"}, "min": 3},
+        {"name": "history-cap", "field": "history_max_mb", "max": 2048},
+        {"name": "no-watch-prod", "field": "watch", "when": {"environment": "prod"}, "equals": False},
+        {"name": "https", "field": "url_scheme", "equals": "https"},
+    ]
+}
+
+
+def make_targets(count: int, seed: int) -> list[DeploymentConfig]:
+    rng = random.Random(seed)
+    base = DeploymentConfig()
+    targets = []
+    for i in range(count):
+        environment = rng.choice(ENVIRONMENTS)
+        targets.append(
+            replace(
+                base,
+                environment=environment,
+                resource_group=f"rg-team{i % 40:02d}-{environment}",
+                web_app_name=f"app-{i:06d}" if rng.random() > 0.01 else f"App_{i}",
+                location=rng.choice(LOCATIONS),
+                sku=rng.choice(SKUS),
+                runtime=rng.choice(RUNTIMES),
+                history_max_count=rng.choice((1, 5, 10)),
+            )
+        )
+    return targets
+
+
+def timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark declarative policy evaluation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000], help="Fleet sizes to evaluate.")
+    parser.add_argument("--rules", default=None, help="Rules YAML to benchmark (default: a built-in sample rule set).")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the fastest is reported (default 3).")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rule_set = RuleSet.from_file(Path(args.rules)) if args.rules else RuleSet.from_dict(SAMPLE_RULES)
+    info(f"{len(rule_set)} rule check(s) in {len(rule_set.groups)} field group(s)\n")
+    info(f"{'targets':>8}  {'per-target':>11}  {'batch':>9}  {'us/target':>9}  {'speedup':>7}  {'failing':>7}")
+
+    first_rate = None
+    for size in args.sizes:
+        targets = make_targets(size, args.seed)
+        single = min(timed(lambda: [rule_set.evaluate(t) for t in targets])[0] for _ in range(args.repeat))
+        runs = [timed(lambda: rule_set.evaluate_many(targets)) for _ in range(args.repeat)]
+        batch = min(seconds for seconds, _ in runs)
+        results = runs[0][1]
+        if results != [rule_set.evaluate(t) for t in targets]:
+            error("Batch and per-target evaluation disagree.")
+            sys.exit(1)
+        rate = batch / size * 1e6
+        first_rate = first_rate or rate
+        failing = sum(1 for violations in results if violations)
+        info(
+            f"{size:>8}  {single * 1000:>9.1f}ms  {batch * 1000:>7.1f}ms  {rate:>9.2f}  "
+            f"{single / batch:>6.1f}x  {failing:>7}"
+        )
+    info(f"\nPer-target cost at the largest fleet is {rate / first_rate:.2f}x that of the smallest (1.00x is linear).")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import argparse
+import dataclasses
+import json
+import subprocess
 import sys
+import time
 from pathlib import Path
 
 # Allow running this script directly without installing the package.
@@ -7,20 +11,152 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from cloud.azure.cli import AzureCli
+from cloud.azure.graph import ResourceSnapshot, canned_query, cli_graph_query, plan_fleet, print_plan
 from cloud.core.console import error, info
-from cloud.core.config import load_yaml_config
+from cloud.core.config import load_targets, load_yaml_config
+from cloud.core.exec import set_max_concurrency
 from cloud.core.models import DeploymentConfig, WorkflowContext
-from cloud.workflows import AzureAppServiceDeployWorkflow, WorkflowDecider, WorkflowRegistry
+from cloud.core.runstats import RunHistory, print_stats
+from cloud.policy import RuleSet
+from cloud.policy.rules import target_name
+from cloud.service import serve
+from cloud.workflows import (
+    AwsWebsiteDeployWorkflow,
+    AzureAppServiceDeployWorkflow,
+    AzureAppServiceRollbackWorkflow,
+    AzureStaticWebsiteWorkflow,
+    WorkflowDecider,
+    WorkflowRegistry,
+    WorkflowResult,
+)
 
 
 
 def build_registry() -> WorkflowRegistry:
     registry = WorkflowRegistry()
     registry.register(AzureAppServiceDeployWorkflow())
+    registry.register(AzureAppServiceRollbackWorkflow())
+    registry.register(AzureStaticWebsiteWorkflow())
+    registry.register(AwsWebsiteDeployWorkflow())
     return registry
 
 
+def run_context(context: WorkflowContext, registry: WorkflowRegistry) -> WorkflowResult:
+    workflow_name = WorkflowDecider().decide(context, registry)
+    workflow = registry.get(workflow_name)
+    if not workflow:
+        return WorkflowResult(workflow_name, False, f"Workflow '{workflow_name}' not found. Available: {', '.join(registry.list_names())}")
+    info(f"Starting workflow: {workflow_name}\n")
+    return workflow.run(context)
+
+
+def concurrency_limit(value: str) -> int:
+    """argparse type for worker and subprocess limits: a whole number of at least 1."""
+    try:
+        limit = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if limit < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return limit
+
+
+def stats_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="deploy.py stats", description="Show deploy step duration percentiles.")
+    parser.add_argument("--workspace-root", default=None, help="Path to the app workspace (defaults to current directory).")
+    parser.add_argument("--config", default=None, help="Path to local YAML config (defaults to config/local.yaml).")
+    parser.add_argument("--app", default=None, help="Only show <resource-group>/<web-app> (default: all apps).")
+    parser.add_argument("--last", type=int, default=100, help="Successful runs per app to include (default 100).")
+    args = parser.parse_args(argv)
+    workspace_root = Path(args.workspace_root).resolve() if args.workspace_root else Path.cwd()
+    config_path = Path(args.config).resolve() if args.config else Path("config") / "local.yaml"
+    config_data = load_yaml_config(config_path)
+    stats_db = config_data.get("stats_db", DeploymentConfig().stats_db)
+    print_stats(RunHistory(workspace_root / stats_db), args.app, args.last)
+
+
+def fleet_parser(prog: str, description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument("--targets", required=True, help="YAML file with a 'targets' list of config overrides (and optional 'defaults').")
+    parser.add_argument("--workspace-root", default=None, help="Path to the app workspace (defaults to current directory).")
+    parser.add_argument("--config", default=None, help="Path to local YAML config (defaults to config/local.yaml).")
+    return parser
+
+
+def base_config(args: argparse.Namespace) -> tuple[Path, DeploymentConfig]:
+    workspace_root = Path(args.workspace_root).resolve() if args.workspace_root else Path.cwd()
+    config_path = Path(args.config).resolve() if args.config else Path("config") / "local.yaml"
+    config_data = load_yaml_config(config_path)
+    known = {f.name for f in dataclasses.fields(DeploymentConfig)}
+    return workspace_root, DeploymentConfig(**{name: value for name, value in config_data.items() if name in known})
+
+
+def policy_main(argv: list[str]) -> None:
+    parser = fleet_parser("deploy.py policy", "Check many deploy targets against declarative policy rules.")
+    parser.add_argument("--rules", default=None, help="Policy rules YAML (defaults to policy_rules from config).")
+    args = parser.parse_args(argv)
+    workspace_root, base = base_config(args)
+
+    rules_path = args.rules or base.policy_rules
+    if not rules_path:
+        error("No policy rules given; pass --rules or set policy_rules in config.")
+        sys.exit(1)
+    try:
+        rule_set = RuleSet.from_file(Path(rules_path) if Path(rules_path).is_absolute() else workspace_root / rules_path)
+        targets = load_targets(Path(args.targets).resolve(), base)
+    except (OSError, ValueError) as exc:
+        error(str(exc))
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = rule_set.evaluate_many(targets)
+    elapsed = time.perf_counter() - started
+    failing = [(index, violations) for index, violations in enumerate(results) if violations]
+    for index, violations in failing:
+        error(f"[POLICY] #{index + 1} {target_name(targets[index])}")
+        for violation in violations:
+            error(f"   {violation.rule}: {violation.message} (got {violation.value!r})")
+    info(
+        f"Checked {len(results)} target(s) against {len(rule_set)} rule check(s) in {elapsed * 1000:.1f}ms: "
+        f"{len(results) - len(failing)} passed, {len(failing)} failed."
+    )
+    if failing:
+        sys.exit(1)
+
+
+def plan_main(argv: list[str]) -> None:
+    parser = fleet_parser("deploy.py plan", "Show what provisioning would create, update or leave for many App Service targets.")
+    parser.add_argument("--graph-json", default=None, help="Saved `az graph query` output to plan against instead of querying Azure.")
+    args = parser.parse_args(argv)
+    _, base = base_config(args)
+    try:
+        targets = load_targets(Path(args.targets).resolve(), base)
+        if args.graph_json:
+            data = json.loads(Path(args.graph_json).read_text(encoding="utf-8"))
+            query = canned_query(data.get("data", []) if isinstance(data, dict) else data)
+        else:
+            cli = AzureCli.from_config(base)
+            cli.ensure_login()
+            query = cli_graph_query(cli)
+        snapshot = ResourceSnapshot.fetch(query, {target.resource_group for target in targets})
+    except (OSError, ValueError, RuntimeError, subprocess.CalledProcessError) as exc:
+        error(str(exc))
+        sys.exit(1)
+    info(f"Resource Graph: {len(snapshot.groups)} group(s), {len(snapshot.plans)} plan(s), {len(snapshot.sites)} web app(s) in {snapshot.pages} page(s)\n")
+    print_plan(plan_fleet(snapshot, targets))
+
+
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "stats":
+        stats_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "policy":
+        policy_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "plan":
+        plan_main(sys.argv[2:])
+        return
     parser = argparse.ArgumentParser(description="Build and deploy the React app to Azure App Service.")
     parser.add_argument("--workspace-root", default=None, help="Path to the app workspace (defaults to current directory).")
     parser.add_argument("--config", default=None, help="Path to local YAML config (defaults to config/local.yaml).")
@@ -29,15 +165,49 @@ def main() -> None:
     parser.add_argument("--location", default=None)
     parser.add_argument("--sku", default=None)
     parser.add_argument("--runtime", default=None)
-    parser.add_argument("--quick-check", action=argparse.BooleanOptionalAction, default=None, help="Short-circuit if site is already healthy.")
+    parser.add_argument("--environment", default=None, help="Environment name (e.g. dev, prod) that policy rules can match on.")
+    parser.add_argument("--quick-check", action=argparse.BooleanOptionalAction, default=None, help="Skip deploying when the deployed build fingerprint matches the local build.")
     parser.add_argument("--check-timeout-sec", type=int, default=None, help="Timeout (seconds) for HTTP checks.")
     parser.add_argument("--provider", default=None, help="Cloud provider (azure, aws).")
+    parser.add_argument("--hosting", default=None, help="Azure hosting target (app_service, static_website).")
+    parser.add_argument("--storage-account", default=None, help="Storage account for static_website hosting.")
+    parser.add_argument("--storage-endpoint", default=None, help="Blob endpoint override, e.g. a local emulator URL.")
+    parser.add_argument("--aws-region", default=None, help="AWS region for the S3 bucket.")
+    parser.add_argument("--s3-bucket", default=None, help="S3 bucket to sync dist_dir to (defaults to web_app_name).")
+    parser.add_argument("--s3-endpoint", default=None, help="S3 endpoint override, e.g. a local S3-compatible server.")
+    parser.add_argument("--cloudfront-distribution-id", default=None, help="CloudFront distribution to invalidate after sync.")
+    parser.add_argument("--cdn-kind", default=None, help="CDN in front of App Service: afd (Front Door) or cdn.")
+    parser.add_argument("--cdn-profile", default=None, help="CDN/Front Door profile to purge after deploy.")
+    parser.add_argument("--cdn-endpoint", default=None, help="CDN/Front Door endpoint to purge after deploy.")
+    parser.add_argument("--plan", action="store_true", default=None, help="Report what provisioning would create, update or leave, then stop.")
+    parser.add_argument("--apply-updates", action="store_true", default=None, help="Change the SKU/runtime of an existing plan or web app to match the config.")
+    parser.add_argument("--resource-graph", action=argparse.BooleanOptionalAction, default=None, help="Read resource state with one Resource Graph query instead of per-resource probes.")
+    parser.add_argument("--az-path", default=None, help="Azure CLI executable to use instead of az on PATH (e.g. the simulator shim).")
+    parser.add_argument("--build", action=argparse.BooleanOptionalAction, default=None, help="Build before deploying (--no-build deploys the existing dist_dir).")
+    parser.add_argument("--app-package", default=None, help="Workspace package to deploy in a yarn-workspaces monorepo.")
+    parser.add_argument("--build-workers", type=concurrency_limit, default=None, help="Workspace packages to build in parallel (default 4).")
+    parser.add_argument("--deploy-mode", default=None, help="zip (extract into wwwroot) or run_from_package (mount the zip read-only).")
+    parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=None, help="Crawl the site after restart until latency settles.")
+    parser.add_argument("--warmup-route", action="append", default=None, help="Extra route(s) to warm up besides those found in index.html.")
     parser.add_argument("--workflow", default=None, help="Explicit workflow name to run.")
     parser.add_argument("--iac", default=None, help="IaC tool to orchestrate (terraform, bicep, cdk).")
     parser.add_argument("--validation", action="append", default=None, help="Validation name(s) to include.")
     parser.add_argument("--policy", action="append", default=None, help="Policy check name(s) to include.")
+    parser.add_argument("--policy-rules", default=None, help="Declarative policy rules YAML checked by policy.rules.")
+    parser.add_argument("--rollback-to", default=None, help="Redeploy a stored artifact id (or 'previous') without rebuilding.")
+    parser.add_argument("--history-max-count", type=int, default=None, help="Deployed packages to keep per web app (0 disables history).")
+    parser.add_argument("--watch", action="store_true", default=None, help="Stay running and push incremental changes (dev/test slots).")
+    parser.add_argument("--watch-path", default=None, help="Path to watch (defaults to dist_dir; a source path triggers rebuilds).")
+    parser.add_argument("--serve", action="store_true", help="Run as a deploy service accepting requests over HTTP or a Unix socket.")
+    parser.add_argument("--listen", default=None, help="Service HTTP address host:port (default 127.0.0.1:8787).")
+    parser.add_argument("--socket", default=None, help="Service Unix socket path (instead of --listen).")
+    parser.add_argument("--workers", type=concurrency_limit, default=4, help="Service worker pool size (targets deployed in parallel).")
+    parser.add_argument("--max-concurrency", type=concurrency_limit, default=None, help="Max external commands running at once in this process.")
     args = parser.parse_args()
 
+    if args.max_concurrency is not None:
+        set_max_concurrency(args.max_concurrency)
+
     default_config = DeploymentConfig()
     #Get Config from file
     config_path = Path(args.config).resolve() if args.config else Path("config") / "local.yaml"
@@ -58,31 +228,77 @@ def main() -> None:
         location=pick("location", args.location, default_config.location),
         sku=pick("sku", args.sku, default_config.sku),
         runtime=pick("runtime", args.runtime, default_config.runtime),
+        environment=pick("environment", args.environment, default_config.environment),
         dist_dir=pick("dist_dir", None, default_config.dist_dir),
+        build=pick("build", args.build, default_config.build),
+        app_package=pick("app_package", args.app_package, default_config.app_package),
+        app_dist_dir=pick("app_dist_dir", None, default_config.app_dist_dir),
+        build_workers=pick("build_workers", args.build_workers, default_config.build_workers),
+        deploy_mode=pick("deploy_mode", args.deploy_mode, default_config.deploy_mode),
         quick_check=pick("quick_check", args.quick_check, default_config.quick_check),
         check_timeout_sec=pick("check_timeout_sec", args.check_timeout_sec, default_config.check_timeout_sec),
+        az_path=pick("az_path", args.az_path, default_config.az_path),
+        az_timeout_sec=pick("az_timeout_sec", None, default_config.az_timeout_sec),
+        ratelimit_dir=pick("ratelimit_dir", None, default_config.ratelimit_dir),
+        resource_graph=pick("resource_graph", args.resource_graph, default_config.resource_graph),
+        url_scheme=pick("url_scheme", None, default_config.url_scheme),
         provider=pick("provider", args.provider, default_config.provider),
+        hosting=pick("hosting", args.hosting, default_config.hosting),
         workflow=pick("workflow", args.workflow, default_config.workflow),
         iac_tool=pick("iac_tool", args.iac, default_config.iac_tool),
         validations=list(pick("validations", args.validation, default_config.validations) or []),
         policy_checks=list(pick("policy_checks", args.policy, default_config.policy_checks) or []),
+        policy_rules=pick("policy_rules", args.policy_rules, default_config.policy_rules),
+        history_dir=pick("history_dir", None, default_config.history_dir),
+        history_max_count=pick("history_max_count", args.history_max_count, default_config.history_max_count),
+        history_max_mb=pick("history_max_mb", None, default_config.history_max_mb),
+        stats_db=pick("stats_db", None, default_config.stats_db),
+        rollback_to=pick("rollback_to", args.rollback_to, default_config.rollback_to),
+        plan_only=pick("plan_only", args.plan, default_config.plan_only),
+        apply_updates=pick("apply_updates", args.apply_updates, default_config.apply_updates),
+        watch=pick("watch", args.watch, default_config.watch),
+        watch_path=pick("watch_path", args.watch_path, default_config.watch_path),
+        watch_debounce_ms=pick("watch_debounce_ms", None, default_config.watch_debounce_ms),
+        storage_account=pick("storage_account", args.storage_account, default_config.storage_account),
+        storage_endpoint=pick("storage_endpoint", args.storage_endpoint, default_config.storage_endpoint),
+        aws_region=pick("aws_region", args.aws_region, default_config.aws_region),
+        s3_bucket=pick("s3_bucket", args.s3_bucket, default_config.s3_bucket),
+        s3_endpoint=pick("s3_endpoint", args.s3_endpoint, default_config.s3_endpoint),
+        cloudfront_distribution_id=pick(
+            "cloudfront_distribution_id", args.cloudfront_distribution_id, default_config.cloudfront_distribution_id
+        ),
+        cloudfront_endpoint=pick("cloudfront_endpoint", None, default_config.cloudfront_endpoint),
+        cdn_kind=pick("cdn_kind", args.cdn_kind, default_config.cdn_kind),
+        cdn_profile=pick("cdn_profile", args.cdn_profile, default_config.cdn_profile),
+        cdn_endpoint=pick("cdn_endpoint", args.cdn_endpoint, default_config.cdn_endpoint),
+        cdn_resource_group=pick("cdn_resource_group", None, default_config.cdn_resource_group),
+        warmup=pick("warmup", args.warmup, default_config.warmup),
+        warmup_routes=list(pick("warmup_routes", args.warmup_route, default_config.warmup_routes) or []),
+        warmup_rps=pick("warmup_rps", None, default_config.warmup_rps),
+        warmup_max_rounds=pick("warmup_max_rounds", None, default_config.warmup_max_rounds),
     )
 
     workspace_root = Path(args.workspace_root).resolve() if args.workspace_root else Path.cwd()
-    #sets the context
-    context = WorkflowContext(config=config, workspace_root=str(workspace_root))
     registry = build_registry()
-    
-    decider = WorkflowDecider()
-    workflow_name = decider.decide(context, registry)
-    workflow = registry.get(workflow_name)
 
-    if not workflow:
-        error(f"Workflow '{workflow_name}' not found. Available: {', '.join(registry.list_names())}")
-        sys.exit(1)
+    if args.serve:
+        try:
+            serve(
+                lambda ctx: run_context(ctx, registry),
+                config,
+                str(workspace_root),
+                listen=args.listen,
+                socket_path=args.socket,
+                workers=args.workers,
+            )
+        except ValueError as exc:
+            error(str(exc))
+            sys.exit(1)
+        return
 
-    info(f"Starting workflow: {workflow_name}\n")
-    result = workflow.run(context)
+    #sets the context
+    context = WorkflowContext(config=config, workspace_root=str(workspace_root))
+    result = run_context(context, registry)
     if not result.ok:
         error(result.message)
         sys.exit(1)
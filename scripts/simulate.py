@@ -0,0 +1,195 @@
+"""Run deploy workflows against the offline simulator and report throughput, tail latency and failure recovery.
+
+Examples:
+    python scripts/simulate.py fleet --targets 200
+    python scripts/simulate.py throttle --targets 100 --time-scale 0.05
+    python scripts/simulate.py faults --profile sim-profile.yaml
+    python scripts/simulate.py fleet --targets 50 --deploy-mode run_from_package
+"""
+import argparse
+import contextlib
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+# Allow running this script directly without installing the package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from cloud.core.config import load_yaml_config
+from cloud.core.console import error, info
+from cloud.core.exec import set_max_concurrency
+from cloud.core.metrics import percentile
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.core.runstats import TRACKED_STEPS, RunHistory
+from cloud.service.queue import SUCCEEDED, DeployQueue
+from cloud.sim import Faults, SimProcess, SimProfile, write_az_shim
+
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+from deploy import build_registry, concurrency_limit, run_context  # noqa: E402
+
+SCENARIOS = {
+    # Healthy cloud; shows how far the worker pool, subprocess limit and ARM pacing let a fleet deploy scale.
+    "fleet": SimProfile(),
+    # A tight write budget plus random 429s; deploys should slow down, not fail.
+    "throttle": SimProfile(writes_per_hour=400, arm_faults=Faults(throttle=0.05)),
+    # 5xx and hangs on every plane; transient failures should be retried away.
+    "faults": SimProfile().with_faults(Faults(server_error=0.03, timeout=0.01)),
+}
+RETRY_RE = re.compile(r"retrying in", re.IGNORECASE)
+
+
+def write_site(dist: Path, assets: int, linked: int = 20) -> None:
+    # Only the first chunks are referenced from index.html (the rest load lazily), which bounds the warm-up crawl.
+    (dist / "assets").mkdir(parents=True, exist_ok=True)
+    links = "".join(f'<script type="module" src="/assets/chunk-{i:03d}-1a2b3c4d.js"></script>' for i in range(min(assets, linked)))
+    (dist / "index.html").write_text(f"<!doctype html><html><head>{links}</head><body><a href='/about'>About</a></body></html>")
+    for i in range(assets):
+        (dist / "assets" / f"chunk-{i:03d}-1a2b3c4d.js").write_text(f"export const chunk{i} = {'x' * 2048!r};\n")
+
+
+@dataclass
+class SimulationResult:
+    jobs: list
+    wall: float
+    stats: dict[str, int]
+    steps: dict[str, list[float]]
+    retries: int
+
+    @property
+    def succeeded(self) -> list:
+        return [job for job in self.jobs if job.status == SUCCEEDED]
+
+
+def report(result: SimulationResult) -> None:
+    jobs, wall, stats = result.jobs, result.wall, result.stats
+    ok = result.succeeded
+    failed = [job for job in jobs if job.status != SUCCEEDED]
+    durations = [job.finished - job.started for job in ok if job.started and job.finished]
+    waits = [job.started - job.created for job in jobs if job.started]
+    info(f"\nTargets: {len(jobs)}  succeeded: {len(ok)}  failed: {len(failed)}  wall: {wall:.1f}s")
+    info(f"Throughput: {len(ok) / wall * 60:.1f} deploys/min")
+    info(
+        f"Deploy latency: p50 {percentile(durations, 50):.1f}s  p95 {percentile(durations, 95):.1f}s  "
+        f"p99 {percentile(durations, 99):.1f}s  max {max(durations, default=0):.1f}s"
+    )
+    info(f"Queue wait:     p50 {percentile(waits, 50):.1f}s  p95 {percentile(waits, 95):.1f}s")
+
+    if result.steps:
+        info("Step latency (successful runs):")
+        for step in [s for s in TRACKED_STEPS if s in result.steps]:
+            values = result.steps[step]
+            info(f"   {step.ljust(14)} p50 {percentile(values, 50):6.2f}s  p95 {percentile(values, 95):6.2f}s")
+
+    injected = {k: v for k, v in stats.items() if ".fault." in k or k == "az.throttled"}
+    info(
+        f"ARM calls: {stats.get('az.read', 0)} reads, {stats.get('az.write', 0)} writes; "
+        f"Resource Graph pages: {stats.get('graph.pages', 0)}; "
+        f"Kudu requests: {stats.get('kudu.requests', 0)}; site requests: {stats.get('site.requests', 0)}"
+    )
+    if stats.get("sync.mixed_ms"):
+        info(f"wwwroot half-synced for {stats['sync.mixed_ms'] / 1000:.1f}s in total ({stats.get('site.during_sync', 0)} site request(s) hit it)")
+    info(f"Injected/limited: {injected or 'none'}; client retries: {result.retries}")
+    if failed:
+        reasons = Counter(job.message or job.status for job in failed)
+        info("Failures:")
+        for message, count in reasons.most_common(5):
+            info(f"   {count:4d}  {message[:120]}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load-test deploy workflows against a simulated Azure.")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS), help="Latency/failure profile to start from.")
+    parser.add_argument("--profile", default=None, help="YAML/JSON file with SimProfile overrides.")
+    parser.add_argument("--targets", type=int, default=200, help="Number of web apps to deploy (default 200).")
+    parser.add_argument("--workers", type=int, default=None, help="Deploy worker threads (default: one per target).")
+    parser.add_argument("--max-concurrency", type=concurrency_limit, default=32, help="Concurrent az subprocesses (default 32).")
+    parser.add_argument("--resource-groups", type=int, default=10, help="Resource groups to spread targets across.")
+    parser.add_argument("--time-scale", type=float, default=0.02, help="Simulated time per real second (default 0.02).")
+    parser.add_argument("--az-timeout", type=int, default=None, help="Per-command az timeout in seconds (default: 2x the scaled hang).")
+    parser.add_argument("--resource-graph", action=argparse.BooleanOptionalAction, default=True, help="Read provisioning state with one Resource Graph query per target (default on).")
+    parser.add_argument("--deploy-mode", default="zip", choices=("zip", "run_from_package"), help="Deploy mode for every target (default zip).")
+    parser.add_argument("--assets", type=int, default=20, help="Asset files in the simulated build; index.html links up to 20 (default 20).")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch workspace for inspection.")
+    return parser
+
+
+def run_simulation(args: argparse.Namespace) -> SimulationResult:
+    profile = SCENARIOS[args.scenario]
+    if args.profile:
+        overrides = load_yaml_config(Path(args.profile))
+        parsed = SimProfile.from_dict(overrides)
+        profile = replace(profile, **{name: getattr(parsed, name) for name in overrides})
+    profile = replace(profile, time_scale=args.time_scale, seed=args.seed if args.seed is not None else profile.seed)
+    hang = profile.hang_sec * profile.time_scale
+    # Injected hangs end in a 504 well before the client gives up, so both surface as retryable failures.
+    az_timeout = args.az_timeout or max(5, int(hang * 2))
+
+    workspace = Path(tempfile.mkdtemp(prefix="deploysim-"))
+    write_site(workspace / "dist", args.assets)
+    set_max_concurrency(args.max_concurrency)
+    log_path = workspace / "workflows.log"
+    registry = build_registry()
+
+    with SimProcess(profile) as server:
+        az_path = write_az_shim(workspace / "bin", server.url)
+        info(
+            f"Simulator at {server.url}; scenario '{args.scenario}', {args.targets} target(s), "
+            f"deploy mode {args.deploy_mode}, time scale {profile.time_scale:g}"
+        )
+        queue = DeployQueue(lambda ctx: run_context(ctx, registry), max_workers=args.workers or args.targets)
+        started = time.time()
+        with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            jobs = [
+                queue.submit(
+                    WorkflowContext(
+                        DeploymentConfig(
+                            resource_group=f"sim-rg-{i % max(1, args.resource_groups):02d}",
+                            web_app_name=f"sim-app-{i:04d}",
+                            build=False,
+                            deploy_mode=args.deploy_mode,
+                            resource_graph=args.resource_graph,
+                            az_path=az_path,
+                            az_timeout_sec=az_timeout,
+                            # Keep the limiter state of simulated subscriptions out of the user's cache.
+                            ratelimit_dir=str(workspace / "cache"),
+                            url_scheme="http",
+                            check_timeout_sec=max(5, int(hang) + 5),
+                            warmup=True,
+                            warmup_max_rounds=3,
+                        ),
+                        str(workspace),
+                    )
+                )
+                for i in range(args.targets)
+            ]
+            queue.shutdown()
+        wall = time.time() - started
+        stats = server.stats()
+
+    steps = RunHistory(workspace / DeploymentConfig().stats_db).step_samples(since=started)
+    retries = sum(1 for line in log_path.read_text(encoding="utf-8", errors="ignore").splitlines() if RETRY_RE.search(line))
+    if args.keep:
+        info(f"Workspace and workflow output kept at {workspace}")
+    else:
+        shutil.rmtree(workspace, ignore_errors=True)
+    return SimulationResult(jobs, wall, stats, steps, retries)
+
+
+def main() -> None:
+    result = run_simulation(build_parser().parse_args())
+    report(result)
+    if len(result.succeeded) != len(result.jobs):
+        error("Some simulated deploys failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Allow running the tests without installing the package.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    # ArmRateLimiter() and friends default to the user cache; keep test runs out of it.
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
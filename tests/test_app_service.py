@@ -0,0 +1,106 @@
+import os
+import urllib.request
+
+import pytest
+
+from cloud.azure.app_service import RUN_FROM_PACKAGE_SETTING, AzureAppServiceProvider
+from cloud.azure.cli import AzureCli
+from cloud.core.models import DeploymentConfig
+from cloud.sim import Latency, SimProfile, SimServer
+from cloud.sim.fake_az import write_az_shim
+
+QUIET = SimProfile(
+    arm_read=Latency(0, 0),
+    arm_write=Latency(0, 0),
+    deploy=Latency(0, 0),
+    kudu=Latency(0, 0),
+    site=Latency(0, 0),
+    package_mount=Latency(0, 0),
+    cold_requests=0,
+    # Plenty of ARM budget, so the client-side limiter never paces.
+    reads_per_hour=1_000_000,
+    writes_per_hour=1_000_000,
+    seed=1,
+)
+
+
+@pytest.fixture
+def sim(tmp_path):
+    with SimServer(QUIET) as server:
+        yield server, write_az_shim(tmp_path / "bin", server.url)
+
+
+def provider_for(sim, workspace, deploy_mode):
+    server, az_path = sim
+    config = DeploymentConfig(
+        resource_group="rg",
+        web_app_name="app",
+        deploy_mode=deploy_mode,
+        az_path=az_path,
+        url_scheme="http",
+        history_max_count=3,
+        resource_graph=False,
+    )
+    return AzureAppServiceProvider(config, AzureCli.from_config(config), str(workspace))
+
+
+def deploy(provider, workspace, body):
+    dist = workspace / "dist"
+    dist.mkdir(exist_ok=True)
+    (dist / "index.html").write_text(body)
+    provider.ensure_resources()
+    provider.deploy_app()
+    return provider.history_store().current(provider.history_key())
+
+
+def homepage(provider):
+    with urllib.request.urlopen(provider.site_url(), timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def test_switching_to_run_from_package_uploads_before_flipping_the_setting(sim, tmp_path):
+    server, _ = sim
+    deploy(provider_for(sim, tmp_path, "zip"), tmp_path, "zip build")
+    provider = provider_for(sim, tmp_path, "run_from_package")
+    deploy(provider, tmp_path, "package build")
+    app = server.state.apps["app"]
+    assert app.settings[RUN_FROM_PACKAGE_SETTING] == "1"
+    assert app.package and app.package in app.package_data
+    assert "package.empty_mount" not in server.stats()
+    assert homepage(provider) == "package build"
+    assert provider.metrics.durations["history"] >= 0 and provider.deploy_started is not None
+
+
+def test_rollback_applies_the_deploy_mode_setting(sim, tmp_path):
+    server, _ = sim
+    package = provider_for(sim, tmp_path, "run_from_package")
+    first = deploy(package, tmp_path, "v1")
+    deploy(provider_for(sim, tmp_path, "run_from_package"), tmp_path, "v2")
+    # Someone switched the app back to zip deploys since.
+    zip_provider = provider_for(sim, tmp_path, "zip")
+    deploy(zip_provider, tmp_path, "v3")
+    assert RUN_FROM_PACKAGE_SETTING not in server.state.apps["app"].settings
+
+    rollback = provider_for(sim, tmp_path, "run_from_package")
+    rollback.rollback_to(rollback.history_store().get(rollback.history_key(), first))
+    rollback.restart()
+    assert server.state.apps["app"].settings[RUN_FROM_PACKAGE_SETTING] == "1"
+    assert homepage(rollback) == "v1"
+
+    back_to_zip = provider_for(sim, tmp_path, "zip")
+    back_to_zip.rollback_to(back_to_zip.history_store().get(back_to_zip.history_key(), first))
+    back_to_zip.restart()
+    assert RUN_FROM_PACKAGE_SETTING not in server.state.apps["app"].settings
+    assert homepage(back_to_zip) == "v1"
+
+
+def test_zip_deploy_keeps_manifest_mtimes_so_integrity_hashes_nothing(sim, tmp_path):
+    provider = provider_for(sim, tmp_path, "zip")
+    (tmp_path / "dist" / "assets").mkdir(parents=True)
+    old = tmp_path / "dist" / "assets" / "logo.svg"
+    old.write_text("<svg/>")
+    # A file untouched for years still lands in wwwroot with its own mtime, not the deploy time.
+    os.utime(old, (1_000_000_000.5, 1_000_000_000.5))
+    deploy(provider, tmp_path, "zip build")
+    report = provider.verify_integrity(provider.kudu(), provider.dist_manifest)
+    assert report.ok and report.suspect == [] and report.hashed == 0
@@ -0,0 +1,35 @@
+import pytest
+
+from cloud.core.artifacts import ArtifactStore
+
+MANIFEST = {"index.html": {"size": 5, "sha256": "0" * 64}}
+
+
+def add(store, tmp_path, name="pkg.zip"):
+    package = tmp_path / name
+    package.write_bytes(b"zip")
+    return store.add("rg__app", str(package), MANIFEST, {})
+
+
+def test_same_build_recorded_twice_gets_distinct_ids(tmp_path):
+    store = ArtifactStore(tmp_path / "history", max_count=10)
+    first = add(store, tmp_path)
+    second = add(store, tmp_path)
+    assert first.artifact_id != second.artifact_id
+    assert [r.artifact_id for r in store.list("rg__app")] == [second.artifact_id, first.artifact_id]
+    assert first.package_path.exists() and second.package_path.exists()
+
+
+def test_get_prefers_exact_match_and_rejects_ambiguous_prefix(tmp_path):
+    store = ArtifactStore(tmp_path / "history", max_count=10)
+    for name in ("20250101T000000000000Z-aaaa1111", "20250101T000000000000Z-aaaa1111-2", "20250102T000000000000Z-bbbb2222"):
+        entry = tmp_path / "history" / "rg__app" / name
+        entry.mkdir(parents=True)
+        (entry / "package.zip").write_bytes(b"zip")
+        (entry / "meta.json").write_text("{}")
+
+    assert store.get("rg__app", "20250101T000000000000Z-aaaa1111").artifact_id == "20250101T000000000000Z-aaaa1111"
+    assert store.get("rg__app", "20250102").artifact_id == "20250102T000000000000Z-bbbb2222"
+    assert store.get("rg__app", "2026") is None
+    with pytest.raises(ValueError, match="ambiguous"):
+        store.get("rg__app", "20250101")
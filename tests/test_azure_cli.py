@@ -0,0 +1,112 @@
+import json
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from cloud.azure.cli import AzureCli, returns_secrets, strip_debug
+from cloud.azure.ratelimit import ArmRateLimiter
+from cloud.core.exec import RetryPolicy
+from cloud.core.models import DeploymentConfig
+
+DEBUG_DUMP = textwrap.dedent(
+    """\
+    DEBUG: cli.azure.cli.core.sdk.policies: Request URL: 'https://management.azure.com/...'
+    DEBUG: cli.azure.cli.core.sdk.policies: Response status: 503
+    DEBUG: cli.azure.cli.core.sdk.policies: Response content:
+    {
+      "error": {"code": "GatewayTimeout", "message": "upstream timed out"}
+    }
+    DEBUG: cli.azure.cli.core.sdk.policies:     'x-ms-ratelimit-remaining-subscription-reads': '11999'
+    DEBUG: cli.azure.cli.core.sdk.policies: Response status: 404
+    ERROR: (ResourceNotFound) The Resource 'Microsoft.Web/sites/app' was not found.
+    Code: ResourceNotFound
+    """
+)
+
+
+@pytest.fixture
+def fake_az(tmp_path):
+    """An az stand-in that logs its argv and replays a canned exit code, stdout and stderr."""
+    calls = tmp_path / "calls.jsonl"
+    script = tmp_path / "az"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys\n"
+        f"with open({str(calls)!r}, 'a') as fh:\n"
+        "    fh.write(json.dumps(sys.argv[1:]) + '\\n')\n"
+        "sys.stdout.write(os.environ.get('FAKE_AZ_STDOUT', ''))\n"
+        "sys.stderr.write(os.environ.get('FAKE_AZ_STDERR', ''))\n"
+        "sys.exit(int(os.environ.get('FAKE_AZ_EXIT', '0')))\n"
+    )
+    script.chmod(0o755)
+
+    def make(monkeypatch, *, exit_code=0, stdout="", stderr=""):
+        monkeypatch.setenv("FAKE_AZ_EXIT", str(exit_code))
+        monkeypatch.setenv("FAKE_AZ_STDOUT", stdout)
+        monkeypatch.setenv("FAKE_AZ_STDERR", stderr)
+        cli = AzureCli(
+            az_path=str(script),
+            timeout=30,
+            retry=RetryPolicy(attempts=3, base_delay=0, max_delay=0),
+            rate_limiter=ArmRateLimiter("test", state_dir=tmp_path),
+        )
+        return cli, lambda: [json.loads(line) for line in calls.read_text().splitlines()] if calls.exists() else []
+
+    return make
+
+
+def test_strip_debug_drops_multiline_records_and_keeps_errors():
+    assert strip_debug(DEBUG_DUMP) == (
+        "ERROR: (ResourceNotFound) The Resource 'Microsoft.Web/sites/app' was not found.\n"
+        "Code: ResourceNotFound\n"
+    )
+
+
+def test_not_found_is_not_retried_because_of_debug_noise(fake_az, monkeypatch):
+    cli, calls = fake_az(monkeypatch, exit_code=3, stderr=DEBUG_DUMP)
+    with pytest.raises(subprocess.CalledProcessError) as raised:
+        cli.cmd(["webapp", "show", "--name", "app", "--resource-group", "rg"])
+    assert len(calls()) == 1
+    assert "DEBUG:" not in raised.value.stderr
+    assert calls()[0][-1] == "--debug"
+
+
+def test_transient_errors_are_still_retried(fake_az, monkeypatch):
+    stderr = "DEBUG: cli.azure.cli.core.sdk.policies: Response status: 503\nERROR: (ServiceUnavailable) Try again.\n"
+    cli, calls = fake_az(monkeypatch, exit_code=1, stderr=stderr)
+    result = cli.cmd(["webapp", "show", "--name", "app", "--resource-group", "rg"], check=False)
+    assert result.returncode == 1
+    assert len(calls()) == 3
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["webapp", "deployment", "list-publishing-credentials", "--name", "app", "--resource-group", "rg"],
+        ["storage", "account", "keys", "list", "--account-name", "acct"],
+        ["webapp", "config", "appsettings", "set", "--name", "app", "--settings", "A=1"],
+    ],
+)
+def test_secret_returning_commands_never_get_debug(fake_az, monkeypatch, args):
+    cli, calls = fake_az(monkeypatch, stdout="{}")
+    assert returns_secrets(args)
+    cli.cmd(args)
+    assert "--debug" not in calls()[0]
+
+
+def test_read_commands_get_debug_for_ratelimit_headers():
+    assert not returns_secrets(["webapp", "show", "--name", "app"])
+
+
+def test_configured_ratelimit_dir_survives_subscription_binding(tmp_path):
+    cli = AzureCli.from_config(DeploymentConfig(ratelimit_dir=str(tmp_path / "limits")))
+    cli._bind_subscription(json.dumps({"id": "sub-1"}))
+    assert cli.rate_limiter.key == "sub-1"
+    assert cli.rate_limiter.state_dir == tmp_path / "limits"
+
+
+def test_default_ratelimit_dir_follows_xdg_cache_home(tmp_path):
+    # conftest points XDG_CACHE_HOME at tmp_path/cache for every test.
+    assert AzureCli().rate_limiter.state_dir == tmp_path / "cache" / "deployscript"
@@ -0,0 +1,46 @@
+import subprocess
+
+import cloud.azure.cdn as cdn
+from cloud.azure.cdn import CdnPurger, purge_paths
+from cloud.core.models import DeploymentConfig
+
+
+class FlakyCli:
+    """Fails purge calls that include any of `failing` paths."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def cmd(self, args, **kwargs):
+        paths = args[args.index("--content-paths") + 1 :]
+        self.calls.append(paths)
+        if self.failing & set(paths):
+            raise subprocess.CalledProcessError(1, args, "", "ERROR: (Conflict) purge already in progress\n")
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+
+def config():
+    return DeploymentConfig(cdn_profile="edge", cdn_endpoint="site")
+
+
+def test_failed_batches_warn_and_return_unpurged_paths(monkeypatch, capsys):
+    monkeypatch.setattr(cdn, "PURGE_BATCH", 2)
+    cli = FlakyCli(failing={"/c"})
+    unpurged = CdnPurger(cli, config()).purge(["/a", "/b", "/c", "/d", "/e"])
+    assert unpurged == ["/c", "/d"]
+    assert len(cli.calls) == 3
+    out = capsys.readouterr().out
+    assert "purge already in progress" in out and "2 of 5 CDN path(s) were not purged" in out
+
+
+def test_successful_purge_returns_nothing():
+    cli = FlakyCli()
+    assert CdnPurger(cli, config()).purge(["/index.html", "/"]) == []
+    assert cli.calls == [["/index.html", "/"]]
+
+
+def test_purge_paths_skip_hashed_assets_and_add_directory_index():
+    old = {"index.html": {"sha256": "a"}, "assets/app-BxT3kq9a.js": {"sha256": "b"}}
+    new = {"index.html": {"sha256": "c"}, "assets/app-Zz91kq0b.js": {"sha256": "d"}, "docs/index.html": {"sha256": "e"}}
+    assert purge_paths(old, new) == ["/", "/docs/", "/docs/index.html", "/index.html"]
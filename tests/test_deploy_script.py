@@ -0,0 +1,39 @@
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from deploy import concurrency_limit  # noqa: E402
+
+
+@pytest.mark.parametrize("value", ["0", "-1", "two"])
+def test_concurrency_limit_rejects_values_below_one(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        concurrency_limit(value)
+
+
+def test_concurrency_limit_parses_positive_values():
+    assert concurrency_limit("3") == 3
+
+
+def run_deploy(*args, cwd):
+    script = Path(__file__).resolve().parents[1] / "scripts" / "deploy.py"
+    return subprocess.run([sys.executable, str(script), *args], cwd=cwd, capture_output=True, text=True, timeout=60)
+
+
+@pytest.mark.parametrize("flag", ["--workers", "--build-workers"])
+def test_worker_flags_reject_zero(flag, tmp_path):
+    result = run_deploy(flag, "0", "--serve", cwd=tmp_path)
+    assert result.returncode == 2
+    assert "must be at least 1" in result.stderr
+
+
+def test_serve_refuses_a_watching_base_config(tmp_path):
+    config = tmp_path / "service.yaml"
+    config.write_text("watch: true\n")
+    result = run_deploy("--config", str(config), "--serve", "--listen", "127.0.0.1:0", cwd=tmp_path)
+    assert result.returncode == 1
+    assert "watch is not supported in service mode" in result.stdout + result.stderr
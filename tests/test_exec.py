@@ -0,0 +1,48 @@
+import subprocess
+
+import pytest
+
+from cloud.core.exec import is_transient, set_max_concurrency
+
+
+def failed(stderr: str, stdout: str = "") -> subprocess.CompletedProcess[str]:
+    return subprocess.CompletedProcess(["az"], 1, stdout, stderr)
+
+
+@pytest.mark.parametrize(
+    "stderr",
+    [
+        "ERROR: (TooManyRequests) Too many requests.",
+        "ERROR: (ServiceUnavailable) The service is temporarily unavailable.",
+        "ERROR: Operation returned an invalid status code: 503",
+        "HTTP 502 Bad Gateway",
+        "urllib3.exceptions.ReadTimeoutError: HTTPSConnectionPool: Read timed out.",
+        "ConnectionResetError: Connection reset by peer",
+        "http.client.RemoteDisconnected: Remote end closed connection",
+    ],
+)
+def test_transient_failures_are_retried(stderr):
+    assert is_transient(failed(stderr))
+
+
+@pytest.mark.parametrize(
+    "stderr",
+    [
+        "ERROR: (ResourceNotFound) The Resource 'Microsoft.Web/sites/app-503' was not found.",
+        "ERROR: (BadRequest) Value 504 is out of range for --timeout.",
+        "ERROR: argument --timeout: invalid int value",
+        "ERROR: (AuthorizationFailed) The client does not have authorization.",
+    ],
+)
+def test_permanent_failures_are_not_retried(stderr):
+    assert not is_transient(failed(stderr))
+
+
+def test_success_is_never_transient():
+    assert not is_transient(subprocess.CompletedProcess(["az"], 0, "", "Status: 503"))
+
+
+@pytest.mark.parametrize("limit", [0, -1])
+def test_concurrency_limit_below_one_is_rejected(limit):
+    with pytest.raises(ValueError):
+        set_max_concurrency(limit)
@@ -0,0 +1,31 @@
+import subprocess
+
+from cloud.core.fingerprint import inputs_digest
+
+
+def write(root, rel_path, text="x"):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_outputs_and_dependencies_do_not_change_the_digest(tmp_path):
+    write(tmp_path, "src/main.js")
+    before = inputs_digest(str(tmp_path), exclude=["dist"])
+    for rel_path in ("node_modules/react/index.js", ".git/HEAD", ".deploy/runs.sqlite", "dist/index.html", "deploy_app_1.zip"):
+        write(tmp_path, rel_path)
+    assert inputs_digest(str(tmp_path), exclude=["dist"]) == before
+    write(tmp_path, "src/main.js", "changed")
+    assert inputs_digest(str(tmp_path), exclude=["dist"]) != before
+
+
+def test_git_ignored_files_do_not_change_the_digest(tmp_path):
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    write(tmp_path, ".gitignore", "*.log\n.env.local\n")
+    write(tmp_path, "src/main.js")
+    before = inputs_digest(str(tmp_path))
+    write(tmp_path, "npm-debug.log")
+    write(tmp_path, ".env.local")
+    assert inputs_digest(str(tmp_path)) == before
+    write(tmp_path, "src/new.js")
+    assert inputs_digest(str(tmp_path)) != before
@@ -0,0 +1,141 @@
+import json
+import subprocess
+
+import pytest
+
+from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.azure.graph import (
+    GROUP_TYPE,
+    PLAN_TYPE,
+    SITE_TYPE,
+    ResourceSnapshot,
+    ResourceState,
+    build_query,
+    canned_query,
+    plan_fleet,
+)
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.workflows.aws_website import AwsWebsiteDeployWorkflow
+from cloud.workflows.azure_rollback import AzureAppServiceRollbackWorkflow
+from cloud.workflows.azure_static_website import AzureStaticWebsiteWorkflow
+
+
+def row(kind, name, rg, **extra):
+    return {"type": kind, "name": name, "resourceGroup": rg, "location": "centralus", **extra}
+
+
+class FakeCli:
+    """Answers az calls from a {command prefix: (exit code, stdout)} table and records every call."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def cmd(self, args, *, capture_output=True, check=True, timeout=None, retry=None):
+        self.calls.append(args)
+        for prefix, (code, stdout) in self.responses.items():
+            if " ".join(args).startswith(prefix):
+                break
+        else:
+            code, stdout = 0, ""
+        if check and code:
+            raise subprocess.CalledProcessError(code, args, stdout, "ERROR: failed\n")
+        return subprocess.CompletedProcess(args, code, stdout, "")
+
+
+def test_build_query_dedupes_and_escapes_group_names():
+    kql = build_query(["rg-b", "rg-a", "rg-b", "it's"])
+    assert "name in~ ('it\\'s', 'rg-a', 'rg-b')" in kql
+    assert "resourceGroup in~ ('it\\'s', 'rg-a', 'rg-b')" in kql
+
+
+def test_fetch_follows_skip_tokens():
+    rows = [row(GROUP_TYPE, f"rg{i}", f"rg{i}") for i in range(5)]
+    seen = []
+
+    def query(kql, skip_token):
+        seen.append(skip_token)
+        return canned_query(rows, page_size=2)(kql, skip_token)
+
+    snapshot = ResourceSnapshot.fetch(query, ["rg0"])
+    assert snapshot.pages == 3 and seen == [None, "2", "4"]
+    assert sorted(snapshot.groups) == [f"rg{i}" for i in range(5)]
+
+
+def test_fetch_accepts_the_rest_api_skip_token_key():
+    pages = {None: {"data": [row(GROUP_TYPE, "rg", "rg")], "$skipToken": "t"}, "t": {"data": [row(PLAN_TYPE, "p", "rg")]}}
+    snapshot = ResourceSnapshot.fetch(lambda kql, token: pages[token], ["rg"])
+    assert snapshot.pages == 2 and snapshot.plan("RG", "P") is not None
+
+
+def test_site_runtime_falls_back_to_site_properties():
+    state = ResourceState.from_row(row(SITE_TYPE, "app", "rg", siteProperties=[{"name": "LinuxFxVersion", "value": "NODE|18-lts"}]))
+    assert state.runtime == "NODE|18-lts"
+
+
+def test_plan_fleet_creates_a_shared_group_once():
+    snapshot = ResourceSnapshot(
+        [row(PLAN_TYPE, "app2-plan", "rg-shared", sku="B1"), row(SITE_TYPE, "app2", "rg-shared", runtime="NODE|18-lts")]
+    )
+    configs = [
+        DeploymentConfig(resource_group="rg-shared", web_app_name="app1"),
+        DeploymentConfig(resource_group="RG-Shared", web_app_name="app2", sku="S1"),
+    ]
+    plans = plan_fleet(snapshot, configs)
+    actions = [[(a.resource, a.action) for a in actions] for _, actions in plans]
+    assert actions == [
+        [("resource group", "create"), ("app service plan", "create"), ("web app", "create")],
+        [("resource group", "leave"), ("app service plan", "update"), ("web app", "update")],
+    ]
+    # Planning works on a copy; the fetched snapshot is untouched.
+    assert snapshot.group("rg-shared") is None
+
+
+def make_provider(tmp_path, responses, **overrides):
+    config = DeploymentConfig(resource_group="rg", web_app_name="app", sku="S1", **overrides)
+    cli = FakeCli(responses)
+    return AzureAppServiceProvider(config, cli, str(tmp_path)), cli
+
+
+def test_failed_graph_query_falls_back_to_probes(tmp_path):
+    provider, cli = make_provider(
+        tmp_path,
+        {
+            "group exists": (0, "true\n"),
+            "appservice plan show": (0, json.dumps({"name": "app-plan", "resourceGroup": "rg", "sku": {"name": "B1"}})),
+            "webapp show": (3, ""),
+        },
+    )
+
+    def failing(kql, skip_token):
+        raise subprocess.CalledProcessError(2, ["az", "graph"], "", "ERROR: 'graph' is misspelled or not recognized\n")
+
+    snapshot = provider.load_snapshot(failing)
+    assert snapshot.group("rg") is not None
+    assert snapshot.plan("rg", "app-plan").sku == "B1"
+    assert snapshot.site("rg", "app") is None
+    assert [call[:2] for call in cli.calls] == [["group", "exists"], ["appservice", "plan"], ["webapp", "show"]]
+
+
+@pytest.mark.parametrize("apply_updates", [False, True])
+def test_plan_and_runtime_updates_need_apply_updates(tmp_path, apply_updates):
+    provider, cli = make_provider(tmp_path, {}, apply_updates=apply_updates)
+    provider.snapshot = ResourceSnapshot(
+        [
+            row(GROUP_TYPE, "rg", "rg"),
+            row(PLAN_TYPE, "app-plan", "rg", sku="B1"),
+            row(SITE_TYPE, "app", "rg", runtime="NODE|18-lts"),
+        ]
+    )
+    provider.ensure_resources()
+    commands = [" ".join(call[:3]) for call in cli.calls]
+    expected = ["appservice plan update", "webapp config set"] if apply_updates else []
+    assert commands == expected
+
+
+@pytest.mark.parametrize(
+    "workflow", [AzureAppServiceRollbackWorkflow, AzureStaticWebsiteWorkflow, AwsWebsiteDeployWorkflow]
+)
+def test_workflows_without_a_plan_refuse_plan_only(tmp_path, workflow):
+    result = workflow().run(WorkflowContext(DeploymentConfig(plan_only=True), str(tmp_path)))
+    assert not result.ok and "nothing was changed" in result.message
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cloud.azure.integrity import compare_tree, verify_wwwroot
+from cloud.core.http import HttpSession
+
+BUILT_AT = 1_700_000_000.0
+
+
+def stamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat()
+
+
+def local_entry(data: bytes) -> dict:
+    return {"size": len(data), "mtime": BUILT_AT, "sha256": hashlib.sha256(data).hexdigest()}
+
+
+class FakeKudu:
+    """wwwroot as {rel_path: (bytes, mtime)}, served through the two VFS calls verify_wwwroot makes."""
+
+    def __init__(self, files):
+        self.files = files
+        self.downloads = []
+
+    def get_json(self, path):
+        prefix = path[len("/api/vfs/site/wwwroot/"):]
+        entries = {}
+        for rel_path, (data, mtime) in self.files.items():
+            if rel_path.startswith(prefix):
+                name, sep, _ = rel_path[len(prefix):].partition("/")
+                entries[name] = {"name": name, "mime": "inode/directory"} if sep else {"name": name, "size": len(data), "mtime": stamp(mtime)}
+        return list(entries.values())
+
+    def request(self, method, path, data=None, headers=None):
+        rel_path = path[len("/api/vfs/site/wwwroot/"):]
+        self.downloads.append(rel_path)
+        entry = self.files.get(rel_path)
+        return (200, entry[0]) if entry else (404, b"")
+
+
+def test_same_size_stale_file_is_caught_by_hash():
+    local = {"index.html": local_entry(b"new!"), "assets/app.js": local_entry(b"js")}
+    # Kudu keeps zip entry times, so a file this deploy wrote carries the build's mtime (to zip resolution).
+    client = FakeKudu({"index.html": (b"old!", BUILT_AT - 3600), "assets/app.js": (b"js", BUILT_AT - 1)})
+    report = verify_wwwroot(client, local, check_mtime=True)
+    assert report.mismatched == ["index.html"]
+    assert client.downloads == ["index.html"]
+    assert not report.ok
+
+
+def test_stale_but_identical_file_passes():
+    local = {"robots.txt": local_entry(b"allow")}
+    client = FakeKudu({"robots.txt": (b"allow", BUILT_AT - 3600)})
+    report = verify_wwwroot(client, local, check_mtime=True)
+    assert report.ok and report.hashed == 1
+
+
+def test_size_mismatch_needs_no_download():
+    local = {"index.html": local_entry(b"longer content")}
+    client = FakeKudu({"index.html": (b"short", BUILT_AT)})
+    report = verify_wwwroot(client, local, check_mtime=True)
+    assert report.mismatched == ["index.html"] and client.downloads == []
+
+
+def test_files_written_long_before_the_deploy_are_not_suspect_when_mtimes_match():
+    # Zip deploys keep entry times, so untouched sources look old; that alone must not trigger hashing.
+    local = {f"f{i}.txt": local_entry(b"x") for i in range(5)}
+    client = FakeKudu({path: (b"x", BUILT_AT) for path in local})
+    report = verify_wwwroot(client, local, check_mtime=True)
+    assert report.ok and report.suspect == [] and client.downloads == []
+
+
+def test_hash_limit_reports_the_rest_as_unverified():
+    local = {f"f{i}.txt": local_entry(b"x") for i in range(5)}
+    remote = {f"f{i}.txt": {"size": 1, "mtime": stamp(BUILT_AT - 3600)} for i in range(5)}
+    report = compare_tree(local, remote, check_mtime=True)
+    assert len(report.suspect) == 5
+    client = FakeKudu({path: (b"x", BUILT_AT - 3600) for path in local})
+    report = verify_wwwroot(client, local, check_mtime=True, hash_limit=2)
+    assert report.hashed == 2 and len(report.unverified) == 3
+
+
+@pytest.fixture
+def slow_server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _slow(self):
+            hits.append(self.command)
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            time.sleep(0.5)
+            self.send_response(204)
+            self.end_headers()
+
+        do_GET = do_PUT = do_DELETE = _slow
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("method", ["PUT", "DELETE"])
+def test_writes_are_not_resent_after_a_timeout(slow_server, method):
+    base_url, hits = slow_server
+    session = HttpSession(base_url, timeout=0.1)
+    with pytest.raises(TimeoutError):
+        session.request(method, "/api/vfs/site/wwwroot/a.txt", data=b"x" if method == "PUT" else None)
+    time.sleep(0.6)
+    assert hits == [method]
+
+
+def test_reads_are_retried_once_after_a_timeout(slow_server):
+    base_url, hits = slow_server
+    session = HttpSession(base_url, timeout=0.1)
+    with pytest.raises(TimeoutError):
+        session.request("GET", "/api/vfs/site/wwwroot/a.txt")
+    time.sleep(0.6)
+    assert hits == ["GET", "GET"]
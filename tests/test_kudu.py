@@ -0,0 +1,135 @@
+import http.client
+import socket
+import threading
+from datetime import datetime
+
+import pytest
+
+from cloud.azure.kudu import KuduClient, KuduDeploymentTail, parse_kudu_time, phase_for
+from cloud.core.metrics import RunMetrics
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-05-01T10:00:01.1234567Z", datetime(2024, 5, 1, 10, 0, 1, 123456)),
+        ("2024-05-01T10:00:01Z", datetime(2024, 5, 1, 10, 0, 1)),
+        ("", None),
+        (None, None),
+        ("not a time", None),
+        (12345, None),
+    ],
+)
+def test_parse_kudu_time(value, expected):
+    assert parse_kudu_time(value) == expected
+
+
+@pytest.mark.parametrize(
+    "message, phase",
+    [
+        ("Extracting deployment package", "server.extract"),
+        ("Running oryx build...", "server.build"),
+        ("Restarting site", "server.restart"),
+        ("Deployment successful.", "server.other"),
+    ],
+)
+def test_phase_for(message, phase):
+    assert phase_for(message) == phase
+
+
+class StubKudu:
+    """Replays a baseline deployment, then whatever `deployment` and `log` hold; either may be an exception."""
+
+    timeout = 1
+
+    def __init__(self, deployment=None, log=None):
+        self.calls = 0
+        self.deployment = deployment
+        self.log = log
+
+    def latest_deployment(self):
+        self.calls += 1
+        if self.calls == 1:
+            return {"id": "old"}
+        if isinstance(self.deployment, Exception):
+            raise self.deployment
+        return self.deployment
+
+    def get_json(self, path):
+        if isinstance(self.log, Exception):
+            raise self.log
+        return self.log
+
+
+DEPLOYMENT = {
+    "id": "new",
+    "status": 4,
+    "received_time": "2024-05-01T10:00:00Z",
+    "end_time": "2024-05-01T10:00:06Z",
+}
+LOG = [
+    {"id": "1", "log_time": "2024-05-01T10:00:00Z", "message": "Extracting files"},
+    {"id": "2", "log_time": "2024-05-01T10:00:02Z", "message": "Running oryx build"},
+    {"id": "3", "log_time": "2024-05-01T10:00:05Z", "message": "Restarting site"},
+]
+
+
+def tail_for(client):
+    tail = KuduDeploymentTail(client, RunMetrics(), poll_interval=60)
+    tail.start()
+    return tail
+
+
+def test_tail_records_phases_of_the_new_deployment():
+    tail = tail_for(StubKudu(DEPLOYMENT, LOG + [LOG[0]]))
+    tail.stop()
+    assert tail.metrics.durations == {"server.extract": 2.0, "server.build": 3.0, "server.restart": 1.0}
+    assert tail.metrics.values["server.total_sec"] == 6.0
+
+
+def test_tail_ignores_the_baseline_deployment():
+    tail = tail_for(StubKudu({"id": "old"}, LOG))
+    tail.stop()
+    assert tail.metrics.durations == {}
+
+
+@pytest.mark.parametrize("log", [{"error": "not a list"}, "text", [None, "entry", 3]])
+def test_tail_skips_malformed_logs(log):
+    tail = tail_for(StubKudu(DEPLOYMENT, log))
+    tail.stop()
+    assert tail.metrics.durations == {}
+
+
+@pytest.mark.parametrize("error", [http.client.RemoteDisconnected("closed"), OSError("reset"), RuntimeError("500")])
+def test_tail_stop_survives_transport_errors(error):
+    tail_for(StubKudu(DEPLOYMENT, error)).stop()
+
+
+def test_tail_stop_never_raises():
+    tail_for(StubKudu(KeyError("unexpected"))).stop()
+
+
+def test_latest_deployment_treats_a_dropped_connection_as_no_deployment():
+    # Accepts and immediately closes every connection, which http.client reports as RemoteDisconnected.
+    listener = socket.create_server(("127.0.0.1", 0))
+    listener.settimeout(0.05)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            try:
+                conn, _ = listener.accept()
+            except socket.timeout:
+                continue
+            conn.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        client = KuduClient(f"127.0.0.1:{listener.getsockname()[1]}", "user", "pass", timeout=5, scheme="http")
+        assert client.latest_deployment() is None
+    finally:
+        # Stop accepting before closing, so the thread never blocks on a descriptor another test reuses.
+        stop.set()
+        thread.join()
+        listener.close()
@@ -0,0 +1,84 @@
+import random
+from dataclasses import replace
+
+import pytest
+
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.policy import DeclarativePolicy, RuleSet
+
+RULES = {
+    "rules": [
+        {"name": "regions", "field": "location", "in": ["eastus", "westeurope"]},
+        {"name": "prod-sku", "field": "sku", "when": {"environment": "prod"}, "in": ["P1v3"]},
+        {"name": "nonprod-sku", "field": "sku", "when": {"environment": ["dev", "test"]}, "not_in": ["P1v3"]},
+        {"name": "naming", "field": "web_app_name", "matches": "[a-z][a-z0-9-]+"},
+        {"name": "history", "field": "history_max_count", "min": 3, "max": 10},
+        {"name": "env", "field": "environment", "required": True},
+        {"name": "https", "field": "url_scheme", "equals": "https"},
+        {"name": "no-extra-checks", "field": "validations", "when": {"environment": "prod"}, "equals": []},
+    ]
+}
+
+
+def failed(config, rules=RULES):
+    return sorted(v.rule for v in RuleSet.from_dict(rules).evaluate(config))
+
+
+def test_operators():
+    ok = DeploymentConfig(location="eastus", sku="P1v3", environment="prod", web_app_name="app-1", history_max_count=5)
+    assert failed(ok) == []
+    bad = replace(ok, location="centralus", sku="B1", web_app_name="App_1", history_max_count=20, url_scheme="http")
+    assert failed(bad) == ["history", "https", "naming", "prod-sku", "regions"]
+    assert failed(replace(ok, environment="dev")) == ["nonprod-sku"]
+    assert failed(replace(ok, environment=None)) == ["env"]
+    assert failed(replace(ok, history_max_count=1)) == ["history"]
+
+
+def test_when_on_a_list_field_does_not_raise():
+    rules = {"rules": [{"name": "r", "field": "sku", "when": {"validations": "smoke"}, "equals": "S1"}]}
+    assert failed(DeploymentConfig(validations=["smoke"]), rules) == []
+
+
+@pytest.mark.parametrize("when", [{"environment": [["prod"]]}, {"environment": {"any": "prod"}}, {"environment": [{"a": 1}]}])
+def test_non_scalar_when_values_are_rejected(when):
+    with pytest.raises(ValueError, match="scalar"):
+        RuleSet.from_dict({"rules": [{"field": "sku", "when": when, "in": ["B1"]}]})
+
+
+def test_unknown_fields_operators_and_bad_patterns_are_rejected():
+    for rule, message in [
+        ({"field": "nope", "in": ["x"]}, "unknown config field"),
+        ({"field": "sku", "between": [1, 2]}, "unknown key"),
+        ({"field": "sku"}, "needs one of"),
+        ({"field": "sku", "matches": "("}, "invalid pattern"),
+        ({"field": "sku", "min": "1"}, "must be a number"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            RuleSet.from_dict({"rules": [rule]})
+
+
+def test_batch_matches_single_evaluation_and_keeps_duplicates():
+    rng = random.Random(5)
+    base = DeploymentConfig()
+    targets = [
+        replace(
+            base,
+            environment=rng.choice(["dev", "test", "prod", None]),
+            location=rng.choice(["eastus", "westeurope", "centralus"]),
+            sku=rng.choice(["B1", "P1v3"]),
+            web_app_name=f"app-{i % 50}",
+            history_max_count=rng.choice([1, 5, 20]),
+        )
+        for i in range(300)
+    ]
+    rule_set = RuleSet.from_dict(RULES)
+    results = rule_set.evaluate_many(targets)
+    assert results == [rule_set.evaluate(t) for t in targets]
+    assert len(results) == len(targets)
+
+
+def test_declarative_policy_reports_unreadable_rules(tmp_path):
+    (tmp_path / "rules.yaml").write_text("rules: [\n  - {field: sku\n")
+    config = DeploymentConfig(policy_rules="rules.yaml")
+    result = DeclarativePolicy().evaluate(WorkflowContext(config, str(tmp_path)))
+    assert not result.ok and "Invalid YAML" in result.message
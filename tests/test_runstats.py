@@ -0,0 +1,85 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cloud.core.metrics import RunMetrics, percentile
+from cloud.core.runstats import MIN_BASELINE, EtaTracker, RunHistory, regressions, warn_regressions
+from cloud.workflows.azure_app_service import AzureAppServiceDeployWorkflow
+
+
+def metrics_with(values=None, **durations):
+    metrics = RunMetrics()
+    for step, seconds in durations.items():
+        metrics.record(step.replace("_", "."), seconds)
+    for name, value in (values or {}).items():
+        metrics.set_value(name, value)
+    return metrics
+
+
+@pytest.mark.parametrize(
+    "samples, pct, expected",
+    [([], 50, 0.0), ([3.0], 95, 3.0), ([4.0, 1.0, 3.0, 2.0], 50, 2.0), ([float(i) for i in range(1, 21)], 95, 19.0)],
+)
+def test_percentile_is_nearest_rank(samples, pct, expected):
+    assert percentile(samples, pct) == expected
+
+
+def test_record_and_read_back_runs(tmp_path):
+    history = RunHistory(tmp_path / "stats" / "runs.sqlite")
+    assert history.baseline("rg/app") == {} and history.summary() == []
+    for i in range(3):
+        history.record("rg/app", "deploy", metrics_with(build=10.0 + i, deploy_total=5.0), True, 1000.0 + i, 20.0)
+    history.record("rg/app", "deploy", metrics_with(build=99.0), False, 2000.0, 99.0)
+    history.record("rg/other", "deploy", metrics_with({"artifact.bytes": 2048}, build=1.0), True, 3000.0, 1.0)
+
+    # Failed runs never count towards the baseline.
+    assert history.baseline("rg/app") == {"build": [10.0, 11.0, 12.0], "deploy.total": [5.0, 5.0, 5.0]}
+    assert history.baseline("rg/app", limit=2)["build"] == [11.0, 12.0]
+    stats = {(row.app, row.step): row for row in history.summary()}
+    build = stats[("rg/app", "build")]
+    assert (build.count, build.p50, build.latest) == (3, 11.0, 12.0)
+    assert [row.step for row in history.summary("rg/app")] == ["build", "deploy.total"]
+    assert history.step_samples(since=2500.0) == {"build": [1.0]}
+    latest = history.runs(limit=2)
+    assert [row[0] for row in latest] == ["rg/other", "rg/app"] and latest[0][5] == 2048 and latest[1][3] == 0
+
+
+def test_regressions_need_a_baseline_and_a_real_slowdown():
+    baseline = {"build": [10.0] * MIN_BASELINE, "restart": [1.0] * MIN_BASELINE, "upload": [5.0] * (MIN_BASELINE - 1)}
+    durations = {"build": 20.0, "restart": 2.5, "upload": 50.0}
+    # restart is 2.5x but only 1.5s slower; upload has too few samples to judge.
+    assert regressions(baseline, durations) == [("build", 20.0, 10.0)]
+
+
+def test_warn_regressions_prints_the_slow_step(capsys):
+    warn_regressions({"build": [10.0] * MIN_BASELINE}, {"build": 30.0})
+    assert "Step 'build' took 30.0s, 3.0x its rolling median of 10.0s" in capsys.readouterr().out
+
+
+def test_eta_counts_down_as_steps_finish(capsys):
+    baseline = {"build": [60.0] * MIN_BASELINE, "deploy.total": [30.0] * MIN_BASELINE, "verify": [1.0]}
+    eta = EtaTracker(baseline)
+    assert eta.expected == {"build": 60.0, "deploy.total": 30.0}
+    eta.start()
+    eta.on_record("build", 55.0)
+    eta.on_record("build", 1.0)
+    eta.on_record("upload", 1.0)
+    eta.on_record("deploy.total", 28.0)
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith("ETA")]
+    assert lines[0] == "ETA: ~1m30s based on recent deploys"
+    assert lines[1].startswith("ETA: ~30s remaining")
+    assert len(lines) == 2
+
+
+def test_eta_is_silent_without_history(capsys):
+    EtaTracker({}).start()
+    assert capsys.readouterr().out == ""
+
+
+def test_unwritable_stats_db_only_warns(tmp_path, capsys):
+    # A directory where the SQLite file should be makes every connect fail.
+    history = RunHistory(tmp_path)
+    provider = SimpleNamespace(metrics=metrics_with(build=1.0))
+    AzureAppServiceDeployWorkflow()._record_run(history, "rg/app", provider, True, time.time())
+    assert "Could not record deploy timings" in capsys.readouterr().out
@@ -0,0 +1,125 @@
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.core.workspaces import workspace_lock
+from cloud.service import DeployQueue, make_server
+from cloud.workflows.base import WorkflowResult
+
+
+def wait_for(queue, jobs, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(queue.get(job.job_id).finished for job in jobs):
+            return
+        time.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+def test_targets_sharing_a_workspace_build_one_at_a_time(tmp_path):
+    building = []
+    overlaps = []
+
+    def runner(context):
+        with workspace_lock(context.workspace_root):
+            building.append(context.config.web_app_name)
+            if len(building) > 1:
+                overlaps.append(tuple(building))
+            time.sleep(0.05)
+            building.remove(context.config.web_app_name)
+        return WorkflowResult("test", True, "ok")
+
+    queue = DeployQueue(runner, max_workers=4)
+    jobs = [
+        queue.submit(WorkflowContext(DeploymentConfig(web_app_name=f"app{i}"), str(tmp_path)))
+        for i in range(4)
+    ]
+    wait_for(queue, jobs)
+    queue.shutdown()
+    assert overlaps == []
+    assert all(queue.get(job.job_id).status == "succeeded" for job in jobs)
+
+
+def test_pending_job_for_a_target_is_superseded(tmp_path):
+    release = threading.Event()
+
+    def runner(context):
+        release.wait(5)
+        return WorkflowResult("test", True, context.config.sku)
+
+    queue = DeployQueue(runner, max_workers=2)
+    context = lambda sku: WorkflowContext(DeploymentConfig(sku=sku), str(tmp_path))  # noqa: E731
+    running = queue.submit(context("B1"))
+    time.sleep(0.05)
+    stale = queue.submit(context("S1"))
+    newest = queue.submit(context("P1v3"))
+    release.set()
+    wait_for(queue, [running, stale, newest])
+    queue.shutdown()
+    assert stale.status == "superseded" and stale.superseded_by == newest.job_id
+    assert newest.message == "P1v3"
+
+
+@pytest.fixture
+def service(tmp_path):
+    submitted = []
+    queue = DeployQueue(lambda context: submitted.append(context) or WorkflowResult("test", True, "ok"), max_workers=1)
+    server = make_server(queue, DeploymentConfig(), str(tmp_path), listen="127.0.0.1:0")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def post(body, content_type="application/json"):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        conn.request("POST", "/deploys", body=json.dumps(body), headers={"Content-Type": content_type})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b"null")
+
+    yield post, submitted, tmp_path
+    server.shutdown()
+    server.server_close()
+    queue.shutdown()
+
+
+def test_request_cannot_choose_the_workspace(service):
+    post, submitted, _ = service
+    status, body = post({"web_app_name": "app1", "workspace_root": "/etc"})
+    assert status == 400 and "workspace_root" in body["error"]
+    assert submitted == []
+
+
+def test_request_runs_in_the_configured_workspace(service):
+    post, submitted, root = service
+    status, body = post({"web_app_name": "app1", "sku": "S1"})
+    assert status == 202
+    deadline = time.time() + 5
+    while not submitted and time.time() < deadline:
+        time.sleep(0.01)
+    assert submitted[0].workspace_root == str(root)
+    assert submitted[0].config.web_app_name == "app1" and submitted[0].config.sku == "S1"
+
+
+@pytest.mark.parametrize("field", ["az_path", "stats_db", "history_dir", "workflow", "iac_tool", "dist_dir", "watch"])
+def test_request_cannot_set_local_paths_or_workflows(service, field):
+    post, submitted, _ = service
+    status, body = post({"web_app_name": "app1", field: "x"})
+    assert status == 400 and field in body["error"]
+    assert submitted == []
+
+
+def test_request_values_must_match_the_field_type(service):
+    post, submitted, _ = service
+    assert post({"web_app_name": ["app1"]})[0] == 400
+    assert post({"warmup": "yes"})[0] == 400
+    assert post({"environment": None, "warmup_routes": ["/docs"]})[0] == 202
+
+
+@pytest.mark.parametrize("content_type", ["text/plain", "application/x-www-form-urlencoded"])
+def test_request_must_be_sent_as_json(service, content_type):
+    post, submitted, _ = service
+    status, body = post({"web_app_name": "app1"}, content_type=content_type)
+    assert status == 415
+    assert submitted == []
@@ -0,0 +1,92 @@
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+import cloud.sim.server as sim
+from cloud.sim import Faults, Latency, SimProfile, SimServer
+from cloud.sim.server import SimState, apply_query, parse_args
+
+QUIET = SimProfile(arm_read=Latency(0, 0), arm_write=Latency(0, 0), site=Latency(0, 0), cold_requests=0, seed=1)
+
+
+def test_parse_args_splits_verbs_short_options_and_multi_value_options():
+    verbs, options = parse_args(
+        ["webapp", "config", "appsettings", "set", "-g", "rg", "-n", "app", "--settings", "A=1", "B=2", "--debug"]
+    )
+    assert verbs == ["webapp", "config", "appsettings", "set"]
+    assert options == {"--resource-group": ["rg"], "--name": ["app"], "--settings": ["A=1", "B=2"], "--debug": []}
+
+
+def test_parse_args_keeps_negative_numbers_as_values():
+    assert parse_args(["graph", "query", "--first", "-1"])[1] == {"--first": ["-1"]}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("defaultHostName", "app.web.sim"),
+        ("siteConfig.linuxFxVersion", "NODE|20-lts"),
+        ("hostNames[0]", "app.web.sim"),
+        ("hostNames[-1]", "app.scm.sim"),
+        ("hostNames[5]", None),
+        ("missing.deeper", None),
+    ],
+)
+def test_apply_query(query, expected):
+    value = {
+        "defaultHostName": "app.web.sim",
+        "hostNames": ["app.web.sim", "app.scm.sim"],
+        "siteConfig": {"linuxFxVersion": "NODE|20-lts"},
+    }
+    assert apply_query(value, query) == expected
+
+
+def test_window_refuses_over_budget_and_resets(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(sim.time, "monotonic", lambda: clock[0])
+    window = sim._Window(per_hour=2, window_sec=10)
+    assert window.take() == (True, 1)
+    assert window.take() == (True, 0)
+    assert window.take() == (False, 0)
+    clock[0] += 4
+    assert window.retry_after() == 6
+    clock[0] += 6
+    assert window.take() == (True, 1)
+
+
+def test_faults_pick_in_proportion():
+    rng = random.Random(3)
+    picks = [Faults(throttle=0.2, server_error=0.1).pick(rng) for _ in range(10000)]
+    assert abs(picks.count("throttle") / 10000 - 0.2) < 0.02
+    assert abs(picks.count("server_error") / 10000 - 0.1) < 0.02
+    assert "timeout" not in picks
+
+
+def test_injected_arm_faults_look_like_az_errors():
+    throttled = SimState(SimProfile.from_dict({"arm_faults": {"throttle": 1.0}, "retry_after_sec": 7, "seed": 1}))
+    code, _, stderr = throttled.run_az(["group", "exists", "-n", "rg", "--debug"], ".")
+    assert code == 1 and "(TooManyRequests)" in stderr and "'Retry-After': '7'" in stderr
+    assert throttled.counters["az.fault.throttle"] == 1
+
+    failing = SimState(QUIET.with_faults(Faults(server_error=1.0)))
+    code, _, stderr = failing.run_az(["group", "exists", "-n", "rg"], ".")
+    assert code == 1 and "ERROR: (ServiceUnavailable)" in stderr and "DEBUG" not in stderr
+
+
+def test_arm_budget_exhaustion_throttles():
+    state = SimState(SimProfile(arm_read=Latency(0, 0), reads_per_hour=1, seed=1))
+    assert state.run_az(["group", "exists", "-n", "rg"], ".")[0] == 0
+    code, _, stderr = state.run_az(["group", "exists", "-n", "rg"], ".")
+    assert code == 1 and "(TooManyRequests)" in stderr
+    assert state.counters["az.throttled"] == 1
+
+
+def test_site_fault_injection_over_http():
+    with SimServer(QUIET.with_faults(Faults(server_error=1.0))) as server:
+        server.state.apps["app"] = sim.SimApp("app", "rg", "plan", "NODE:20-lts")
+        with pytest.raises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(f"{server.url}/app{sim.SITE_SUFFIX}/", timeout=5)
+        assert raised.value.code == 503
+        assert server.stats()["site.fault.server_error"] == 1
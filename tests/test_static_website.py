@@ -0,0 +1,147 @@
+import base64
+import hashlib
+
+import pytest
+
+import cloud.azure.blob as blob
+from cloud.azure.blob import BlobClient, BlobError
+from cloud.azure.static_website import AzureStaticWebsiteProvider
+from cloud.core.content import IMMUTABLE_CACHE, REVALIDATE_CACHE, cache_control, is_content_hashed, publish_order
+from cloud.core.http import http_status
+from cloud.core.models import DeploymentConfig
+from cloud.sim import BlobSimServer
+
+
+@pytest.mark.parametrize(
+    "rel_path, hashed",
+    [
+        ("assets/index-BxT3kq9a.js", True),
+        ("static/js/main.3f9a1c2e.js", True),
+        ("assets/index-BxT3kq9a.js.map", True),
+        ("assets/logo.svg", False),
+        ("assets/fonts/inter-regular.woff2", False),
+        ("index.html", False),
+        ("sw.js", False),
+    ],
+)
+def test_only_fingerprinted_names_count_as_content_hashed(rel_path, hashed):
+    assert is_content_hashed(rel_path) is hashed
+
+
+def test_stable_asset_names_are_not_cached_forever():
+    assert cache_control("assets/logo.svg") != IMMUTABLE_CACHE
+    assert cache_control("index.html") == REVALIDATE_CACHE
+
+
+@pytest.fixture
+def storage():
+    with BlobSimServer(page_size=2) as server:
+        yield server
+
+
+def write(root, rel_path, data):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def provider_for(storage, workspace):
+    config = DeploymentConfig(provider="azure", hosting="static_website", storage_endpoint=storage.endpoint, build=False)
+    return AzureStaticWebsiteProvider(config, None, str(workspace))
+
+
+def test_sync_uploads_skips_unchanged_and_deletes_stale(storage, tmp_path):
+    dist = tmp_path / "dist"
+    write(dist, "index.html", b"<html>v1</html>")
+    write(dist, "assets/index-BxT3kq9a.js", b"console.log(1)")
+    write(dist, "assets/logo.svg", b"<svg/>")
+    provider = provider_for(storage, tmp_path)
+    provider.deploy_app()
+
+    stored = storage.blobs()
+    assert sorted(stored) == ["assets/index-BxT3kq9a.js", "assets/logo.svg", "index.html"]
+    assert stored["assets/index-BxT3kq9a.js"].cache_control == IMMUTABLE_CACHE
+    assert stored["index.html"].cache_control == REVALIDATE_CACHE
+    assert stored["index.html"].content_type.startswith("text/html")
+    assert stored["index.html"].content_md5 == base64.b64encode(hashlib.md5(b"<html>v1</html>").digest()).decode()
+
+    (dist / "assets" / "index-BxT3kq9a.js").unlink()
+    write(dist, "assets/index-C9dE2fGh.js", b"console.log(2)")
+    write(dist, "index.html", b"<html>v2</html>")
+    result = provider.sync(str(dist))
+    assert sorted(result.uploaded) == ["assets/index-C9dE2fGh.js", "index.html"]
+    assert result.skipped == 1
+    assert result.deleted == ["assets/index-BxT3kq9a.js"]
+    assert sorted(storage.blobs()) == ["assets/index-C9dE2fGh.js", "assets/logo.svg", "index.html"]
+    # Three blobs at two per page: the listing had to follow NextMarker.
+    assert storage.stats()["GET list"] >= 2
+
+
+def test_large_files_are_uploaded_as_blocks(storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(blob, "BLOCK_SIZE", 1024)
+    data = bytes(range(256)) * 20
+    write(tmp_path / "dist", "video.bin", data)
+    provider_for(storage, tmp_path).deploy_app()
+    assert storage.blobs()["video.bin"].data == data
+    assert storage.stats()["PUT block"] == 5
+    assert storage.stats()["PUT blocklist"] == 1
+
+
+def test_static_website_endpoint_serves_index_and_spa_fallback(storage, tmp_path):
+    write(tmp_path / "dist", "index.html", b"<html>app</html>")
+    provider = provider_for(storage, tmp_path)
+    provider.deploy_app()
+    assert http_status(provider.web_endpoint() + "/", 10) == "200"
+    assert http_status(provider.web_endpoint() + "/some/client/route", 10) == "200"
+
+
+def test_wrong_key_is_rejected(storage):
+    client = BlobClient(storage.state.account, base64.b64encode(b"not-the-key").decode(), endpoint=storage.endpoint)
+    with pytest.raises(BlobError, match="403"):
+        client.ensure_container("$web")
+
+
+def test_publish_order_puts_entry_points_last():
+    waves = publish_order(["index.html", "assets/logo.svg", "assets/index-BxT3kq9a.js", "sw.js"])
+    assert waves == [["assets/index-BxT3kq9a.js"], ["assets/logo.svg"], ["index.html", "sw.js"]]
+
+
+def test_sync_uploads_hashed_assets_before_entry_points_and_deletes_last(storage, tmp_path, monkeypatch):
+    dist = tmp_path / "dist"
+    write(dist, "index.html", b"<html>v1</html>")
+    write(dist, "assets/index-BxT3kq9a.js", b"console.log(1)")
+    provider = provider_for(storage, tmp_path)
+    provider.deploy_app()
+
+    (dist / "assets" / "index-BxT3kq9a.js").unlink()
+    write(dist, "assets/index-C9dE2fGh.js", b"console.log(2)")
+    write(dist, "assets/logo.svg", b"<svg/>")
+    write(dist, "index.html", b"<html>v2</html>")
+    client = provider.client()
+    calls = []
+    upload, delete = client.upload_file, client.delete_blob
+    monkeypatch.setattr(client, "upload_file", lambda c, name, *a: (calls.append(("put", name)), upload(c, name, *a)))
+    monkeypatch.setattr(client, "delete_blob", lambda c, name: (calls.append(("delete", name)), delete(c, name)))
+    provider.sync(str(dist))
+    assert calls == [
+        ("put", "assets/index-C9dE2fGh.js"),
+        ("put", "assets/logo.svg"),
+        ("put", "index.html"),
+        ("delete", "assets/index-BxT3kq9a.js"),
+    ]
+
+
+def test_unchanged_content_with_stale_headers_is_retagged_not_reuploaded(storage, tmp_path):
+    write(tmp_path / "dist", "index.html", b"<html>app</html>")
+    provider = provider_for(storage, tmp_path)
+    provider.deploy_app()
+    storage.state.containers["$web"]["index.html"].cache_control = "public, max-age=86400"
+    puts = storage.stats()["PUT blob"]
+
+    result = provider.sync(str(tmp_path / "dist"))
+    assert result.uploaded == [] and result.retagged == ["index.html"] and result.skipped == 0
+    stored = storage.blobs()["index.html"]
+    assert stored.cache_control == REVALIDATE_CACHE
+    assert stored.content_md5 == base64.b64encode(hashlib.md5(b"<html>app</html>").digest()).decode()
+    assert storage.stats()["PUT blob"] == puts
+    assert provider.sync(str(tmp_path / "dist")).retagged == []
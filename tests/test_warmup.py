@@ -0,0 +1,130 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cloud.core.models import DeploymentConfig
+from cloud.core.warmup import RouteLatency, WarmupReport, discover_routes, warm_up
+
+
+def test_warmup_is_opt_in():
+    assert DeploymentConfig().warmup is False
+
+
+def test_route_fails_only_when_no_request_succeeded():
+    report = WarmupReport(
+        routes=[
+            RouteLatency("/", statuses={200, 503}),
+            RouteLatency("/old", statuses={301}),
+            RouteLatency("/broken", statuses={500, 404}),
+            RouteLatency("/timeout"),
+        ],
+        rounds=2,
+        settled=True,
+        elapsed=1.0,
+    )
+    assert [r.route for r in report.failed] == ["/broken", "/timeout"]
+
+
+def test_discover_routes_keeps_same_origin_refs_and_configured_routes(tmp_path):
+    (tmp_path / "index.html").write_text(
+        """<html><head>
+        <link rel="stylesheet" href="/assets/index-BxT3kq9a.css">
+        <link rel="canonical" href="/canonical">
+        <link rel="preconnect" href="https://fonts.example.com">
+        <script type="module" src="assets/index-C9dE2fGh.js"></script>
+        <script src="https://cdn.example.com/lib.js"></script>
+        <script src="//cdn.example.com/proto-relative.js"></script>
+        </head><body>
+        <img src="/logo.svg?v=2">
+        <a href="/pricing">Pricing</a>
+        <a href="mailto:team@example.com">Mail</a>
+        <a href="#top">Top</a>
+        <a href="/">Home</a>
+        </body></html>"""
+    )
+    routes = discover_routes(str(tmp_path), ["docs", "/pricing"])
+    assert routes == [
+        "/",
+        "/assets/index-BxT3kq9a.css",
+        "/assets/index-C9dE2fGh.js",
+        "/logo.svg?v=2",
+        "/pricing",
+        "/docs",
+    ]
+
+
+def test_discover_routes_without_index_html(tmp_path):
+    assert discover_routes(str(tmp_path), ["/health"]) == ["/", "/health"]
+
+
+class TimedSite:
+    """Local site whose response delay is chosen per request by `delay(request_number)`."""
+
+    def __init__(self, delay):
+        self.count = 0
+        lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with lock:
+                    number = site.count
+                    site.count += 1
+                time.sleep(delay(number))
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"ok")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def timed_site():
+    sites = []
+
+    def make(delay):
+        sites.append(TimedSite(delay))
+        return sites[-1]
+
+    yield make
+    for site in sites:
+        site.close()
+
+
+def test_warm_up_stops_once_latency_settles(timed_site):
+    # Cold for the first round, then a steady 30ms.
+    site = timed_site(lambda n: 0.2 if n < 3 else 0.03)
+    report = warm_up(site.url, ["/"], rps=0, samples=3, max_rounds=10)
+    assert report.settled and report.rounds == 3
+    assert site.count == 9
+    route = report.routes[0]
+    assert min(route.before) >= 0.2 and max(route.after) < 0.2
+    assert route.statuses == {200}
+
+
+def test_warm_up_gives_up_after_max_rounds(timed_site):
+    # Alternates between slow and fast rounds, so the p50 never settles.
+    site = timed_site(lambda n: 0.02 if (n // 3) % 2 == 0 else 0.08)
+    report = warm_up(site.url, ["/"], rps=0, samples=3, max_rounds=3)
+    assert not report.settled and report.rounds == 3
+    assert site.count == 9
+
+
+def test_unreachable_routes_are_reported_failed():
+    report = warm_up("http://127.0.0.1:9", ["/"], rps=0, samples=1, max_rounds=1, timeout=2)
+    assert [r.route for r in report.failed] == ["/"]
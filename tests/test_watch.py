@@ -0,0 +1,160 @@
+import shutil
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+import cloud.workflows.watch as watch_workflow
+from cloud.azure.app_service import AzureAppServiceProvider
+from cloud.azure.cli import AzureCli
+from cloud.core.models import DeploymentConfig, WorkflowContext
+from cloud.core.watch import InotifyWatcher, PollingWatcher, debounced_changes
+from cloud.sim import Latency, SimProfile, SimServer
+from cloud.sim.fake_az import write_az_shim
+from cloud.workflows.watch import needs_restart, watch_and_sync
+
+
+def test_polling_watcher_reports_added_modified_and_removed_files(tmp_path):
+    (tmp_path / "keep.txt").write_text("1")
+    (tmp_path / "gone.txt").write_text("1")
+    (tmp_path / "node_modules").mkdir()
+    watcher = PollingWatcher(str(tmp_path), interval=0.01)
+    assert watcher.wait(0.05) == set()
+
+    (tmp_path / "keep.txt").write_text("22")
+    (tmp_path / "gone.txt").unlink()
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "new.txt").write_text("1")
+    (tmp_path / "node_modules" / "ignored.js").write_text("1")
+    assert watcher.wait(1) == {"keep.txt", "gone.txt", "sub/new.txt"}
+    assert watcher.wait(0.05) == set()
+
+
+def test_debounce_batches_a_burst_of_changes(tmp_path):
+    watcher = PollingWatcher(str(tmp_path), interval=0.01)
+
+    def burst():
+        for i in range(5):
+            (tmp_path / f"{i}.txt").write_text("x")
+            time.sleep(0.03)
+
+    writer = threading.Thread(target=burst)
+    writer.start()
+    batch = next(debounced_changes(watcher, quiet_sec=0.3))
+    writer.join()
+    assert batch == {f"{i}.txt" for i in range(5)}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_watcher_rearms_after_the_root_is_recreated(tmp_path):
+    root = tmp_path / "dist"
+    root.mkdir()
+    watcher = InotifyWatcher(str(root))
+    try:
+        shutil.rmtree(root)
+        assert "." in watcher.wait(1)
+        assert watcher.wait(0.05) == set()
+        root.mkdir()
+        (root / "index.html").write_text("v2")
+        assert "index.html" in watcher.wait(1)
+        (root / "index.html").write_text("v3")
+        assert watcher.wait(1) == {"index.html"}
+    finally:
+        watcher.close()
+
+
+@pytest.mark.parametrize(
+    "added, changed, removed, restart",
+    [
+        (["assets/app.js"], ["index.html"], [], False),
+        ([], ["web.config"], [], True),
+        (["api/package.json"], [], [], True),
+        ([], [], ["process.json"], True),
+    ],
+)
+def test_only_startup_files_need_a_restart(added, changed, removed, restart):
+    assert needs_restart(added, changed, removed) is restart
+
+
+QUIET = SimProfile(
+    arm_read=Latency(0, 0),
+    arm_write=Latency(0, 0),
+    deploy=Latency(0, 0),
+    kudu=Latency(0, 0),
+    site=Latency(0, 0),
+    package_mount=Latency(0, 0),
+    cold_requests=0,
+    reads_per_hour=1_000_000,
+    writes_per_hour=1_000_000,
+    seed=1,
+)
+
+
+class ScriptedWatcher:
+    """Applies one edit per batch, then stops the watch loop the way Ctrl+C would."""
+
+    def __init__(self, edits):
+        self.edits = list(edits)
+        self.pending = False
+
+    def wait(self, timeout):
+        if self.pending:
+            self.pending = False
+            return set()
+        if not self.edits:
+            raise KeyboardInterrupt
+        self.edits.pop(0)()
+        self.pending = True
+        return {"edit"}
+
+    def close(self):
+        pass
+
+
+def test_incremental_push_updates_history_and_restarts_only_for_startup_files(tmp_path, monkeypatch):
+    dist = tmp_path / "dist"
+    dist.mkdir()
+    (dist / "index.html").write_text("v1")
+    with SimServer(QUIET) as server:
+        config = DeploymentConfig(
+            resource_group="rg",
+            web_app_name="app",
+            az_path=write_az_shim(tmp_path / "bin", server.url),
+            url_scheme="http",
+            history_max_count=5,
+            resource_graph=False,
+            build=False,
+            watch=True,
+        )
+        provider = AzureAppServiceProvider(config, AzureCli.from_config(config), str(tmp_path))
+        provider.ensure_resources()
+        provider.deploy_app()
+        first = provider.history_store().current(provider.history_key())
+        restarts = []
+        monkeypatch.setattr(provider, "restart", lambda: restarts.append(len(restarts)))
+        monkeypatch.setattr(
+            watch_workflow,
+            "create_watcher",
+            lambda root, excludes: ScriptedWatcher(
+                [
+                    lambda: (dist / "index.html").write_text("v2"),
+                    lambda: (dist / "web.config").write_text("<configuration/>"),
+                ]
+            ),
+        )
+
+        result = watch_and_sync(provider, WorkflowContext(config, str(tmp_path)), "watch")
+        assert result.ok
+        with urllib.request.urlopen(provider.site_url(), timeout=5) as response:
+            assert response.read() == b"v2"
+        assert restarts == [0]
+
+        store = provider.history_store()
+        current = store.get(provider.history_key(), store.current(provider.history_key()))
+        assert current.artifact_id != first
+        assert sorted(current.manifest()) == ["index.html", "web.config"]
+        assert sorted(provider.previous_manifest) == ["index.html"]
+        assert len(store.list(provider.history_key())) == 3
+        assert provider.package_path is None
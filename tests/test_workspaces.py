@@ -0,0 +1,30 @@
+import pytest
+
+from cloud.core.workspaces import WorkspacePackage, assemble_dist
+
+
+@pytest.fixture
+def app(tmp_path):
+    package = WorkspacePackage("web", tmp_path / "packages" / "web")
+    (package.path / "dist").mkdir(parents=True)
+    (package.path / "dist" / "index.html").write_text("new")
+    return package
+
+
+def test_dist_is_replaced_with_the_app_output(tmp_path, app):
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "stale.js").write_text("old")
+    assemble_dist(app, "dist", tmp_path, tmp_path / "dist")
+    assert sorted(p.name for p in (tmp_path / "dist").iterdir()) == ["index.html"]
+
+
+@pytest.mark.parametrize("dist_dir", [".", "..", "packages", "packages/web", "/tmp"])
+def test_unsafe_dist_dir_is_refused_before_deleting_anything(tmp_path, app, dist_dir):
+    with pytest.raises(RuntimeError, match="Unsafe dist_dir"):
+        assemble_dist(app, "dist", tmp_path, tmp_path / dist_dir)
+    assert (app.path / "dist" / "index.html").read_text() == "new"
+
+
+def test_dist_dir_that_is_the_app_output_is_left_alone(tmp_path, app):
+    assemble_dist(app, "dist", tmp_path, tmp_path / "packages" / "web" / "dist")
+    assert (app.path / "dist" / "index.html").exists()